@@ -34,6 +34,7 @@ function JobList({ toggleTheme, themeMode, searchTerm, setSearchTerm }) {
           page: currentPage,
           limit: limit,
           search: searchTerm,
+          view: "card",
         },
       });
       if (response.data.error) {
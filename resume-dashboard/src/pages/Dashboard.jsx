@@ -24,6 +24,25 @@ function Dashboard({ toggleTheme, themeMode }) {
   const [selectedJob, setSelectedJob] = useState(null);
   const [dashboardData, setDashboardData] = useState(null);
 
+  // Helper function to format the company's average salary in the currency it was parsed in
+  const formatAverageSalary = (amount, currency) => {
+    if (amount === null || amount === undefined) return 'Not specified';
+
+    const rounded = Math.round(amount);
+    if (!currency) return rounded.toLocaleString();
+    try {
+      return new Intl.NumberFormat('en-US', {
+        style: 'currency',
+        currency,
+        minimumFractionDigits: 0,
+        maximumFractionDigits: 0
+      }).format(rounded);
+    } catch (e) {
+      // Unknown currency code
+      return `${rounded.toLocaleString()} ${currency}`;
+    }
+  };
+
   // Fetch dashboard data for specific job
   const fetchDashboardData = useCallback(async () => {
     if (!jobId) return;
@@ -116,7 +135,7 @@ function Dashboard({ toggleTheme, themeMode }) {
                       <strong>Total Applications:</strong> {dashboardData.companyStats.totalApplications}
                     </Typography>
                     <Typography variant="body1" gutterBottom>
-                      <strong>Average Salary:</strong> ${Math.round(dashboardData.companyStats.averageSalary).toLocaleString()}
+                      <strong>Average Salary:</strong> {formatAverageSalary(dashboardData.companyStats.averageSalary, dashboardData.companyStats.averageSalaryCurrency)}
                     </Typography>
                     <Typography variant="body1" gutterBottom>
                       <strong>Similar Roles:</strong>
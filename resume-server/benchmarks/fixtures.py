@@ -0,0 +1,84 @@
+# benchmarks/fixtures.py
+
+import random
+from datetime import datetime, timedelta
+from typing import List
+from bson.objectid import ObjectId
+from benchmarks.stand_ins import fake_job_details
+from src.utils.match_scoring import SCORING_STAMP_FIELD
+from src.utils.skills import skill_fields
+
+WEB_BASE_URL = "http://web.bench"
+JOB_SITES = ["www.linkedin.com", "www.indeed.com", "www.glassdoor.com", "careers.example.com"]
+
+# Upskilling pages shared between jobs, so title resolution sees realistic overlap
+SHARED_PAGES = [f"{WEB_BASE_URL}/docs/{topic}" for topic in ("python", "kubernetes", "react", "sql", "aws", "docker", "go", "kafka")]
+
+
+def make_tracking_document(index: int, rng: random.Random, start: datetime) -> dict:
+    """
+    A job_tracking document as the ingest worker would have written it
+
+    Args:
+        index (int): Position of the job, also used to make its content unique
+        rng (random.Random): Seeded generator so runs are reproducible
+        start (datetime): ProcessedDate of the oldest job
+
+    Returns:
+        dict: The document, with search results pointing at the fake web server
+    """
+    job_find = rng.choice(JOB_SITES)
+    document = fake_job_details(f"posting {index}")
+    document.update(skill_fields(document["TechnicalSkills"]))
+    processed = start + timedelta(minutes=index)
+    applied = rng.random() < 0.6
+    shortlisted = applied and rng.random() < 0.3
+    interviewed = shortlisted and rng.random() < 0.5
+    offered = interviewed and rng.random() < 0.3
+    search_results = [
+        rng.sample(SHARED_PAGES, 2) + [f"{WEB_BASE_URL}/course/{index}/{query}/{rank}" for rank in range(2)]
+        for query in range(3)
+    ]
+    document.update({
+        "_id": ObjectId(),
+        "JobURL": f"https://{job_find}/jobs/view/{index}",
+        "JobFind": job_find,
+        "JobID": str(index),
+        "job_id": str(ObjectId()),
+        "ProcessedDate": processed,
+        SCORING_STAMP_FIELD: processed,
+        "ResumeGenerated": False,
+        "ResumePath": "",
+        "statuses": [],
+        "IsApplied": applied,
+        "IsShortlisted": shortlisted,
+        "IsInterviewed": interviewed,
+        "IsOffered": offered,
+        "IsAccepted": offered and rng.random() < 0.5,
+        "IsDeclined": False,
+        "IsJoined": False,
+        "IsRejected": applied and not shortlisted and rng.random() < 0.5,
+        "AppliedDate": processed + timedelta(days=1) if applied else None,
+        "ShortlistedDate": processed + timedelta(days=1 + rng.randint(1, 20)) if shortlisted else None,
+        "search_queries": ["learn python", "learn kubernetes", "learn sql"],
+        "search_lang": "en",
+        "search_results": search_results,
+        "enrichment": {"status": "done", "stage": None, "attempts": 1, "error": None},
+    })
+    return document
+
+
+def make_tracking_documents(count: int, seed: int = 42) -> List[dict]:
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return [make_tracking_document(index, rng, start) for index in range(count)]
+
+
+def make_add_job_payload(index: int, run_id: str) -> dict:
+    """An /api/addJob body for a posting that is not tracked yet."""
+    return {
+        "content": f"Senior engineer wanted, run {run_id} posting {index}. " * 20,
+        "url": f"https://www.linkedin.com/jobs/view/{run_id}-{index}",
+        "job_find": "www.linkedin.com",
+        "job_id": f"{run_id}-{index}",
+    }
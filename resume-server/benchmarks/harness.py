@@ -0,0 +1,292 @@
+# benchmarks/harness.py
+
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional
+import httpx
+from benchmarks.fixtures import WEB_BASE_URL
+from benchmarks.stand_ins import InMemoryRedis, NullCacheBackend, create_fake_openai, create_fake_web
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The app is imported from the server directory even after moving to a scratch working directory
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+API_BASE_URL = "http://api.bench"
+LLM_BASE_URL = "http://llm.bench/v1"
+
+
+@dataclass
+class BenchContext:
+    """Everything a benchmark needs once the app is booted."""
+    app: object
+    client: httpx.AsyncClient
+    fake_openai: object
+    fake_web: object
+    mongo_mode: str
+    db_name: str
+    throttle_redis: InMemoryRedis
+    settings: object = None
+
+    @property
+    def db(self):
+        from src.utils.session_management import get_db_client
+        return get_db_client()[self.db_name]
+
+
+@dataclass
+class Measurement:
+    """Latencies and outcomes of one scenario."""
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+    errors: int = 0
+    wall_seconds: float = 0.0
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0,
+            "statuses": {str(status): hits for status, hits in sorted(self.statuses.items())},
+            "throughput_rps": round(count / self.wall_seconds, 2) if self.wall_seconds else 0,
+            "latency_ms": {
+                "p50": percentile(ordered, 50),
+                "p90": percentile(ordered, 90),
+                "p99": percentile(ordered, 99),
+                "mean": round(sum(ordered) / count * 1000, 3) if count else None,
+                "max": round(ordered[-1] * 1000, 3) if count else None,
+            },
+        }
+
+
+def percentile(ordered: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted latencies in seconds, returned in milliseconds."""
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return round(ordered[int(rank) - 1] * 1000, 3)
+
+
+def is_error(response: httpx.Response) -> bool:
+    """Routes report most failures as a 200 with an {"error": ...} body, count those too."""
+    if response.status_code >= 400:
+        return True
+    if response.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = response.json()
+        except ValueError:
+            return True
+        return isinstance(body, dict) and "error" in body
+    return False
+
+
+async def measure(
+    name: str,
+    make_request: Callable[[int], Awaitable[httpx.Response]],
+    requests: int,
+    concurrency: int,
+) -> Measurement:
+    """
+    Issue requests through make_request with at most concurrency in flight
+
+    Args:
+        name (str): Scenario name
+        make_request (Callable): Coroutine function sending request number i
+        requests (int): Total number of requests
+        concurrency (int): Requests in flight at once
+
+    Returns:
+        Measurement: Per-request latencies, statuses and error count
+    """
+    measurement = Measurement(name)
+    counter = iter(range(requests))
+
+    async def worker():
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                response = await make_request(index)
+                status = response.status_code
+                failed = is_error(response)
+            except Exception as e:
+                logging.debug(f"{name} request {index} raised: {e}")
+                status = "exception"
+                failed = True
+            measurement.latencies.append(time.perf_counter() - started)
+            measurement.statuses[status] = measurement.statuses.get(status, 0) + 1
+            measurement.errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    measurement.wall_seconds = time.perf_counter() - started
+    return measurement
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=SERVER_DIR,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _ensure_client_build():
+    """main.py mounts client/build from the working directory; give it an empty one when missing."""
+    if os.path.isdir(os.path.join("client", "build")):
+        return
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    os.makedirs(os.path.join(workdir, "client", "build"))
+    with open(os.path.join(workdir, "client", "build", "index.html"), "w") as index_file:
+        index_file.write("<html></html>")
+    os.chdir(workdir)
+
+
+def _configure_throttling(app, redis: InMemoryRedis, limit: Optional[int], window: int):
+    from fastapi_throttling import ThrottlingMiddleware
+
+    for middleware in app.user_middleware:
+        if middleware.cls is ThrottlingMiddleware:
+            middleware.kwargs.update(redis=redis, limit=limit or 10 ** 9, window=window)
+    # Rebuilt with the stand-in Redis on the next request
+    app.middleware_stack = None
+
+
+def use_response_cache(enabled: bool):
+    """Switch the FastAPICache backend between an in-memory store and one that never hits."""
+    from fastapi_cache import FastAPICache
+    from fastapi_cache.backends.inmemory import InMemoryBackend
+    from src.utils.response_cache import init_response_cache
+
+    FastAPICache.init(InMemoryBackend() if enabled else NullCacheBackend(), prefix="fastapi-cache")
+    init_response_cache(None)
+
+
+@asynccontextmanager
+async def bench_app(
+    mongo_uri: Optional[str] = None,
+    llm_latency: float = 0.05,
+    web_latency: float = 0.02,
+    response_cache: bool = True,
+    throttle_limit: Optional[int] = None,
+    throttle_window: int = 60,
+    ingest_workers: int = 2,
+    enrichment_workers: int = 0,
+    mongo_pool_size: Optional[int] = None,
+):
+    """
+    Boot the app from main.py against stand-ins, the way startup_handler would
+
+    Args:
+        mongo_uri (str): A mongod to use with a throwaway database, mongomock-motor when None
+        llm_latency (float): Seconds each fake completion takes
+        web_latency (float): Seconds each fake page takes
+        response_cache (bool): Whether cached routes can hit
+        throttle_limit (int): ThrottlingMiddleware limit per window, None for effectively unlimited
+        throttle_window (int): ThrottlingMiddleware window in seconds
+        ingest_workers (int): Ingest worker pool size, 0 to leave tickets queued
+        enrichment_workers (int): Enrichment worker pool size, 0 to disable
+        mongo_pool_size (int): Motor maxPoolSize, defaults to settings.MONGO_MAX_POOL_SIZE
+
+    Yields:
+        BenchContext: The app, a client bound to it and the stand-ins
+    """
+    _ensure_client_build()
+
+    from src.config.app_config import settings
+    settings.SEARCH_PROVIDER = "local"
+    settings.SEARCH_LOCAL_BASE_URL = WEB_BASE_URL
+    settings.SEARCH_MIN_INTERVAL_SECONDS = 0.0
+
+    import main
+    from src.utils import session_management
+    from src.utils.initialize import initialize_db
+    from src.utils.openai_client import close_async_openai_client, get_async_openai_client
+    from src.utils.url_helpers import close_http_client, init_http_client
+    from src.utils.ingest_queue import start_ingest_workers, stop_ingest_workers
+    from src.utils.enrichment import start_enrichment_workers, stop_enrichment_workers
+
+    db_name = f"resume_bench_{os.getpid()}" if mongo_uri else settings.DB_NAME
+    session_kwargs = dict(
+        mongo_uri=mongo_uri or settings.MONGODB_URI,
+        db=db_name,
+        job_tracking_table=settings.JOB_TRACKING_TABLE,
+        manual_annotation_table=settings.MANUAL_ANNOTATION_TABLE,
+        extracted_entities_table=settings.EXTRACTED_ENTITIES_TABLE,
+        ingest_queue_table=settings.INGEST_QUEUE_TABLE,
+        extraction_cache_table=settings.EXTRACTION_CACHE_TABLE,
+        stats_rollup_table=settings.STATS_ROLLUP_TABLE,
+        url_metadata_table=settings.URL_METADATA_TABLE,
+        resume_table=settings.RESUME_TABLE,
+        match_scores_table=settings.MATCH_SCORES_TABLE,
+        skill_index_table=settings.SKILL_INDEX_TABLE,
+        max_pool_size=mongo_pool_size or settings.MONGO_MAX_POOL_SIZE,
+        min_pool_size=settings.MONGO_MIN_POOL_SIZE,
+        wait_queue_timeout_ms=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    )
+    session_management.initialize_session_data(**session_kwargs)
+    if not mongo_uri:
+        from mongomock_motor import AsyncMongoMockClient
+        session_management.session_data["mongo_client"] = AsyncMongoMockClient()
+
+    use_response_cache(response_cache)
+
+    fake_openai = create_fake_openai(latency=llm_latency)
+    fake_web = create_fake_web(latency=web_latency)
+    await close_async_openai_client()
+    get_async_openai_client(
+        api_key="bench",
+        base_url=LLM_BASE_URL,
+        max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_openai)),
+    )
+    await close_http_client()
+    init_http_client(
+        max_connections=settings.URL_FETCH_MAX_CONNECTIONS,
+        max_per_host=settings.URL_FETCH_MAX_PER_HOST,
+        max_bytes=settings.URL_FETCH_MAX_BYTES,
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_web), follow_redirects=True),
+    )
+
+    throttle_redis = InMemoryRedis()
+    _configure_throttling(main.app, throttle_redis, throttle_limit, throttle_window)
+
+    await initialize_db()
+    if ingest_workers:
+        await start_ingest_workers(ingest_workers)
+    if enrichment_workers:
+        await start_enrichment_workers(enrichment_workers)
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url=API_BASE_URL, timeout=None)
+    try:
+        yield BenchContext(
+            app=main.app,
+            client=client,
+            fake_openai=fake_openai,
+            fake_web=fake_web,
+            mongo_mode=mongo_uri and "mongod" or "mongomock",
+            db_name=db_name,
+            throttle_redis=throttle_redis,
+            settings=settings,
+        )
+    finally:
+        await client.aclose()
+        await stop_enrichment_workers()
+        await stop_ingest_workers()
+        await close_async_openai_client()
+        await close_http_client()
+        mongo_client = session_management.get_db_client()
+        if mongo_uri:
+            await mongo_client.drop_database(db_name)
+        mongo_client.close()
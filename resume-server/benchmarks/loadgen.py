@@ -0,0 +1,342 @@
+# benchmarks/loadgen.py
+
+"""
+Replay extension and dashboard traffic at increasing concurrency and report where the server saturates
+
+Run from resume-server/:
+
+    python -m benchmarks.loadgen --levels 4 8 16 32 64 --duration 20 --output load.json
+
+Each level runs that many virtual clients for --duration seconds. A share of
+them (--extension-share) behave like the browser extension and post addJob
+bursts; the rest behave like open dashboards, polling /stats, /jobs and
+/timeToRespond together the way the dashboard page loads them.
+
+By default the app is booted in process against the same stand-ins as
+benchmarks.run_benchmarks, so the run is fully offline. Pass --target with the
+URL of a running server (e.g. uvicorn with several workers against a local
+mongod and benchmarks.stand_ins) to size a real deployment.
+
+ThrottlingMiddleware identifies clients by X-Forwarded-For, so every virtual
+client sends its own address unless --shared-ip makes them all one client.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, List
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+from benchmarks.fixtures import make_add_job_payload, make_tracking_documents
+from benchmarks.harness import Measurement, bench_app, git_revision, is_error, percentile
+
+DASHBOARD_REQUESTS = [
+    ("stats", "/api/stats", None),
+    ("jobs", "/api/jobs", {"page": 1, "limit": 12, "view": "card"}),
+    ("time_to_respond", "/api/timeToRespond", None),
+]
+
+# Server metrics compared before and after each level: (histogram, reported name)
+SERVER_HISTOGRAMS = [
+    ("mongo_pool_checkout_wait_seconds", "mongo_pool_checkout_wait"),
+    ("mongo_command_duration_seconds", "mongo_command"),
+    ("llm_queue_wait_seconds", "llm_queue_wait"),
+    ("llm_request_duration_seconds", "llm_request"),
+    ("ingest_queue_wait_seconds", "ingest_queue_wait"),
+]
+
+
+class LevelRecorder:
+    """Collects per-route measurements and the lag between when requests were due and when they started."""
+
+    def __init__(self):
+        self.routes: Dict[str, Measurement] = {}
+        self.schedule_lags: List[float] = []
+
+    def record(self, route: str, due: float, started: float, latency: float, status, failed: bool):
+        measurement = self.routes.setdefault(route, Measurement(route))
+        measurement.latencies.append(latency)
+        measurement.statuses[status] = measurement.statuses.get(status, 0) + 1
+        measurement.errors += failed
+        self.schedule_lags.append(max(0.0, started - due))
+
+
+async def _timed_request(client: httpx.AsyncClient, recorder: LevelRecorder, route: str, due: float, method: str, url: str, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        status, failed = response.status_code, is_error(response)
+    except Exception as e:
+        logging.debug(f"{route} raised: {e}")
+        status, failed = "exception", True
+    recorder.record(route, due, started, time.perf_counter() - started, status, failed)
+
+
+async def extension_client(client, recorder, headers, deadline, args, run_id, rng):
+    """Posts a burst of addJob requests, then idles like a user reading postings."""
+    due = time.perf_counter()
+    sequence = 0
+    while due < deadline:
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        burst = []
+        for _ in range(args.burst_size):
+            payload = make_add_job_payload(sequence, run_id)
+            sequence += 1
+            burst.append(_timed_request(client, recorder, "add_job", due, "POST", "/api/addJob", json=payload, headers=headers))
+        await asyncio.gather(*burst)
+        due += args.burst_interval * rng.uniform(0.5, 1.5)
+
+
+async def dashboard_client(client, recorder, headers, deadline, args, rng):
+    """Loads the dashboard's widgets together, then waits for the next poll."""
+    # Spread the first polls so clients do not all fire in the same instant
+    due = time.perf_counter() + rng.uniform(0, args.poll_interval)
+    while due < deadline:
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        await asyncio.gather(*(
+            _timed_request(client, recorder, route, due, "GET", url, params=params, headers=headers)
+            for route, url, params in DASHBOARD_REQUESTS
+        ))
+        due += args.poll_interval
+
+
+async def loop_lag_sampler(samples: List[float], stop: asyncio.Event, interval: float = 0.01):
+    """How late the event loop wakes a sleeping task; in process this is shared with the app."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - started - interval))
+
+
+async def scrape_metrics(client: httpx.AsyncClient) -> Dict[str, float]:
+    """Sum every sample of the server's /metrics by sample name, labels collapsed."""
+    try:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+    except Exception as e:
+        logging.warning(f"Could not scrape /metrics: {e}")
+        return {}
+    totals: Dict[str, float] = {}
+    for family in text_string_to_metric_families(response.text):
+        for sample in family.samples:
+            totals[sample.name] = totals.get(sample.name, 0.0) + sample.value
+    return totals
+
+
+def server_deltas(before: Dict[str, float], after: Dict[str, float]) -> dict:
+    deltas = {}
+    for metric, name in SERVER_HISTOGRAMS:
+        count = after.get(f"{metric}_count", 0.0) - before.get(f"{metric}_count", 0.0)
+        total = after.get(f"{metric}_sum", 0.0) - before.get(f"{metric}_sum", 0.0)
+        deltas[name] = {"count": int(count), "mean_ms": round(total / count * 1000, 3) if count else None}
+    failures = after.get("mongo_pool_checkout_failures_total", 0.0) - before.get("mongo_pool_checkout_failures_total", 0.0)
+    errors = after.get("route_errors_total", 0.0) - before.get("route_errors_total", 0.0)
+    deltas["mongo_pool_checkout_failures"] = int(failures)
+    deltas["route_errors"] = int(errors)
+    return deltas
+
+
+async def run_level(client: httpx.AsyncClient, level: int, args, ingest_backlog) -> dict:
+    recorder = LevelRecorder()
+    rng = random.Random(level)
+    run_id = uuid.uuid4().hex[:8]
+    extensions = round(level * args.extension_share)
+    before = await scrape_metrics(client)
+
+    lag_samples: List[float] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(loop_lag_sampler(lag_samples, stop))
+    started = time.perf_counter()
+    deadline = started + args.duration
+    clients = []
+    for index in range(level):
+        address = "10.0.0.1" if args.shared_ip else f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256 + 1}"
+        headers = {"X-Forwarded-For": address}
+        if index < extensions:
+            clients.append(extension_client(client, recorder, headers, deadline, args, f"{run_id}-{index}", rng))
+        else:
+            clients.append(dashboard_client(client, recorder, headers, deadline, args, rng))
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+
+    after = await scrape_metrics(client)
+    routes = {}
+    total_requests = total_errors = throttled = 0
+    for route, measurement in sorted(recorder.routes.items()):
+        measurement.wall_seconds = elapsed
+        routes[route] = measurement.summary()
+        total_requests += len(measurement.latencies)
+        total_errors += measurement.errors
+        throttled += measurement.statuses.get(429, 0)
+
+    lags = sorted(recorder.schedule_lags)
+    loop_lags = sorted(lag_samples)
+    return {
+        "clients": level,
+        "extension_clients": extensions,
+        "dashboard_clients": level - extensions,
+        "seconds": round(elapsed, 3),
+        "requests": total_requests,
+        "throughput_rps": round(total_requests / elapsed, 2) if elapsed else 0,
+        "error_rate": round(total_errors / total_requests, 4) if total_requests else 0,
+        "throttled_rate": round(throttled / total_requests, 4) if total_requests else 0,
+        "schedule_lag_ms": {"p50": percentile(lags, 50), "p99": percentile(lags, 99)},
+        "loop_lag_ms": {"p50": percentile(loop_lags, 50), "p99": percentile(loop_lags, 99)},
+        "ingest_backlog": await ingest_backlog(),
+        "server": server_deltas(before, after) if before and after else None,
+        "routes": routes,
+    }
+
+
+def find_saturation(levels: List[dict], max_error_rate: float, min_gain: float) -> dict:
+    """
+    The first level where adding clients stops paying off
+
+    A level saturates when its error rate exceeds max_error_rate, or when
+    throughput grew by less than min_gain over the previous level.
+    """
+    best = max(levels, key=lambda level: level["throughput_rps"]) if levels else None
+    for previous, current in zip([None] + levels, levels):
+        if current["error_rate"] > max_error_rate:
+            return {"clients": current["clients"], "reason": f"error rate {current['error_rate']}", "max_throughput_rps": best["throughput_rps"]}
+        if previous and current["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain):
+            return {"clients": current["clients"], "reason": "throughput stopped growing", "max_throughput_rps": best["throughput_rps"]}
+    return {"clients": None, "reason": "not reached", "max_throughput_rps": best["throughput_rps"] if best else None}
+
+
+@asynccontextmanager
+async def load_target(args):
+    """A client for the server under test and a probe for its ingest backlog."""
+    if args.target:
+        async with httpx.AsyncClient(
+            base_url=args.target,
+            timeout=args.request_timeout,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        ) as client:
+            async def no_backlog():
+                return None
+            yield client, no_backlog, {"target": args.target}
+        return
+
+    from src.utils.ingest_queue import PROCESSING, QUEUED
+    from src.utils.stats_rollup import rebuild_stats_rollup
+
+    async with bench_app(
+        mongo_uri=args.mongo_uri,
+        llm_latency=args.llm_latency_ms / 1000,
+        web_latency=args.web_latency_ms / 1000,
+        throttle_limit=args.throttle_limit,
+        throttle_window=args.throttle_window,
+        ingest_workers=args.ingest_workers,
+        enrichment_workers=args.enrichment_workers,
+        mongo_pool_size=args.mongo_pool_size,
+    ) as ctx:
+        documents = make_tracking_documents(args.docs)
+        table = ctx.db[ctx.settings.JOB_TRACKING_TABLE]
+        for start in range(0, len(documents), 1000):
+            await table.insert_many(documents[start:start + 1000])
+        await rebuild_stats_rollup()
+        queue = ctx.db[ctx.settings.INGEST_QUEUE_TABLE]
+
+        async def backlog():
+            return await queue.count_documents({"status": {"$in": [QUEUED, PROCESSING]}})
+
+        yield ctx.client, backlog, {
+            "target": "in-process",
+            "mongo": ctx.mongo_mode,
+            "docs": args.docs,
+            "mongo_pool_size": args.mongo_pool_size or ctx.settings.MONGO_MAX_POOL_SIZE,
+            "ingest_workers": args.ingest_workers,
+            "throttle_limit": args.throttle_limit,
+            "throttle_window": args.throttle_window,
+        }
+
+
+async def run(args) -> dict:
+    levels = []
+    async with load_target(args) as (client, backlog, target_meta):
+        for level in args.levels:
+            result = await run_level(client, level, args, backlog)
+            levels.append(result)
+            logging.info(
+                f"{level} clients: {result['throughput_rps']} rps, error rate {result['error_rate']}, "
+                f"throttled {result['throttled_rate']}, lag p99 {result['schedule_lag_ms']['p99']}ms"
+            )
+            if args.cooldown:
+                await asyncio.sleep(args.cooldown)
+
+    return {
+        "meta": {
+            "commit": git_revision(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            **target_meta,
+            "duration": args.duration,
+            "extension_share": args.extension_share,
+            "burst_size": args.burst_size,
+            "burst_interval": args.burst_interval,
+            "poll_interval": args.poll_interval,
+            "shared_ip": args.shared_ip,
+        },
+        "saturation": find_saturation(levels, args.max_error_rate, args.min_gain),
+        "levels": levels,
+    }
+
+
+def parse_args(argv=None):
+    from src.config.app_config import settings
+
+    parser = argparse.ArgumentParser(description="Load test resume-server with extension and dashboard traffic")
+    parser.add_argument("--levels", type=int, nargs="+", default=[4, 8, 16, 32, 64], help="Virtual client counts to step through")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per level")
+    parser.add_argument("--cooldown", type=float, default=0.0, help="Seconds to idle between levels")
+    parser.add_argument("--extension-share", type=float, default=0.25, help="Fraction of clients that post addJob bursts")
+    parser.add_argument("--burst-size", type=int, default=5, help="addJob requests per extension burst")
+    parser.add_argument("--burst-interval", type=float, default=5.0, help="Mean seconds between extension bursts")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between dashboard polls")
+    parser.add_argument("--shared-ip", action="store_true", help="Send every client from one address, as a single user would")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Error rate at which a level counts as saturated")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="Throughput gain below which a level counts as saturated")
+    parser.add_argument("--target", default=None, help="URL of a running server; boots the app in process when omitted")
+    parser.add_argument("--request-timeout", type=float, default=30.0, help="Client timeout against --target")
+    parser.add_argument("--mongo-uri", default=None, help="Local mongod for the in-process app instead of mongomock-motor")
+    parser.add_argument("--mongo-pool-size", type=int, default=None, help="Motor maxPoolSize for the in-process app")
+    parser.add_argument("--docs", type=int, default=2000, help="Synthetic jobs to seed for the in-process app")
+    parser.add_argument("--throttle-limit", type=int, default=settings.THROTTLE_LIMIT, help="ThrottlingMiddleware requests per window")
+    parser.add_argument("--throttle-window", type=int, default=settings.THROTTLE_WINDOW_SECONDS, help="ThrottlingMiddleware window in seconds")
+    parser.add_argument("--ingest-workers", type=int, default=settings.INGEST_WORKERS, help="Ingest worker pool size for the in-process app")
+    parser.add_argument("--enrichment-workers", type=int, default=0, help="Enrichment worker pool size for the in-process app")
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="Latency of each fake completion")
+    parser.add_argument("--web-latency-ms", type=float, default=20.0, help="Latency of each fake web page")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="Log each level as it finishes")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    # The harness may move to a scratch working directory, resolve the output path first
+    output_path = os.path.abspath(args.output) if args.output else None
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if output_path:
+        with open(output_path, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# benchmarks/run_benchmarks.py
+
+"""
+Benchmark the API hot paths against local stand-ins and print the results as JSON
+
+Run from resume-server/, with the dev requirements installed:
+
+    pip install -r requirements-dev.txt
+    python -m benchmarks.run_benchmarks --docs 5000 --requests 300 --concurrency 16 --output bench.json
+
+Mongo is mongomock-motor unless --mongo-uri points at a local mongod, in which
+case a throwaway database is created and dropped. Text search scenarios need a
+real mongod and are skipped otherwise. Compare two result files between commits
+to spot regressions.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from benchmarks.fixtures import make_add_job_payload, make_tracking_documents
+from benchmarks.harness import bench_app, git_revision, measure, use_response_cache
+
+READ_SCENARIOS = ["jobs_shallow", "jobs_deep_page", "jobs_deep_cursor", "jobs_search", "jobs_search_deep", "stats", "dashboard"]
+WRITE_SCENARIOS = ["add_job", "url_titles"]
+TEXT_SEARCH_SCENARIOS = {"jobs_search", "jobs_search_deep"}
+
+
+async def seed(ctx, docs: int) -> list:
+    """Insert the synthetic jobs and build the stats rollup the way a long-running server would have it."""
+    from src.utils.stats_rollup import rebuild_stats_rollup
+
+    documents = make_tracking_documents(docs)
+    table = ctx.db[ctx.settings.JOB_TRACKING_TABLE]
+    for start in range(0, len(documents), 1000):
+        await table.insert_many(documents[start:start + 1000])
+    await rebuild_stats_rollup()
+    return documents
+
+
+def _deep_cursor(documents: list, depth: int) -> str:
+    from src.utils.pagination import encode_cursor
+
+    ordered = sorted(documents, key=lambda doc: (doc["ProcessedDate"], doc["_id"]), reverse=True)
+    return encode_cursor(ordered[min(depth, len(ordered) - 1)])
+
+
+def read_requests(ctx, documents: list, limit: int):
+    client = ctx.client
+    deep_page = max(1, len(documents) // limit - 1)
+    deep_cursor = _deep_cursor(documents, (deep_page - 1) * limit)
+    job_ids = [doc["job_id"] for doc in documents]
+    rng = random.Random(7)
+    return {
+        "jobs_shallow": lambda i: client.get("/api/jobs", params={"page": 1, "limit": limit, "view": "card"}),
+        "jobs_deep_page": lambda i: client.get("/api/jobs", params={"page": deep_page, "limit": limit, "view": "card"}),
+        "jobs_deep_cursor": lambda i: client.get("/api/jobs", params={"cursor": deep_cursor, "limit": limit, "view": "card"}),
+        "jobs_search": lambda i: client.get("/api/jobs", params={"search": "python", "page": 1, "limit": limit, "view": "card"}),
+        "jobs_search_deep": lambda i: client.get("/api/jobs", params={"search": "python", "page": 20, "limit": limit, "view": "card"}),
+        "stats": lambda i: client.get("/api/stats"),
+        "dashboard": lambda i: client.get(f"/api/dashboard/{rng.choice(job_ids)}"),
+    }
+
+
+async def wait_for_ingest(ctx, timeout: float) -> float:
+    """Seconds until the ingest queue has nothing queued or processing."""
+    from src.utils.ingest_queue import PROCESSING, QUEUED
+
+    queue = ctx.db[ctx.settings.INGEST_QUEUE_TABLE]
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if not await queue.count_documents({"status": {"$in": [QUEUED, PROCESSING]}}):
+            break
+        await asyncio.sleep(0.05)
+    return round(time.perf_counter() - started, 3)
+
+
+async def run(args) -> dict:
+    cache_modes = {"on": [True], "off": [False], "both": [False, True]}[args.cache]
+    selected = set(args.scenarios or READ_SCENARIOS + WRITE_SCENARIOS)
+    results = {}
+    skipped = {}
+
+    async with bench_app(
+        mongo_uri=args.mongo_uri,
+        llm_latency=args.llm_latency_ms / 1000,
+        web_latency=args.web_latency_ms / 1000,
+        ingest_workers=args.ingest_workers,
+    ) as ctx:
+        started = time.perf_counter()
+        documents = await seed(ctx, args.docs)
+        seed_seconds = round(time.perf_counter() - started, 3)
+        scenarios = read_requests(ctx, documents, args.limit)
+
+        for cached in cache_modes:
+            use_response_cache(cached)
+            mode = "cached" if cached else "uncached"
+            for name in READ_SCENARIOS:
+                if name not in selected:
+                    continue
+                if name in TEXT_SEARCH_SCENARIOS and ctx.mongo_mode == "mongomock":
+                    skipped[name] = "$text search needs a real mongod (--mongo-uri)"
+                    continue
+                await scenarios[name](0)  # warm up, and fill the cache in cached mode
+                measurement = await measure(name, scenarios[name], args.requests, args.concurrency)
+                results.setdefault(mode, {})[name] = measurement.summary()
+                logging.info(f"{mode} {name}: {results[mode][name]['latency_ms']}")
+
+        # Writes go last, they invalidate the caches the reads rely on
+        use_response_cache(True)
+        if "add_job" in selected:
+            run_id = uuid.uuid4().hex[:8]
+            measurement = await measure(
+                "add_job",
+                lambda i: ctx.client.post("/api/addJob", json=make_add_job_payload(i, run_id)),
+                args.requests,
+                args.concurrency,
+            )
+            summary = measurement.summary()
+            summary["ingest_drain_seconds"] = await wait_for_ingest(ctx, timeout=args.drain_timeout)
+            summary["llm_calls"] = ctx.fake_openai.state.calls
+            results.setdefault("writes", {})["add_job"] = summary
+
+        if "url_titles" in selected:
+            job_ids = [doc["job_id"] for doc in documents[:args.requests]]
+            measurement = await measure(
+                "url_titles",
+                lambda i: ctx.client.post("/api/getUrlTitles", params={"job_id": job_ids[i % len(job_ids)]}),
+                args.requests,
+                args.concurrency,
+            )
+            summary = measurement.summary()
+            summary["page_fetches"] = ctx.fake_web.state.calls
+            results.setdefault("writes", {})["url_titles"] = summary
+
+        mongo_mode = ctx.mongo_mode
+
+    return {
+        "meta": {
+            "commit": git_revision(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "mongo": mongo_mode,
+            "docs": args.docs,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "limit": args.limit,
+            "llm_latency_ms": args.llm_latency_ms,
+            "web_latency_ms": args.web_latency_ms,
+            "seed_seconds": seed_seconds,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume-server API against local stand-ins")
+    parser.add_argument("--docs", type=int, default=5000, help="Synthetic jobs to seed")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight per scenario")
+    parser.add_argument("--limit", type=int, default=12, help="Page size for /api/jobs")
+    parser.add_argument("--mongo-uri", default=None, help="Local mongod to benchmark against instead of mongomock-motor")
+    parser.add_argument("--cache", choices=["on", "off", "both"], default="both", help="Response cache modes to run the reads in")
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="Latency of each fake completion")
+    parser.add_argument("--web-latency-ms", type=float, default=20.0, help="Latency of each fake web page")
+    parser.add_argument("--ingest-workers", type=int, default=2, help="Ingest worker pool size")
+    parser.add_argument("--drain-timeout", type=float, default=300.0, help="Seconds to wait for queued jobs to be processed")
+    parser.add_argument("--scenarios", nargs="*", choices=READ_SCENARIOS + WRITE_SCENARIOS, help="Only run these scenarios")
+    parser.add_argument("--output", default=None, help="Write the JSON results to this file instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="Log progress and application logs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # The harness may move to a scratch working directory, resolve the output path first
+    output_path = os.path.abspath(args.output) if args.output else None
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if output_path:
+        with open(output_path, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
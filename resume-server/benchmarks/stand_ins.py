@@ -0,0 +1,237 @@
+# benchmarks/stand_ins.py
+
+"""
+Offline stand-ins for the services the server talks to: an OpenAI-compatible
+API, the web pages behind search results, and Redis for the throttling middleware.
+They are plain ASGI apps and objects wired in through httpx transports, so
+benchmarks never leave the process.
+
+To load test a real deployment offline, serve the OpenAI and web stand-ins on a port:
+
+    python -m benchmarks.stand_ins --port 1234
+
+and start the server with OPENAI_BASE_URL=http://127.0.0.1:1234/v1,
+SEARCH_PROVIDER=local and SEARCH_LOCAL_BASE_URL=http://127.0.0.1:1234.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from typing import Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse
+from fastapi_cache.backends import Backend
+
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Cyberdyne"]
+TITLES = ["Software Engineer", "Backend Developer", "Data Engineer", "Frontend Developer", "DevOps Engineer", "ML Engineer"]
+SKILLS = ["Python", "Go", "Kubernetes", "React", "SQL", "AWS", "Docker", "TypeScript", "Kafka", "Spark", "FastAPI", "MongoDB"]
+LOCATIONS = [("Bengaluru", "Karnataka", "India"), ("Austin", "Texas", "US"), ("London", "England", "UK"), ("Berlin", "Berlin", "Germany")]
+SALARIES = ["$100,000 - $120,000 a year", "Not Specified", "₹10-15 LPA", "$50/hr", "£60,000 per annum"]
+
+
+def _pick(options: list, seed: bytes, offset: int = 0):
+    return options[(seed[offset % len(seed)]) % len(options)]
+
+
+def fake_job_details(content: str) -> dict:
+    """Deterministic JobDataEntities-shaped extraction for a posting."""
+    seed = hashlib.sha256(content.encode("utf-8")).digest()
+    city, state, country = _pick(LOCATIONS, seed, 3)
+    return {
+        "Company": _pick(COMPANIES, seed, 0),
+        "JobTitle": _pick(TITLES, seed, 1),
+        "Salary": _pick(SALARIES, seed, 2),
+        "City": city,
+        "State": state,
+        "Country": country,
+        "Experience": [f"{seed[4] % 8 + 1} years"],
+        "TechnicalSkills": sorted({_pick(SKILLS, seed, i) for i in range(5, 10)}),
+        "SoftSkills": ["Communication"],
+        "JobSummary": "Build and operate services. " * 4,
+        "WorkArrangement": "Full-time",
+        "WorkLocation": _pick(["Remote", "Onsite", "Hybrid"], seed, 11),
+        "Education": "Bachelor's degree",
+    }
+
+
+def fake_search_queries(content: str) -> dict:
+    seed = hashlib.sha256(content.encode("utf-8")).digest()
+    return {"query": [f"learn {_pick(SKILLS, seed, i)}" for i in range(3)], "lang": "en"}
+
+
+def fake_embedding(text: str, dimensions: int = 256) -> list:
+    """Hashed bag of words, so texts sharing words land close together."""
+    vector = [0.0] * dimensions
+    for word in text.lower().replace(",", " ").replace(":", " ").split():
+        digest = hashlib.md5(word.encode("utf-8")).digest()
+        vector[int.from_bytes(digest[:4], "little") % dimensions] += 1.0 if digest[4] % 2 else -1.0
+    return vector
+
+
+def create_fake_openai(latency: float = 0.05) -> FastAPI:
+    """
+    OpenAI-compatible chat completions that answer structured-output requests, and embeddings.
+
+    Args:
+        latency (float): Seconds each completion takes, to mimic model time
+    """
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        await asyncio.sleep(latency)
+        content = body["messages"][-1]["content"]
+        schema = body.get("response_format", {}).get("json_schema", {}).get("schema", {})
+        if "query" in schema.get("properties", {}):
+            answer = fake_search_queries(content)
+        else:
+            answer = fake_job_details(content)
+        return {
+            "id": f"chatcmpl-{app.state.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(answer)},
+            }],
+            "usage": {"prompt_tokens": len(content) // 4, "completion_tokens": 120, "total_tokens": len(content) // 4 + 120},
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        await asyncio.sleep(latency / 5)
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        return {
+            "object": "list",
+            "model": body["model"],
+            "data": [{"object": "embedding", "index": index, "embedding": fake_embedding(text)} for index, text in enumerate(inputs)],
+            "usage": {"prompt_tokens": sum(len(text) // 4 for text in inputs), "total_tokens": sum(len(text) // 4 for text in inputs)},
+        }
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "gemma-2-27b-it", "object": "model", "created": 0, "owned_by": "bench"}]}
+
+    return app
+
+
+def create_fake_web(latency: float = 0.02, body_size: int = 64 * 1024) -> FastAPI:
+    """
+    Serves an HTML page with a title for any path, padded to body_size bytes.
+
+    Args:
+        latency (float): Seconds before each response
+        body_size (int): Page size, to check the fetcher only reads the head
+    """
+    app = FastAPI()
+    app.state.calls = 0
+    padding = "<p>" + "lorem ipsum " * (body_size // 12) + "</p>"
+
+    @app.get("/{path:path}")
+    async def page(path: str):
+        app.state.calls += 1
+        await asyncio.sleep(latency)
+        etag = '"' + hashlib.sha1(path.encode("utf-8")).hexdigest()[:16] + '"'
+        html = f"<html><head><title>Page {path}</title></head><body>{padding}</body></html>"
+        return HTMLResponse(html, headers={"ETag": etag})
+
+    return app
+
+
+class InMemoryRedis:
+    """
+    The subset of redis.asyncio used by ThrottlingMiddleware, kept in a dict with expiry.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._expires = {}
+
+    def _expire_stale(self, key):
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._values.pop(key, None)
+            self._expires.pop(key, None)
+
+    async def get(self, key):
+        self._expire_stale(key)
+        value = self._values.get(key)
+        return str(value).encode("utf-8") if value is not None else None
+
+    async def set(self, key, value, ex: Optional[int] = None):
+        self._values[key] = int(value)
+        if ex is not None:
+            self._expires[key] = time.monotonic() + ex
+        else:
+            self._expires.pop(key, None)
+
+    async def expire(self, key, seconds: int):
+        self._expire_stale(key)
+        if key in self._values:
+            self._expires[key] = time.monotonic() + seconds
+
+    async def ttl(self, key) -> int:
+        self._expire_stale(key)
+        if key not in self._values:
+            return -2
+        if key not in self._expires:
+            return -1
+        return max(0, int(self._expires[key] - time.monotonic()))
+
+    async def incr(self, key):
+        self._expire_stale(key)
+        self._values[key] = self._values.get(key, 0) + 1
+        return self._values[key]
+
+    async def delete(self, key):
+        self._values.pop(key, None)
+        self._expires.pop(key, None)
+
+
+class NullCacheBackend(Backend):
+    """FastAPICache backend that never stores anything, to benchmark uncached routes."""
+
+    async def get_with_ttl(self, key: str):
+        return 0, None
+
+    async def get(self, key: str):
+        return None
+
+    async def set(self, key: str, value, expire: Optional[int] = None):
+        return None
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        return 0
+
+
+def create_stand_in_server(llm_latency: float = 0.05, web_latency: float = 0.02) -> FastAPI:
+    """The OpenAI stand-in with the fake web pages mounted behind it, for serving on one port."""
+    app = create_fake_openai(latency=llm_latency)
+    app.mount("/", create_fake_web(latency=web_latency))
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the OpenAI and web page stand-ins")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--web-latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_stand_in_server(args.llm_latency_ms / 1000, args.web_latency_ms / 1000),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
@@ -4,12 +4,89 @@ from typing import Optional
 class Settings(BaseSettings):
     MONGODB_URI: str = "mongodb://localhost:27017/"
     DB_NAME: str = "jobsDB"
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 10
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 5000
     JOB_TRACKING_TABLE: str = "job_tracking"
     MANUAL_ANNOTATION_TABLE: str = "manual_annotation"
     EXTRACTED_ENTITIES_TABLE: str = "extracted_entities"
+    INGEST_QUEUE_TABLE: str = "ingest_queue"
+    STATS_ROLLUP_TABLE: str = "job_stats_rollup"
+    EXTRACTION_CACHE_TABLE: str = "extraction_cache"
+    EXTRACTION_CACHE_TTL_SECONDS: int = 30 * 24 * 60 * 60
+    EXTRACTION_CACHE_MEMORY_SIZE: int = 512
+    INGEST_WORKERS: int = 2
+    INGEST_MAX_ATTEMPTS: int = 3
+    INGEST_RETRY_BACKOFF_SECONDS: float = 30.0
+    INGEST_MAX_BATCH_SIZE: int = 1000
+    INGEST_EXTRACTION_TIMEOUT_SECONDS: float = 180.0
+    INGEST_SEARCH_QUERIES_TIMEOUT_SECONDS: float = 90.0
+    INGEST_LEASE_SECONDS: float = 300.0
+    ENRICHMENT_WORKERS: int = 2
+    ENRICHMENT_MAX_ATTEMPTS: int = 3
+    ENRICHMENT_RETRY_BACKOFF_SECONDS: float = 30.0
+    ENRICHMENT_LEASE_SECONDS: float = 300.0
+    JOBS_COUNT_CACHE_TTL_SECONDS: int = 30
+    STATS_SNAPSHOT_TTL_SECONDS: float = 10.0
+    EXPORT_BATCH_SIZE: int = 2000
+    EXPORT_CHUNK_BYTES: int = 256 * 1024
     REDIS_URL: str = "redis://localhost:6379"
+    THROTTLE_LIMIT: int = 100
+    THROTTLE_WINDOW_SECONDS: int = 60
+    RESPONSE_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    URL_FETCH_TIMEOUT_SECONDS: float = 5.0
+    URL_FETCH_MAX_CONNECTIONS: int = 100
+    URL_FETCH_MAX_PER_HOST: int = 4
+    URL_FETCH_MAX_BYTES: int = 16 * 1024
+    URL_METADATA_TABLE: str = "url_metadata"
+    RESUME_TABLE: str = "resumes"
+    MATCH_SCORES_TABLE: str = "match_scores"
+    SKILL_INDEX_TABLE: str = "skill_index"
+    URL_METADATA_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    URL_METADATA_ERROR_TTL_SECONDS: int = 60 * 60
+    URL_METADATA_MEMORY_SIZE: int = 4096
+    SEARCH_PROVIDER: str = "google"
+    SEARCH_RESULTS_PER_QUERY: int = 10
+    SEARCH_MIN_INTERVAL_SECONDS: float = 2.0
+    SEARCH_MAX_CONCURRENCY: int = 2
+    SEARCH_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    SEARCH_EMPTY_CACHE_TTL_SECONDS: int = 5 * 60
+    SEARCH_CACHE_MEMORY_SIZE: int = 1024
+    SEARCH_LOCAL_RESULTS_PATH: Optional[str] = None
+    SEARCH_LOCAL_BASE_URL: str = "http://search.local"
     OPENAI_BASE_URL: str = "http://localhost:1234/v1"
     OPENAI_API_KEY: str = "lm-studio"
+    OPENAI_MODEL: str = "gemma-2-27b-it"
+    OPENAI_TIMEOUT_SECONDS: float = 120.0
+    OPENAI_MAX_CONNECTIONS: int = 20
+    OPENAI_MAX_CONCURRENCY: int = 4
+    OPENAI_EMBEDDING_MODEL: str = "text-embedding-nomic-embed-text-v1.5"
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_MAX_CHARS: int = 4000
+    EMBEDDING_TIMEOUT_SECONDS: float = 30.0
+    EMBEDDING_BACKFILL_MAX_FAILURES: int = 5
+    SEMANTIC_SEARCH_ENABLED: bool = True
+    SEMANTIC_SEARCH_MAX_RESULTS: int = 200
+    SEMANTIC_SEARCH_HYBRID_WEIGHT: float = 0.7
+    SEMANTIC_QUERY_CACHE_SIZE: int = 1024
+    SEMANTIC_QUERY_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    SEMANTIC_INDEX_TYPE: str = "auto"
+    SEMANTIC_INDEX_REFRESH_SECONDS: int = 60 * 60
+    SEMANTIC_IVF_MIN_VECTORS: int = 20000
+    SEMANTIC_IVF_PROBES: int = 8
+    MATCH_SKILL_WEIGHT: float = 0.5
+    MATCH_EMBEDDING_WEIGHT: float = 0.35
+    MATCH_EXPERIENCE_WEIGHT: float = 0.15
+    MATCH_SCORING_BATCH_SIZE: int = 5000
+    MATCH_SCORING_STAMP_MARGIN_SECONDS: float = 300.0
+    MATCH_MEMORY_SIZE: int = 16
+    SKILL_CANONICAL_CACHE_SIZE: int = 4096
+    SKILL_FUZZY_CUTOFF: float = 0.88
+    SKILL_FUZZY_MIN_LENGTH: int = 5
+    SALARY_DEFAULT_CURRENCY: Optional[str] = None
+    SALARY_BACKFILL_BATCH_SIZE: int = 1000
+    JOB_FACET_MAX_VALUES: int = 50
+    QUERY_PLANNER_STATS_TTL_SECONDS: int = 5 * 60
     port: Optional[int] = 8000
 
     class Config:
@@ -5,9 +5,17 @@ from fastapi_cache.backends.redis import RedisBackend
 from redis import asyncio as aioredis
 from fastapi_throttling import ThrottlingMiddleware
 from .app_config import settings
+from src.utils.metrics import MetricsMiddleware
 from src.utils.initialize import initialize_db
 from src.utils.session_management import get_db_client, initialize_session_data
-from src.utils.openai_client import get_openai_client
+from src.utils.openai_client import get_async_openai_client, close_async_openai_client
+from src.utils.ingest_queue import start_ingest_workers, stop_ingest_workers
+from src.utils.enrichment import start_enrichment_workers, stop_enrichment_workers
+from src.utils.embeddings import start_embedding_backfill, stop_embedding_backfill
+from src.utils.skill_index import start_skill_index_rebuild, stop_skill_index_rebuild
+from src.utils.salary import start_salary_backfill, stop_salary_backfill
+from src.utils.response_cache import init_response_cache
+from src.utils.url_helpers import init_http_client, close_http_client
 import logging
 
 def configure_app(app: FastAPI):
@@ -22,9 +30,15 @@ def configure_app(app: FastAPI):
 
     # Configure rate limiting
     app.add_middleware(
-        ThrottlingMiddleware
+        ThrottlingMiddleware,
+        limit=settings.THROTTLE_LIMIT,
+        window=settings.THROTTLE_WINDOW_SECONDS,
+        redis=aioredis.from_url(settings.REDIS_URL)
     )
 
+    # Record request metrics; added last so it wraps the middleware above
+    app.add_middleware(MetricsMiddleware)
+
 async def startup_handler():
     logging.basicConfig(level=logging.INFO)
     logging.info("Starting the server")
@@ -35,22 +49,59 @@ async def startup_handler():
         db=settings.DB_NAME,
         job_tracking_table=settings.JOB_TRACKING_TABLE,
         manual_annotation_table=settings.MANUAL_ANNOTATION_TABLE,
-        extracted_entities_table=settings.EXTRACTED_ENTITIES_TABLE
+        extracted_entities_table=settings.EXTRACTED_ENTITIES_TABLE,
+        ingest_queue_table=settings.INGEST_QUEUE_TABLE,
+        extraction_cache_table=settings.EXTRACTION_CACHE_TABLE,
+        stats_rollup_table=settings.STATS_ROLLUP_TABLE,
+        url_metadata_table=settings.URL_METADATA_TABLE,
+        resume_table=settings.RESUME_TABLE,
+        match_scores_table=settings.MATCH_SCORES_TABLE,
+        skill_index_table=settings.SKILL_INDEX_TABLE,
+        max_pool_size=settings.MONGO_MAX_POOL_SIZE,
+        min_pool_size=settings.MONGO_MIN_POOL_SIZE,
+        wait_queue_timeout_ms=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
     )
     
     # Initialize OpenAI client
-    _ = get_openai_client(
+    _ = get_async_openai_client(
         base_url=settings.OPENAI_BASE_URL,
-        api_key=settings.OPENAI_API_KEY
+        api_key=settings.OPENAI_API_KEY,
+        timeout=settings.OPENAI_TIMEOUT_SECONDS,
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+        max_concurrency=settings.OPENAI_MAX_CONCURRENCY
+    )
+
+    # Configure the pooled fetcher used to resolve search result titles
+    init_http_client(
+        timeout=settings.URL_FETCH_TIMEOUT_SECONDS,
+        max_connections=settings.URL_FETCH_MAX_CONNECTIONS,
+        max_per_host=settings.URL_FETCH_MAX_PER_HOST,
+        max_bytes=settings.URL_FETCH_MAX_BYTES
     )
     
     # Initialize Redis cache
     redis = aioredis.from_url(settings.REDIS_URL)
     FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+    init_response_cache(redis)
     
     # Initialize database
     await initialize_db()
 
+    # Start the ingest workers once the queue indexes exist
+    await start_ingest_workers(settings.INGEST_WORKERS)
+    await start_enrichment_workers(settings.ENRICHMENT_WORKERS)
+    start_skill_index_rebuild()
+    start_salary_backfill()
+    if settings.SEMANTIC_SEARCH_ENABLED:
+        start_embedding_backfill()
+
 async def shutdown_handler():
+    await stop_ingest_workers()
+    await stop_enrichment_workers()
+    await stop_embedding_backfill()
+    await stop_skill_index_rebuild()
+    await stop_salary_backfill()
+    await close_async_openai_client()
+    await close_http_client()
     mongo_client = get_db_client()
     mongo_client.close() 
\ No newline at end of file
@@ -77,3 +77,19 @@ class SearchRequest(BaseModel):
     lang: str = Field("en", description="Language code for the search query")
     num: int = Field(10, ge=1, le=100, description="Number of search results to fetch")
     stop: int = Field(10, ge=1, le=100, description="Number of search results to stop at")
+
+class JobFilters(BaseModel):
+    work_location: Optional[List[WorkLocationType]] = Field(None, description="Jobs with any of these WorkLocation values")
+    work_arrangement: Optional[List[WorkArrangementType]] = Field(None, description="Jobs with any of these WorkArrangement values")
+    country: Optional[List[str]] = Field(None, description="Jobs in any of these countries")
+    job_find: Optional[List[str]] = Field(None, description="Jobs found on any of these platforms")
+    applied: Optional[bool] = Field(None, description="Filter on IsApplied")
+    shortlisted: Optional[bool] = Field(None, description="Filter on IsShortlisted")
+    interviewed: Optional[bool] = Field(None, description="Filter on IsInterviewed")
+    offered: Optional[bool] = Field(None, description="Filter on IsOffered")
+    accepted: Optional[bool] = Field(None, description="Filter on IsAccepted")
+    rejected: Optional[bool] = Field(None, description="Filter on IsRejected")
+    processed_from: Optional[datetime] = Field(None, description="Jobs processed at or after this time")
+    processed_to: Optional[datetime] = Field(None, description="Jobs processed before this time")
+    applied_from: Optional[datetime] = Field(None, description="Jobs applied to at or after this time")
+    applied_to: Optional[datetime] = Field(None, description="Jobs applied to before this time")
@@ -0,0 +1,13 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+class ResumeProfile(BaseModel):
+    text: str = Field(..., description="Plain text of the resume")
+    skills: Optional[List[str]] = Field(None, description="Skills to match against job TechnicalSkills; found in the text when omitted")
+    years_experience: Optional[float] = Field(None, ge=0, description="Years of professional experience; read from the text when omitted")
+
+class MatchJobsRequest(BaseModel):
+    resume_id: Optional[str] = Field(None, description="ID of a stored resume profile")
+    resume: Optional[ResumeProfile] = Field(None, description="Resume to match when no stored profile is given")
+    page: int = Field(1, ge=1, description="Page number")
+    limit: int = Field(12, ge=1, le=100, description="Number of jobs per page")
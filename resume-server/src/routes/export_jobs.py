@@ -0,0 +1,41 @@
+# src/routes/export_jobs.py
+
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from src.utils.job_export import EXPORT_FORMATS, export_jobs
+from src.utils.projections import build_projection
+
+router = APIRouter()
+
+@router.get("/export/jobs")
+async def export_all_jobs(
+    format: Literal["ndjson", "bson"] = Query("ndjson", description="NDJSON lines or concatenated BSON documents"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to export, whole documents when omitted"),
+    since: Optional[datetime] = Query(None, description="Only export jobs processed at or after this time"),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000, description="Documents per cursor batch"),
+):
+    """
+    Stream every tracked job, oldest first, for backups and offline analysis.
+
+    Args:
+        format (str): "ndjson" (Relaxed Extended JSON, one job per line) or "bson" (mongorestore compatible).
+        fields (str): Comma separated field names, ProcessedDate is always included.
+        since (datetime): Lower bound on ProcessedDate, for incremental exports.
+        batch_size (int): Cursor batch size, defaults to settings.EXPORT_BATCH_SIZE.
+
+    Returns:
+        StreamingResponse: The export, streamed as the cursor is read.
+    """
+    try:
+        # Checked up front, the stream cannot turn into an error response once started
+        build_projection("full", fields)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    return StreamingResponse(
+        export_jobs(format, fields, since, batch_size),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="jobs.{format}"'},
+    )
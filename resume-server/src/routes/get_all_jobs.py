@@ -1,46 +1,180 @@
 from fastapi import APIRouter
-from fastapi import Query
-from typing import Optional, Dict
+from fastapi import Depends, Query
+from datetime import datetime
+from typing import Optional, Dict, List, Literal
+import json
 import logging
+from src.config.app_config import settings
+from src.models.job_models import JobFilters, WorkArrangementType, WorkLocationType
 from src.utils.session_management import get_job_tracking_table, get_db_client, get_db_name
-from src.utils.convert_mongo_document import convert_mongo_document
-from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase, AsyncIOMotorClient
+from src.utils.convert_mongo_document import convert_mongo_document, convert_mongo_documents
+from src.utils.lru_cache import TTLCache
+from src.utils.mongo_json import MongoJSONResponse
+from src.utils.pagination import KEYSET_SORT, encode_cursor, keyset_filter
+from src.utils.projections import build_projection
+from src.utils.response_cache import JOB_TAG, JOB_TRACKING_TAG, cached_route, on_job_cache_invalidated
+from src.utils.semantic_search import rank_jobs
+from src.utils.skill_index import skill_filter
+from src.utils.job_filters import filter_conditions, get_job_facets, merge_conditions
+from src.utils.query_planner import plan_query
+from motor.motor_asyncio import AsyncIOMotorCollection
 from pymongo.errors import ConnectionFailure
 from bson.objectid import ObjectId
 from fastapi import HTTPException
 
-router = APIRouter()
+router = APIRouter(default_response_class=MongoJSONResponse)
+
+# Totals are cached briefly so paging through a large collection does not rerun count_documents
+_count_cache = TTLCache(maxsize=256, ttl=settings.JOBS_COUNT_CACHE_TTL_SECONDS)
+on_job_cache_invalidated(_count_cache.clear)
+
+# Facet counts are the same for every page of a listing
+_facet_cache = TTLCache(maxsize=256, ttl=settings.JOBS_COUNT_CACHE_TTL_SECONDS)
+on_job_cache_invalidated(_facet_cache.clear)
+
+
+def job_filters(
+    work_location: Optional[List[WorkLocationType]] = Query(None, description="WorkLocation values, repeat for several"),
+    work_arrangement: Optional[List[WorkArrangementType]] = Query(None, description="WorkArrangement values, repeat for several"),
+    country: Optional[List[str]] = Query(None, description="Countries, repeat for several"),
+    job_find: Optional[List[str]] = Query(None, description="Job platforms, repeat for several"),
+    applied: Optional[bool] = Query(None, description="Filter on IsApplied"),
+    shortlisted: Optional[bool] = Query(None, description="Filter on IsShortlisted"),
+    interviewed: Optional[bool] = Query(None, description="Filter on IsInterviewed"),
+    offered: Optional[bool] = Query(None, description="Filter on IsOffered"),
+    accepted: Optional[bool] = Query(None, description="Filter on IsAccepted"),
+    rejected: Optional[bool] = Query(None, description="Filter on IsRejected"),
+    processed_from: Optional[datetime] = Query(None, description="Jobs processed at or after this ISO time"),
+    processed_to: Optional[datetime] = Query(None, description="Jobs processed before this ISO time"),
+    applied_from: Optional[datetime] = Query(None, description="Jobs applied to at or after this ISO time"),
+    applied_to: Optional[datetime] = Query(None, description="Jobs applied to before this ISO time"),
+) -> JobFilters:
+    return JobFilters(
+        work_location=work_location,
+        work_arrangement=work_arrangement,
+        country=country,
+        job_find=job_find,
+        applied=applied,
+        shortlisted=shortlisted,
+        interviewed=interviewed,
+        offered=offered,
+        accepted=accepted,
+        rejected=rejected,
+        processed_from=processed_from,
+        processed_to=processed_to,
+        applied_from=applied_from,
+        applied_to=applied_to,
+    )
+
+
+async def _count_jobs(job_tracking_table: AsyncIOMotorCollection, query: dict, hint: Optional[str] = None) -> int:
+    cache_key = json.dumps(query, sort_keys=True, default=str)
+    total_jobs = _count_cache.get(cache_key)
+    if total_jobs is None:
+        total_jobs = await job_tracking_table.count_documents(query, **({"hint": hint} if hint else {}))
+        _count_cache.set(cache_key, total_jobs)
+    return total_jobs
+
+
+async def _facets(job_tracking_table: AsyncIOMotorCollection, conditions: dict, base_query: dict):
+    cache_key = json.dumps([base_query, list(conditions.items())], sort_keys=True, default=str)
+    cached = _facet_cache.get(cache_key)
+    if cached is None:
+        cached = await get_job_facets(job_tracking_table, conditions, base_query)
+        _facet_cache.set(cache_key, cached)
+    return cached
+
+
+async def _ranked_jobs_page(job_tracking_table: AsyncIOMotorCollection, search: str, search_mode: str, page: int, limit: int, projection: Optional[dict], include_total: Optional[bool], skill_query: Optional[dict] = None) -> Dict:
+    """A page of jobs in relevance order, with each job's search_score."""
+    ranked = await rank_jobs(job_tracking_table, search, search_mode, settings.SEMANTIC_SEARCH_MAX_RESULTS)
+    if skill_query is not None:
+        allowed_query = {"_id": {"$in": [job_id for job_id, _ in ranked]}, **skill_query}
+        allowed = {job["_id"] async for job in job_tracking_table.find(allowed_query, {"_id": 1})}
+        ranked = [(job_id, score) for job_id, score in ranked if job_id in allowed]
+    skip = (page - 1) * limit
+    page_ranked = ranked[skip:skip + limit]
+    found = await job_tracking_table.find({"_id": {"$in": [job_id for job_id, _ in page_ranked]}}, projection).to_list(length=limit)
+    jobs_by_id = {job["_id"]: job for job in found}
+    jobs = []
+    for job_id, score in page_ranked:
+        job = jobs_by_id.get(job_id)
+        if job is not None:
+            job["search_score"] = round(score, 4)
+            jobs.append(job)
+
+    pagination_info = {
+        "page": page,
+        "limit": limit,
+    }
+    if include_total is None or include_total:
+        # Ranking stops at SEMANTIC_SEARCH_MAX_RESULTS, so this is the number of ranked jobs
+        pagination_info["total"] = len(ranked)
+        pagination_info["total_pages"] = (len(ranked) + limit - 1) // limit
+    return {"jobs": convert_mongo_documents(jobs), "pagination": pagination_info}
+
 
 @router.get("/jobs")
+@cached_route(tags=[JOB_TRACKING_TAG])
 async def get_all_jobs(
     page: int = Query(1, ge=1, description="Page number"),
     search: Optional[str] = Query(None, description="Search query"),
+    search_mode: Literal["text", "semantic", "hybrid"] = Query("text", description="Keyword, embedding or blended relevance"),
+    skills: Optional[str] = Query(None, description="Comma separated skills every job must list, in any spelling"),
+    salary_min: Optional[float] = Query(None, ge=0, description="Minimum annual salary, in salary_currency"),
+    salary_max: Optional[float] = Query(None, ge=0, description="Maximum annual salary, in salary_currency"),
+    salary_currency: Optional[str] = Query(None, min_length=3, max_length=3, description="ISO currency code of the salary range"),
+    filters: JobFilters = Depends(job_filters),
+    include_facets: Optional[bool] = Query(None, description="Include facet counts, defaults to true in page mode only"),
     limit: int = Query(12, ge=1, le=100, description="Number of items per page"),
+    pagination: Literal["page", "cursor"] = Query("page", description="Pagination mode"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page, implies cursor pagination"),
+    include_total: Optional[bool] = Query(None, description="Include the total count, defaults to true in page mode only"),
+    view: Literal["card", "full"] = Query("full", description="Named field selection"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, overrides view"),
 ) -> Dict:
     """
-    Fetch all jobs with optional pagination and search.
+    Fetch all jobs with optional pagination, search and filters.
+
+    Page mode skips (page-1)*limit documents and is kept for compatibility.
+    Cursor mode walks the (ProcessedDate, _id) index newest first, so deep pages
+    cost the same as the first one; pass pagination.next_cursor back as cursor.
+    Semantic and hybrid search rank by embedding similarity (blended with the
+    text score in hybrid mode) and only support page mode.
+
+    Filtered listings are sorted newest first and read through the compound
+    index the query planner estimates to be most selective. Facet counts give
+    the number of jobs per WorkLocation, WorkArrangement, Country, JobFind and
+    status flag, each counted with every filter but its own.
 
     Args:
         page (int): Page number, defaults to 1.
         search (str): Search query, defaults to None (no search filter applied).
+        search_mode (str): "text", "semantic" or "hybrid", defaults to "text".
+        skills (str): Comma separated skills, matched on their canonical skill keys.
+        salary_min (float): Minimum parsed annual salary.
+        salary_max (float): Maximum parsed annual salary.
+        salary_currency (str): Currency of the salary range, required with salary_min or salary_max.
+        filters (JobFilters): WorkLocation, WorkArrangement, Country, JobFind, status flag and date filters.
+        include_facets (bool): Whether to return facet counts, counts are cached briefly.
         limit (int): Number of items per page, defaults to 12.
+        pagination (str): "page" or "cursor", defaults to "page".
+        cursor (str): Opaque cursor returned by the previous cursor-mode page.
+        include_total (bool): Whether to count matching jobs, counts are cached briefly.
+        view (str): "card" for the fields the job cards render, "full" for whole documents.
+        fields (str): Comma separated field names, overrides view.
 
     Returns:
-        dict: Paginated list of jobs matching the query.
+        dict: Paginated list of jobs matching the query, with facet counts when requested.
     """
     try:
         # Get database and collection names
         db_client = get_db_client()
-        if not isinstance(db_client, AsyncIOMotorClient):
-            raise TypeError(f"Expected AsyncIOMotorClient, got {type(db_client)}")
-        
         db_name = get_db_name()
         if not isinstance(db_name, str):
             raise TypeError(f"Expected a string for db name, got {type(db_name)}")
         
         db = db_client[db_name]
-        if not isinstance(db, AsyncIOMotorDatabase):
-            raise TypeError(f"Expected AsyncIOMotorDatabase, got {type(db)}")
 
         job_tracking_table_name = get_job_tracking_table()
         if not isinstance(job_tracking_table_name, str):
@@ -48,36 +182,113 @@ async def get_all_jobs(
 
         # Access the collection
         job_tracking_table = db[job_tracking_table_name]
-        if not isinstance(job_tracking_table, AsyncIOMotorCollection):
-            raise ValueError(f"Expected AsyncIOMotorCollection, got {type(job_tracking_table)}")
+
+        salary_query = {}
+        if salary_min is not None or salary_max is not None:
+            if not salary_currency:
+                raise ValueError("salary_currency is required to filter by salary")
+            # Served by the (SalaryCurrency, SalaryAnnual) index
+            salary_query["SalaryCurrency"] = salary_currency.upper()
+            salary_query["SalaryAnnual"] = {}
+            if salary_min is not None:
+                salary_query["SalaryAnnual"]["$gte"] = salary_min
+            if salary_max is not None:
+                salary_query["SalaryAnnual"]["$lte"] = salary_max
+
+        conditions = filter_conditions(filters)
+
+        skill_list = [skill.strip() for skill in (skills or "").split(",") if skill.strip()]
+        skill_query = skill_filter(skill_list)
+
+        if search and search_mode != "text":
+            if not settings.SEMANTIC_SEARCH_ENABLED:
+                raise ValueError("Semantic search is disabled")
+            if cursor is not None or pagination == "cursor":
+                raise ValueError("Cursor pagination is not supported for semantic search")
+            projection = build_projection(view, fields)
+            if salary_query or conditions:
+                raise ValueError("Salary and field filters are not supported for semantic search")
+            return await _ranked_jobs_page(job_tracking_table, search, search_mode, page, limit, projection, include_total, skill_query)
 
         # Build query and pagination
         query = {}
         if search:
             query["$text"] = {"$search": search}
+        if skill_query is not None:
+            query.update(skill_query)
+        query.update(salary_query)
+        base_query = query
+        query = merge_conditions(conditions, base_query)
 
-        skip = (page - 1) * limit
+        # Listings read newest first off the planned index, processed_date_keyset when
+        # unfiltered; text search keeps relevance order
+        cursor_mode = cursor is not None or pagination == "cursor"
+        sorted_results = cursor_mode or not search
+        plan = plan_query(job_tracking_table, query, sort=sorted_results)
+        facets, facet_total = None, None
+        if include_facets or (include_facets is None and not cursor_mode):
+            facets, facet_total = await _facets(job_tracking_table, conditions, base_query)
 
-        # Execute the query
-        cursor = job_tracking_table.find(query).skip(skip).limit(limit)
-        jobs = await cursor.to_list(length=limit)
-        jobs = [await convert_mongo_document(job) for job in jobs]
+        async def count_total() -> int:
+            if facet_total is not None:
+                return facet_total
+            return await _count_jobs(job_tracking_table, query, plan.index)
 
-        # Get total count
-        total_jobs = await job_tracking_table.count_documents(query)
+        if cursor_mode:
+            # Fetch one extra document to know whether another page exists
+            page_query = {"$and": [query, keyset_filter(cursor)]} if cursor else query
+            projection = build_projection(view, fields, required=["ProcessedDate"])
+            page_cursor = job_tracking_table.find(page_query, projection).sort(KEYSET_SORT).limit(limit + 1)
+            if plan.index:
+                page_cursor = page_cursor.hint(plan.index)
+            jobs = await page_cursor.to_list(length=limit + 1)
+            has_more = len(jobs) > limit
+            jobs = jobs[:limit]
+            next_cursor = encode_cursor(jobs[-1]) if has_more else None
+            jobs = convert_mongo_documents(jobs)
 
-        response = {
-            "jobs": jobs,
-            "pagination": {
-                "page": page,
+            pagination_info = {
                 "limit": limit,
-                "total": total_jobs,
-                "total_pages": (total_jobs + limit - 1) // limit,
-            },
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+            }
+            if include_total:
+                total_jobs = await count_total()
+                pagination_info["total"] = total_jobs
+                pagination_info["total_pages"] = (total_jobs + limit - 1) // limit
+            response = {"jobs": jobs, "pagination": pagination_info}
+            if facets is not None:
+                response["facets"] = facets
+            return response
+
+        skip = (page - 1) * limit
+
+        # Execute the query
+        projection = build_projection(view, fields)
+        cursor = job_tracking_table.find(query, projection)
+        if sorted_results:
+            cursor = cursor.sort(KEYSET_SORT)
+        if plan.index:
+            cursor = cursor.hint(plan.index)
+        jobs = await cursor.skip(skip).limit(limit).to_list(length=limit)
+        jobs = convert_mongo_documents(jobs)
+
+        pagination_info = {
+            "page": page,
+            "limit": limit,
         }
-        print(response)
+        if include_total is None or include_total:
+            total_jobs = await count_total()
+            pagination_info["total"] = total_jobs
+            pagination_info["total_pages"] = (total_jobs + limit - 1) // limit
+
+        response = {"jobs": jobs, "pagination": pagination_info}
+        if facets is not None:
+            response["facets"] = facets
         return response
 
+    except ValueError as ve:
+        return {"error": str(ve)}
     except ConnectionFailure as e:
         logging.error(f"Database connection error: {e}")
         return {"error": "Failed to connect to the database."}
@@ -86,29 +297,41 @@ async def get_all_jobs(
         return {"error": f"Error fetching all jobs: {str(e)}"}
 
 @router.get("/jobs/{job_id}")
-async def get_job_by_id(job_id: str):
+@cached_route(param_tags={"job_id": JOB_TAG})
+async def get_job_by_id(
+    job_id: str,
+    view: Literal["card", "full"] = Query("full", description="Named field selection"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, overrides view"),
+):
     """
     Fetch a specific job by its ID.
 
     Args:
         job_id (str): The unique identifier of the job.
+        view (str): "card" or "full", defaults to "full".
+        fields (str): Comma separated field names, overrides view.
 
     Returns:
         dict: Detailed job information or error message.
     """
+    try:
+        projection = build_projection(view, fields)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
     try:
         db_client = get_db_client()
         db_name = get_db_name()
         job_tracking_table = db_client[db_name][get_job_tracking_table()]
 
         # Find the job by its ID
-        job = await job_tracking_table.find_one({"_id": ObjectId(job_id)})
+        job = await job_tracking_table.find_one({"_id": ObjectId(job_id)}, projection)
         
         if not job:
             return {"error": "Job not found"}
 
         # Convert MongoDB document to a standard dictionary
-        job = await convert_mongo_document(job)
+        job = convert_mongo_document(job)
         
         return job
 
@@ -1,16 +1,16 @@
 from fastapi import APIRouter
-from src.utils.openai_client import get_openai_client
+from src.utils.openai_client import get_async_openai_client
 import logging
 
 router = APIRouter()
 
 
 @router.get("/availableModels")
-def get_available_models():
-    openai_client = get_openai_client()
+async def get_available_models():
+    openai_client = get_async_openai_client()
     available_models = []
     try:
-        models = openai_client.models.list()
+        models = await openai_client.models.list()
         for model in models.data:
             available_models.append(model.id)
     except Exception as e:
@@ -1,89 +1,86 @@
-from fastapi import APIRouter, BackgroundTasks, Query, HTTPException, Response
+from fastapi import APIRouter, Query, HTTPException, Response
 from fastapi.responses import JSONResponse
-from src.models.job_models import AddJobRequest, JobDataEntities
+from src.models.job_models import AddJobRequest
 from src.utils.error_handling import handle_exceptions
 from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table
-from src.utils.extract_job_details import extract_url_find_id
+from src.config.app_config import settings
+from src.utils.ingest_queue import submit_job, submit_jobs, get_ingest_ticket
 from src.utils.google_search import search_google
-from src.utils.openai_client import get_openai_client
-from src.utils.openai_helpers import process_job_and_extract_details, get_google_search_queries
-from src.utils.annotation_helpers import add_job_to_manual_annotation_table
-from src.utils.url_helpers import get_titles_for_urls
+from src.utils.url_metadata import resolve_url_titles
 from src.utils.convert_mongo_document import convert_mongo_document
+from src.utils.mongo_json import MongoJSONResponse
+from src.utils.projections import build_projection
+from src.utils.stats_rollup import ROLLUP_FIELDS, record_jobs_updated
+from src.utils.skills import skill_fields
+from src.utils.salary import salary_fields
+from src.utils.skill_index import reindex_job_skills
+from src.utils.match_scoring import SCORED_FIELDS, SCORING_STAMP_FIELD, invalidate_job_scores, scoring_stamp
+from src.utils.response_cache import JOB_TAG, JOB_TRACKING_TAG, cached_route, invalidate_job_cache
 from bson.objectid import ObjectId
 from bson.errors import InvalidId
 import logging
+from collections import Counter
 from typing import List, Optional
 from pymongo import UpdateOne
 
-router = APIRouter(prefix="/api")
+router = APIRouter(default_response_class=MongoJSONResponse)
 
 @router.post("/addJob")
 @handle_exceptions
-async def add_job(job: AddJobRequest, background_tasks: BackgroundTasks):
+async def add_job(job: AddJobRequest):
     try:
-        # Critical operations
-        job_url, job_post_id, job_find = await extract_url_find_id(job)
-        job_id = await add_job_to_manual_annotation_table(job.content)
-        if not job_id:
-            return {"error": "Error adding job to manual annotation table"}
+        # Persist the raw posting and hand extraction off to the ingest workers
+        result = await submit_job(job)
+        if not result:
+            return {"error": "Error queueing job for processing"}
 
-        job_details = await process_job_and_extract_details(
-            job_content=job.content, 
-            job_url=job_url, 
-            job_find=job_find, 
-            job_id=job_post_id
-        )
-        
-        if not job_details:
-            return {"error": "Error extracting job details"}
-
-        # Fetch search queries
-        search_queries, lang = await get_google_search_queries(job.content)
-        print(f"Search queries: {search_queries}")
-        print(f"Language: {lang}")
-        # Add to tracking table
-        db = get_db_client()
-        job_tracking_table = db[get_db_name()][get_job_tracking_table()]
-        job_tracking_entry = job_details.dict(by_alias=True)
-        job_tracking_entry.update({
-            "job_id": str(job_id),
-            "ResumeGenerated": False,
-            "ResumePath": "",
-            "statuses": [],
-            "search_queries": search_queries, # Store search queries
-            "search_lang": lang, # Store language
-        })
-
-        tracking_result = await job_tracking_table.insert_one(job_tracking_entry)
-        if not tracking_result.inserted_id:
-            return {"error": "Error adding job to tracking table"}
-
-        
-        return {"message": "Job added successfully", "job_id": str(tracking_result.inserted_id)}
+        if result["status"] == "tracked":
+            return {"message": "Job already tracked", "job_id": result["job_id"], "duplicate": True}
+        if result["status"] == "in_progress":
+            return {"message": "Job already queued for processing", "ticket": result["ticket"], "duplicate": True}
+        return {"message": "Job queued for processing", "ticket": result["ticket"]}
     except Exception as e:
         logging.error(f"Error adding job: {e}")
         return {"error": "Error adding job"}
 
-async def process_search_queries(content: str, job_id: str):
+@router.post("/addJobs")
+@handle_exceptions
+async def add_jobs(jobs: List[AddJobRequest]):
+    if not jobs:
+        raise ValueError("No jobs provided")
+    if len(jobs) > settings.INGEST_MAX_BATCH_SIZE:
+        raise ValueError(f"At most {settings.INGEST_MAX_BATCH_SIZE} jobs can be added per request")
+
+    results = await submit_jobs(jobs)
+    summary = Counter(result["status"] for result in results)
+    return {
+        "message": f"{summary.get('queued', 0)} of {len(jobs)} jobs queued for processing",
+        "summary": dict(summary),
+        "results": [{"index": index, **result} for index, result in enumerate(results)],
+    }
+
+@router.get("/ingest/{ticket}")
+async def get_ingest_status(ticket: str):
     try:
-        search_queries, lang = await get_google_search_queries(content)
-        print(f"Search queries: {search_queries}")
-        if search_queries:
-            search_results = await search_google(search_queries, lang)
-            # Convert generator to list
-            search_results = list(search_results)
-            # Store results in database
-            db = get_db_client()
-            job_tracking_table = db[get_db_name()][get_job_tracking_table()]
-            await job_tracking_table.update_one(
-                {"job_id": job_id},
-                {"$set": {"search_results": search_results}}
-            )
-        print(f"Search queries processed for job {job_id}")
-        print(f"Search results: {search_results}")
+        status = await get_ingest_ticket(ticket)
+    except ValueError as ve:
+        return JSONResponse(
+            status_code=400,
+            content={"error": str(ve)}
+        )
     except Exception as e:
-        logging.error(f"Error processing search queries: {e}")
+        logging.error(f"Error fetching ingest status: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Server error: {str(e)}"}
+        )
+
+    if not status:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Ticket not found"}
+        )
+    return status
 
 @router.post("/bulkUpdate")
 @handle_exceptions
@@ -92,15 +89,42 @@ async def bulk_update_job_statuses(jobs_data: List[dict]):
         db = get_db_client()
         job_tracking_table = db[get_db_name()][get_job_tracking_table()]
         
+        # Ids arrive as strings from the dashboard
+        job_ids = [ObjectId(job["id"]) if ObjectId.is_valid(job["id"]) else job["id"] for job in jobs_data]
+        for job in jobs_data:
+            if "TechnicalSkills" in job["updates"]:
+                job["updates"] = {**job["updates"], **skill_fields(job["updates"]["TechnicalSkills"])}
+            if "Salary" in job["updates"]:
+                job["updates"] = {**job["updates"], **salary_fields(job["updates"]["Salary"])}
+            if SCORED_FIELDS & job["updates"].keys():
+                job["updates"] = {**job["updates"], **scoring_stamp()}
+        # Their match scores are redone on the next match
+        rescored_ids = [job_id for job_id, job in zip(job_ids, jobs_data) if SCORING_STAMP_FIELD in job["updates"]]
         operations = [
             UpdateOne(
-                {"_id": job["id"]},
+                {"_id": job_id},
                 {"$set": job["updates"]}
-            ) for job in jobs_data
+            ) for job_id, job in zip(job_ids, jobs_data)
         ]
-        
+
+        # Snapshot the fields the stats rollup and skill index depend on so the write can be applied as a delta
+        before = {
+            doc["_id"]: doc
+            async for doc in job_tracking_table.find({"_id": {"$in": job_ids}}, ROLLUP_FIELDS + ["TechnicalSkills"])
+        }
+        after = {job_id: dict(doc) for job_id, doc in before.items()}
+        for job_id, job in zip(job_ids, jobs_data):
+            if job_id in after:
+                after[job_id].update(job["updates"])
+
         result = await job_tracking_table.bulk_write(operations)
-        return result
+        await record_jobs_updated((before[job_id], after[job_id]) for job_id in before)
+        await reindex_job_skills(
+            (job_id, before[job_id].get("TechnicalSkills"), after[job_id].get("TechnicalSkills")) for job_id in before
+        )
+        await invalidate_job_scores(*rescored_ids)
+        await invalidate_job_cache(*(str(job_id) for job_id in job_ids))
+        return {"matched": result.matched_count, "modified": result.modified_count}
     except Exception as e:
         logging.error(f"Error in bulk update: {e}")
         return None 
@@ -126,6 +150,7 @@ async def process_search_queries_endpoint(job_id: str):
                 {"job_id": job_id},
                 {"$set": {"search_results": search_results_list}}
             )
+            await invalidate_job_cache(str(job["_id"]), job_id)
             return {"message": f"Search queries processed for job {job_id}"}
         else:
             return {"message": f"No search queries found for job {job_id}"}
@@ -163,14 +188,15 @@ async def get_url_titles(job_id: str):
         # Flatten the list of search results
         urls = [url for sublist in search_results for url in sublist]
         
-        # Get titles for all URLs
-        results_with_titles = await get_titles_for_urls(urls)
+        # Get titles for all URLs, reusing the ones other jobs already resolved
+        results_with_titles = await resolve_url_titles(urls)
         
         # Update the job document with titles
         await job_tracking_table.update_one(
             {"job_id": job_id},
             {"$set": {"search_results_with_titles": results_with_titles}}
         )
+        await invalidate_job_cache(str(job["_id"]), job_id)
         
         return {
             "message": "Titles fetched successfully",
@@ -182,6 +208,7 @@ async def get_url_titles(job_id: str):
         return {"error": f"Error getting URL titles: {str(e)}"}
 
 @router.get("/dashboard/{job_id}")
+@cached_route(tags=[JOB_TRACKING_TAG], param_tags={"job_id": JOB_TAG})
 async def get_job_dashboard_data(job_id: str):
     logging.info(f"Received request for job_id: {job_id}")
     try:
@@ -199,7 +226,7 @@ async def get_job_dashboard_data(job_id: str):
         job_tracking_table = db_client[db_name][get_job_tracking_table()]
 
         # Get the specific job details
-        job = await job_tracking_table.find_one({"job_id": job_id})
+        job = await job_tracking_table.find_one({"job_id": job_id}, build_projection())
         if not job:
             return JSONResponse(
                 status_code=404,
@@ -207,7 +234,7 @@ async def get_job_dashboard_data(job_id: str):
             )
 
         # Convert MongoDB document to a standard dictionary
-        job = await convert_mongo_document(job)
+        job = convert_mongo_document(job)
 
         # Get related statistics and data
         pipeline = [
@@ -217,25 +244,41 @@ async def get_job_dashboard_data(job_id: str):
                 }
             },
             {
-                "$group": {
-                    "_id": None,
-                    "total_applications": {"$sum": 1},
-                    "avg_salary": {"$avg": "$Salary"},
-                    "similar_roles": {
-                        "$addToSet": "$JobTitle"
-                    }
+                "$facet": {
+                    "overview": [
+                        {
+                            "$group": {
+                                "_id": None,
+                                "total_applications": {"$sum": 1},
+                                "similar_roles": {
+                                    "$addToSet": "$JobTitle"
+                                }
+                            }
+                        }
+                    ],
+                    # Averaged on the parsed annual salary, per currency
+                    "salaries": [
+                        {"$match": {"SalaryAnnual": {"$ne": None}, "SalaryCurrency": {"$ne": None}}},
+                        {"$group": {"_id": "$SalaryCurrency", "avg_salary": {"$avg": "$SalaryAnnual"}, "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1}}
+                    ]
                 }
             }
         ]
         
         stats = await job_tracking_table.aggregate(pipeline).to_list(length=1)
-        company_stats = stats[0] if stats else {}
+        facets = stats[0] if stats else {}
+        company_stats = (facets.get("overview") or [{}])[0]
+        salaries = facets.get("salaries") or []
+        # The job's own currency when the company has salaries in it, otherwise its most common one
+        salary = next((entry for entry in salaries if entry["_id"] == job.get("SalaryCurrency")), salaries[0] if salaries else {})
 
         dashboard_data = {
             "jobDetails": job,
             "companyStats": {
                 "totalApplications": company_stats.get("total_applications", 0),
-                "averageSalary": company_stats.get("avg_salary", 0),
+                "averageSalary": salary.get("avg_salary"),
+                "averageSalaryCurrency": salary.get("_id"),
                 "similarRoles": company_stats.get("similar_roles", [])
             },
             "applicationTimeline": {
@@ -247,7 +290,7 @@ async def get_job_dashboard_data(job_id: str):
 
         logging.info(f"Found job: {job}")
 
-        return JSONResponse(content=dashboard_data)
+        return dashboard_data
 
     except Exception as e:
         logging.error(f"Error in get_job_dashboard_data: {str(e)}")
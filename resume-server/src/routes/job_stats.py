@@ -1,138 +1,39 @@
-from fastapi import APIRouter
-from fastapi_cache.decorator import cache
-from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table
+from fastapi import APIRouter, Query
+from typing import Optional
+from src.utils.stats_engine import STAGE_FLAGS, get_job_stats_snapshot
+from src.utils.stats_rollup import get_stats_rollup
+from src.utils.salary import salary_histogram
 from src.utils.error_handling import handle_exceptions
+from src.utils.response_cache import JOB_TRACKING_TAG, cached_route
 import logging
 
 router = APIRouter()
 
 @router.get("/applicationStages")
+@cached_route(tags=[JOB_TRACKING_TAG])
 @handle_exceptions
 async def get_application_stages():
     try:
-        db = get_db_client()
-        job_tracking_table = db[get_db_name()][get_job_tracking_table()]
-        pipeline = [
-            {
-                "$group": {
-                    "_id": None,
-                    "Applied": {"$sum": {"$cond": ["$IsApplied", 1, 0]}},
-                    "Shortlisted": {"$sum": {"$cond": ["$IsShortlisted", 1, 0]}},
-                    "Interviewed": {"$sum": {"$cond": ["$IsInterviewed", 1, 0]}},
-                    "Offered": {"$sum": {"$cond": ["$IsOffered", 1, 0]}},
-                    "Accepted": {"$sum": {"$cond": ["$IsAccepted", 1, 0]}},
-                    "Rejected": {"$sum": {"$cond": ["$IsRejected", 1, 0]}}
-                }
-            }
-        ]
-        result = await job_tracking_table.aggregate(pipeline).to_list(length=1)
-        return result[0] if result else {}
+        rollup = await get_stats_rollup()
+        return {"_id": None, **{stage: rollup.get(stage, 0) for stage in STAGE_FLAGS}}
     except Exception as e:
         logging.error(f"Error fetching application stages: {e}")
         return {"error": "Error fetching application stages"}
 
 @router.get("/stats")
-@cache(expire=300)
+@cached_route(tags=[JOB_TRACKING_TAG])
 @handle_exceptions
 async def get_job_stats():
     try:
-        db = get_db_client()
-        job_tracking_table = db[get_db_name()][get_job_tracking_table()]
+        snapshot = await get_job_stats_snapshot()
 
-        # Application Stage Distribution
-        application_stage_pipeline = [
-            {
-                "$group": {
-                    "_id": None,
-                    "Applied": {"$sum": {"$cond": ["$IsApplied", 1, 0]}},
-                    "Shortlisted": {"$sum": {"$cond": ["$IsShortlisted", 1, 0]}},
-                    "Interviewed": {"$sum": {"$cond": ["$IsInterviewed", 1, 0]}},
-                    "Offered": {"$sum": {"$cond": ["$IsOffered", 1, 0]}},
-                    "Accepted": {"$sum": {"$cond": ["$IsAccepted", 1, 0]}},
-                    "Rejected": {"$sum": {"$cond": ["$IsRejected", 1, 0]}}
-                }
-            }
-        ]
-        application_stage_result = await job_tracking_table.aggregate(application_stage_pipeline).to_list(length=1)
-        application_stage = application_stage_result[0] if application_stage_result else {}
-        
-        # Salary Distribution
-        salary_distribution_pipeline = [
-            {
-                "$match": {
-                    "Salary": {"$ne": "Not Specified"}
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$Salary",
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$sort": {"_id": 1}
-            }
-        ]
-        salary_distribution = await job_tracking_table.aggregate(salary_distribution_pipeline).to_list(length=None)
-        
-        # Location Distribution
-        location_distribution_pipeline = [
-            {
-                "$group": {
-                    "_id": "$Country",  # You can change this to "State" or "City" if preferred
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$sort": {"count": -1}
-            }
-        ]
-        location_distribution = await job_tracking_table.aggregate(location_distribution_pipeline).to_list(length=None)
-        
-        # Top Skills
-        top_skills_pipeline = [
-            {"$unwind": "$TechnicalSkills"},
-            {
-                "$group": {
-                    "_id": "$TechnicalSkills",
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$sort": {"count": -1}
-            },
-            {
-                "$limit": 10  # Top 10 skills
-            }
-        ]
-        top_skills = await job_tracking_table.aggregate(top_skills_pipeline).to_list(length=None)
-        
-        # Job Source Effectiveness
-        job_source_pipeline = [
-            {
-                "$group": {
-                    "_id": "$JobFind",
-                    "total_applications": {"$sum": 1},
-                    "shortlisted": {"$sum": {"$cond": ["$IsShortlisted", 1, 0]}},
-                    "interviewed": {"$sum": {"$cond": ["$IsInterviewed", 1, 0]}},
-                    "offered": {"$sum": {"$cond": ["$IsOffered", 1, 0]}},
-                    "accepted": {"$sum": {"$cond": ["$IsAccepted", 1, 0]}},
-                    "rejected": {"$sum": {"$cond": ["$IsRejected", 1, 0]}}
-                }
-            },
-            {
-                "$sort": {"total_applications": -1}
-            }
-        ]
-        job_source_effectiveness = await job_tracking_table.aggregate(job_source_pipeline).to_list(length=None)
-        
         # Compile all stats
         stats = {
-            "applicationStageDistribution": application_stage,
-            "salaryDistribution": salary_distribution,
-            "locationDistribution": location_distribution,
-            "topSkills": top_skills,
-            "jobSourceEffectiveness": job_source_effectiveness
+            "applicationStageDistribution": snapshot["applicationStageDistribution"],
+            "salaryDistribution": snapshot["salaryDistribution"],
+            "locationDistribution": snapshot["locationDistribution"],
+            "topSkills": snapshot["topSkills"],
+            "jobSourceEffectiveness": snapshot["jobSourceEffectiveness"]
         }
         
         return stats
@@ -141,43 +42,29 @@ async def get_job_stats():
         return {"error": "Error fetching job statistics"}
 
 @router.get("/jobSourceEffectiveness")
+@cached_route(tags=[JOB_TRACKING_TAG])
 @handle_exceptions
 async def get_job_source_effectiveness():
     try:
-        db = get_db_client()
-        job_tracking_table = db[get_db_name()][get_job_tracking_table()]
-        pipeline = [
-            {
-                "$group": {
-                    "_id": "$JobFind",
-                    "total_applications": {"$sum": 1},
-                    "shortlisted": {"$sum": {"$cond": ["$IsShortlisted", 1, 0]}},
-                    "interviewed": {"$sum": {"$cond": ["$IsInterviewed", 1, 0]}},
-                    "offered": {"$sum": {"$cond": ["$IsOffered", 1, 0]}},
-                    "accepted": {"$sum": {"$cond": ["$IsAccepted", 1, 0]}},
-                    "rejected": {"$sum": {"$cond": ["$IsRejected", 1, 0]}}
-                }
-            }
-        ]
-        results = await job_tracking_table.aggregate(pipeline).to_list(length=None)
-        return results
+        stats = await get_job_stats_snapshot()
+        return stats["jobSourceEffectiveness"]
     except Exception as e:
         logging.error(f"Error fetching job source effectiveness: {e}")
         return {"error": "Error fetching job source effectiveness"}
 
 
 @router.get("/responseRates")
+@cached_route(tags=[JOB_TRACKING_TAG])
 @handle_exceptions
 async def get_response_rates():
     try:
-        db = get_db_client()
-        job_tracking_table = db[get_db_name()][get_job_tracking_table()]
-        total_applied = await job_tracking_table.count_documents({"IsApplied": True})
-        total_shortlisted = await job_tracking_table.count_documents({"IsShortlisted": True})
-        total_interviewed = await job_tracking_table.count_documents({"IsInterviewed": True})
-        total_offered = await job_tracking_table.count_documents({"IsOffered": True})
-        total_accepted = await job_tracking_table.count_documents({"IsAccepted": True})
-        total_rejected = await job_tracking_table.count_documents({"IsRejected": True})
+        stages = await get_stats_rollup()
+        total_applied = stages.get("Applied", 0)
+        total_shortlisted = stages.get("Shortlisted", 0)
+        total_interviewed = stages.get("Interviewed", 0)
+        total_offered = stages.get("Offered", 0)
+        total_accepted = stages.get("Accepted", 0)
+        total_rejected = stages.get("Rejected", 0)
 
         return {
             "Applied": total_applied,
@@ -198,3 +85,28 @@ async def get_response_rates():
         logging.error(f"Error fetching response rates: {e}")
         return {"error": "Error fetching response rates"}
 
+
+@router.get("/salaryHistogram")
+@cached_route(tags=[JOB_TRACKING_TAG])
+@handle_exceptions
+async def get_salary_histogram(
+    currency: str = Query(..., min_length=3, max_length=3, description="ISO currency code, amounts are not converted"),
+    bucket_width: Optional[float] = Query(None, gt=0, description="Annual amount per bucket"),
+    company: Optional[str] = Query(None, description="Only count this company's jobs"),
+):
+    """
+    Count jobs per annual salary bucket in one currency.
+
+    Args:
+        currency (str): ISO currency code, e.g. "USD".
+        bucket_width (float): Bucket width, defaults to a width suited to the currency.
+        company (str): Only count this company's jobs.
+
+    Returns:
+        list: Bucket min, max and job count, lowest bucket first.
+    """
+    try:
+        return await salary_histogram(currency, bucket_width, company)
+    except Exception as e:
+        logging.error(f"Error fetching salary histogram: {e}")
+        return {"error": "Error fetching salary histogram"}
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+from src.utils.metrics import render_metrics
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus scrape endpoint for request, Mongo, LLM and outbound fetch metrics
+    """
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -0,0 +1,122 @@
+# src/routes/resume_match.py
+
+import logging
+from datetime import datetime
+from bson.objectid import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, HTTPException
+from src.models.resume_models import MatchJobsRequest, ResumeProfile
+from src.utils.convert_mongo_document import convert_mongo_document
+from src.utils.match_scoring import match_jobs, resume_version
+from src.utils.mongo_json import MongoJSONResponse
+from src.utils.session_management import get_db_client, get_db_name, get_resume_table
+
+router = APIRouter(default_response_class=MongoJSONResponse)
+
+
+def _resume_table():
+    return get_db_client()[get_db_name()][get_resume_table()]
+
+
+def _resume_object_id(resume_id: str) -> ObjectId:
+    try:
+        return ObjectId(resume_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid resume ID format")
+
+
+@router.post("/resumes")
+async def create_resume(resume: ResumeProfile):
+    """
+    Store a resume profile to match jobs against.
+
+    Args:
+        resume (ResumeProfile): Resume text, optional skills and years of experience.
+
+    Returns:
+        dict: The new resume_id and its resume_version.
+    """
+    try:
+        profile = resume.model_dump()
+        now = datetime.utcnow()
+        version = resume_version(profile)
+        result = await _resume_table().insert_one({**profile, "version": version, "created_at": now, "updated_at": now})
+        return {"resume_id": str(result.inserted_id), "resume_version": version}
+    except Exception as e:
+        logging.error(f"Error storing resume: {e}")
+        return {"error": "Error storing resume"}
+
+
+@router.put("/resumes/{resume_id}")
+async def update_resume(resume_id: str, resume: ResumeProfile):
+    """
+    Replace a stored resume profile; its matches are scored afresh under the new version.
+
+    Args:
+        resume_id (str): ID returned when the resume was stored.
+        resume (ResumeProfile): The new resume content.
+
+    Returns:
+        dict: The resume_id and its new resume_version.
+    """
+    object_id = _resume_object_id(resume_id)
+    try:
+        profile = resume.model_dump()
+        version = resume_version(profile)
+        result = await _resume_table().update_one(
+            {"_id": object_id},
+            {"$set": {**profile, "version": version, "updated_at": datetime.utcnow()}},
+        )
+    except Exception as e:
+        logging.error(f"Error updating resume {resume_id}: {e}")
+        return {"error": "Error updating resume"}
+    if not result.matched_count:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return {"resume_id": resume_id, "resume_version": version}
+
+
+@router.get("/resumes/{resume_id}")
+async def get_resume(resume_id: str):
+    """
+    Fetch a stored resume profile.
+
+    Args:
+        resume_id (str): ID returned when the resume was stored.
+
+    Returns:
+        dict: The resume profile.
+    """
+    resume = await _resume_table().find_one({"_id": _resume_object_id(resume_id)})
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return convert_mongo_document(resume)
+
+
+@router.post("/matchJobs")
+async def match_jobs_to_resume(request: MatchJobsRequest):
+    """
+    Rank tracked jobs against a resume by skill overlap, embedding similarity and experience.
+
+    Scores are cached per (resume_version, job); only jobs added or embedded
+    since the last request for the same resume version are scored.
+
+    Args:
+        request (MatchJobsRequest): A stored resume_id or an inline resume, and the page to return.
+
+    Returns:
+        dict: resume_version, the page of jobs with a match breakdown each, and pagination.
+    """
+    if request.resume_id:
+        profile = await _resume_table().find_one({"_id": _resume_object_id(request.resume_id)}, {"text": 1, "skills": 1, "years_experience": 1})
+        if not profile:
+            raise HTTPException(status_code=404, detail="Resume not found")
+    elif request.resume:
+        profile = request.resume.model_dump()
+    else:
+        raise HTTPException(status_code=400, detail="Provide a resume_id or a resume")
+
+    try:
+        return MongoJSONResponse(await match_jobs(profile, page=request.page, limit=request.limit))
+    except Exception as e:
+        logging.error(f"Error matching jobs to resume: {e}")
+        return {"error": f"Error matching jobs to resume: {str(e)}"}
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, HTTPException, Query
+from src.utils.error_handling import handle_exceptions
+from src.utils.response_cache import JOB_TRACKING_TAG, cached_route
+from src.utils.skill_index import get_related_skills, get_top_skills
+from src.utils.skills import canonicalize_skill
+import logging
+
+router = APIRouter()
+
+
+@router.get("/skills/top")
+@cached_route(tags=[JOB_TRACKING_TAG])
+@handle_exceptions
+async def top_skills(limit: int = Query(10, ge=1, le=100, description="Number of skills")):
+    """
+    Fetch the skills listed by the most tracked jobs.
+
+    Args:
+        limit (int): Number of skills, defaults to 10.
+
+    Returns:
+        list: Skill name and job count, most listed first.
+    """
+    try:
+        return await get_top_skills(limit)
+    except Exception as e:
+        logging.error(f"Error fetching top skills: {e}")
+        return {"error": "Error fetching top skills"}
+
+
+@router.get("/skills/canonical")
+@handle_exceptions
+async def canonical_skill(name: str = Query(..., min_length=1, description="Skill in any spelling")):
+    """
+    Resolve a skill spelling to the canonical name jobs are stored with.
+
+    Args:
+        name (str): Skill as written, e.g. "python3" or "k8s".
+
+    Returns:
+        dict: The given name and its canonical name.
+    """
+    return {"name": name, "canonical": canonicalize_skill(name)}
+
+
+@router.get("/skills/{skill}/related")
+@cached_route(tags=[JOB_TRACKING_TAG])
+async def related_skills(skill: str, limit: int = Query(10, ge=1, le=100, description="Number of related skills")):
+    """
+    Fetch the skills most often listed together with a skill.
+
+    Args:
+        skill (str): Skill in any spelling.
+        limit (int): Number of related skills, defaults to 10.
+
+    Returns:
+        dict: The skill's job count and the related skills, with the number of
+            jobs listing both and their share of the skill's jobs.
+    """
+    try:
+        related = await get_related_skills(skill, limit)
+    except Exception as e:
+        logging.error(f"Error fetching related skills: {e}")
+        raise HTTPException(status_code=500, detail="Error fetching related skills")
+    if related is None:
+        raise HTTPException(status_code=404, detail="Skill not found")
+    return related
@@ -1,13 +1,20 @@
 import logging
 from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from src.utils.session_management import get_db_client, get_db_name, get_manual_annotation_table
 
-async def add_job_to_manual_annotation_table(job_content: str):
+async def add_job_to_manual_annotation_table(job_content: str, job_find: str = None, job_id: str = None):
     """
     Add a job to the manual annotation table
 
+    When the canonical job key is given the entry is upserted on it, so saving
+    the same posting again returns the existing entry.
+
     Args:
         job_content (str): The job description content to be added
+        job_find (str): The website the job was found on
+        job_id (str): The canonical job ID on that website
 
     Returns:
         Inserted ID or None
@@ -21,8 +28,23 @@ async def add_job_to_manual_annotation_table(job_content: str):
             "status": "pending",
             "created_at": datetime.utcnow()
         }
-        result = await manual_annotation_table.insert_one(job)
-        return result.inserted_id
+        if not (job_find and job_id):
+            result = await manual_annotation_table.insert_one(job)
+            return result.inserted_id
+
+        job_key = {"JobFind": job_find, "JobID": job_id}
+        try:
+            entry = await manual_annotation_table.find_one_and_update(
+                job_key,
+                {"$setOnInsert": job},
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # Lost an upsert race against a concurrent save of the same posting
+            entry = await manual_annotation_table.find_one(job_key, {"_id": 1})
+        return entry["_id"]
     except Exception as e:
         logging.error(f"Error adding job to manual annotation table: {e}")
-        return None 
\ No newline at end of file
+        return None
\ No newline at end of file
@@ -1,5 +1,15 @@
-async def convert_mongo_document(document):
+from typing import List
+
+
+def convert_mongo_document(document):
     if '_id' in document:
         document['id'] = str(document['_id'])
         del document['_id']
-    return document
\ No newline at end of file
+    return document
+
+
+def convert_mongo_documents(documents: List[dict]) -> List[dict]:
+    """Convert a batch of documents in place, without a coroutine per document."""
+    for document in documents:
+        convert_mongo_document(document)
+    return documents
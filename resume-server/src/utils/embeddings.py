@@ -0,0 +1,179 @@
+# src/utils/embeddings.py
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional
+import numpy as np
+from bson.binary import Binary
+from pymongo import UpdateOne
+from src.config.app_config import settings
+from src.utils.openai_client import create_embeddings
+from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table
+
+# Stored next to each job; Embedding is little-endian float32 bytes, unit length
+EMBEDDING_FIELD = "Embedding"
+EMBEDDING_MODEL_FIELD = "EmbeddingModel"
+EMBEDDED_AT_FIELD = "EmbeddedAt"
+EMBEDDING_FIELDS = (EMBEDDING_FIELD, EMBEDDING_MODEL_FIELD, EMBEDDED_AT_FIELD)
+
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+# What a job is about, in the order it matters for matching a search
+EMBEDDING_TEXT_FIELDS = ["JobTitle", "Company", "TechnicalSkills", "SoftSkills", "Experience", "JobSummary", "WorkArrangement", "WorkLocation"]
+
+_backfill_task: Optional[asyncio.Task] = None
+
+
+def normalize_vectors(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so a dot product is the cosine similarity; zero rows stay zero."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def encode_embedding(vector) -> Binary:
+    return Binary(normalize_vectors(vector).astype(EMBEDDING_DTYPE).tobytes())
+
+
+def decode_embedding(value: bytes) -> np.ndarray:
+    return np.frombuffer(value, dtype=EMBEDDING_DTYPE)
+
+
+def job_embedding_text(job: dict) -> str:
+    """
+    The text embedded for a job, built from its extracted fields
+
+    Args:
+        job (dict): A job_tracking document or JobDataEntities dump
+
+    Returns:
+        str: Labelled field values, truncated to settings.EMBEDDING_MAX_CHARS
+    """
+    parts = []
+    for field in EMBEDDING_TEXT_FIELDS:
+        value = job.get(field)
+        if isinstance(value, list):
+            value = ", ".join(str(item) for item in value if item)
+        elif hasattr(value, "value"):
+            value = value.value
+        if value and value != "Not Specified":
+            parts.append(f"{field}: {value}")
+    return "\n".join(parts)[:settings.EMBEDDING_MAX_CHARS]
+
+
+async def embed_texts(texts: List[str]) -> List[np.ndarray]:
+    """
+    Embed texts with the configured OpenAI-compatible embeddings endpoint
+
+    Args:
+        texts (List[str]): Texts to embed, sent in batches of settings.EMBEDDING_BATCH_SIZE
+
+    Returns:
+        List[np.ndarray]: Unit-length float32 vectors, in input order
+    """
+    vectors = []
+    for start in range(0, len(texts), settings.EMBEDDING_BATCH_SIZE):
+        batch = texts[start:start + settings.EMBEDDING_BATCH_SIZE]
+        embeddings = await create_embeddings(batch, settings.OPENAI_EMBEDDING_MODEL, timeout=settings.EMBEDDING_TIMEOUT_SECONDS)
+        vectors.extend(normalize_vectors(np.asarray(embeddings, dtype=np.float32)))
+    return vectors
+
+
+async def embedding_fields(job: dict) -> dict:
+    """
+    The embedding fields to store on a job_tracking document
+
+    Args:
+        job (dict): The job's extracted fields
+
+    Returns:
+        dict: Embedding, EmbeddingModel and EmbeddedAt
+    """
+    vector = (await embed_texts([job_embedding_text(job)]))[0]
+    return {
+        EMBEDDING_FIELD: encode_embedding(vector),
+        EMBEDDING_MODEL_FIELD: settings.OPENAI_EMBEDDING_MODEL,
+        EMBEDDED_AT_FIELD: datetime.utcnow(),
+    }
+
+
+async def backfill_job_embeddings(batch_size: int = None) -> int:
+    """
+    Embed the tracked jobs that have no embedding from the configured model yet
+
+    Jobs saved before semantic search existed, or embedded with another
+    model, are re-embedded a batch at a time in _id order. A batch that fails
+    is logged and skipped, the next start retries it; the pass only stops
+    after settings.EMBEDDING_BACKFILL_MAX_FAILURES failed batches in a row.
+
+    Args:
+        batch_size (int): Jobs per embeddings request, defaults to settings.EMBEDDING_BATCH_SIZE
+
+    Returns:
+        int: Number of jobs embedded
+
+    Raises:
+        RuntimeError: When the embeddings endpoint keeps failing
+    """
+    batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+    job_tracking_table = get_db_client()[get_db_name()][get_job_tracking_table()]
+    query = {EMBEDDING_MODEL_FIELD: {"$ne": settings.OPENAI_EMBEDDING_MODEL}}
+    projection = {field: 1 for field in EMBEDDING_TEXT_FIELDS}
+    embedded = 0
+    failures = 0
+    last_id = None
+    while True:
+        batch_query = {**query, "_id": {"$gt": last_id}} if last_id is not None else query
+        jobs = await job_tracking_table.find(batch_query, projection).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not jobs:
+            return embedded
+        last_id = jobs[-1]["_id"]
+        try:
+            vectors = await embed_texts([job_embedding_text(job) for job in jobs])
+            embedded_at = datetime.utcnow()
+            await job_tracking_table.bulk_write([
+                UpdateOne({"_id": job["_id"]}, {"$set": {
+                    EMBEDDING_FIELD: encode_embedding(vector),
+                    EMBEDDING_MODEL_FIELD: settings.OPENAI_EMBEDDING_MODEL,
+                    EMBEDDED_AT_FIELD: embedded_at,
+                }})
+                for job, vector in zip(jobs, vectors)
+            ], ordered=False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            failures += 1
+            logging.error(f"Error embedding {len(jobs)} tracked jobs up to {last_id}, skipping them: {e}")
+            if failures >= settings.EMBEDDING_BACKFILL_MAX_FAILURES:
+                raise RuntimeError(f"{failures} embedding batches failed in a row") from e
+            continue
+        failures = 0
+        embedded += len(jobs)
+        logging.info(f"Embedded {embedded} tracked jobs")
+
+
+async def _run_backfill():
+    try:
+        embedded = await backfill_job_embeddings()
+        if embedded:
+            logging.info(f"Embedding backfill finished, {embedded} jobs embedded")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logging.error(f"Error backfilling job embeddings: {e}")
+
+
+def start_embedding_backfill():
+    """Embed existing jobs in the background, so startup does not wait on the embeddings endpoint."""
+    global _backfill_task
+    if _backfill_task is None or _backfill_task.done():
+        _backfill_task = asyncio.create_task(_run_backfill(), name="embedding-backfill")
+
+
+async def stop_embedding_backfill():
+    global _backfill_task
+    if _backfill_task is not None:
+        _backfill_task.cancel()
+        await asyncio.gather(_backfill_task, return_exceptions=True)
+        _backfill_task = None
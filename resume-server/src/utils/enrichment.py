@@ -0,0 +1,184 @@
+# src/utils/enrichment.py
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo import ReturnDocument
+from src.config.app_config import settings
+from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table
+from src.utils.google_search import search_google
+from src.utils.url_metadata import resolve_url_titles
+from src.utils.url_helpers import FETCH_ERROR
+from src.utils.response_cache import invalidate_job_cache
+from src.utils.worker_pool import WorkerPool, keep_lease
+
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# Stages run in order; a retried job resumes at the first one whose output is missing
+SEARCH_STAGE = "search"
+TITLES_STAGE = "titles"
+
+_enrichment_pool: Optional[WorkerPool] = None
+
+
+def _get_job_tracking_table():
+    return get_db_client()[get_db_name()][get_job_tracking_table()]
+
+
+def initial_enrichment(search_queries) -> dict:
+    """
+    The enrichment state stored on a newly tracked job
+
+    Args:
+        search_queries (list): The queries generated at ingest, if any
+
+    Returns:
+        dict: Pending state when there is something to search, skipped otherwise
+    """
+    now = datetime.utcnow()
+    return {
+        "status": PENDING if search_queries else SKIPPED,
+        "stage": SEARCH_STAGE if search_queries else None,
+        "attempts": 0,
+        "error": None,
+        "not_before": now,
+        "updated_at": now,
+    }
+
+
+def notify_enrichment_workers():
+    if _enrichment_pool is not None:
+        _enrichment_pool.notify()
+
+
+def _stale_claims_filter(now: datetime) -> dict:
+    """Jobs claimed by a worker that stopped renewing its lease, e.g. because its process died."""
+    return {
+        "enrichment.status": PROCESSING,
+        "enrichment.updated_at": {"$lt": now - timedelta(seconds=settings.ENRICHMENT_LEASE_SECONDS)},
+    }
+
+
+async def _claim_next_job() -> Optional[dict]:
+    now = datetime.utcnow()
+    return await _get_job_tracking_table().find_one_and_update(
+        {"$or": [
+            {"enrichment.status": PENDING, "enrichment.not_before": {"$lte": now}},
+            _stale_claims_filter(now),
+        ]},
+        {"$set": {"enrichment.status": PROCESSING, "enrichment.updated_at": now}, "$inc": {"enrichment.attempts": 1}},
+        projection={"job_id": 1, "search_queries": 1, "search_lang": 1, "search_results": 1, "enrichment": 1},
+        sort=[("enrichment.not_before", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def _set_progress(job: dict, fields: dict):
+    await _get_job_tracking_table().update_one(
+        {"_id": job["_id"]},
+        {"$set": {**fields, "enrichment.updated_at": datetime.utcnow()}}
+    )
+
+
+async def _enrich_job(job: dict):
+    """
+    Run the search then title stages, recording each stage's output as it completes.
+    A stage that produced nothing raises, so the job is retried rather than marked done.
+    """
+    search_results = job.get("search_results")
+    if not search_results or not any(search_results):
+        search_results = await search_google(job["search_queries"], job.get("search_lang"))
+        if not any(search_results):
+            raise RuntimeError("Search returned no results for any query")
+        await _set_progress(job, {
+            "search_results": search_results,
+            "enrichment.stage": TITLES_STAGE,
+            "enrichment.searched_queries": len(search_results),
+        })
+        # Let the dashboard show the raw results while the titles resolve
+        await invalidate_job_cache(str(job["_id"]), job.get("job_id"))
+
+    urls = [url for sublist in search_results for url in sublist]
+    results_with_titles = await resolve_url_titles(urls)
+    if all(result["title"] == FETCH_ERROR for result in results_with_titles):
+        raise RuntimeError(f"No title resolved for any of {len(urls)} URLs")
+    await _set_progress(job, {
+        "search_results_with_titles": results_with_titles,
+        "enrichment.status": DONE,
+        "enrichment.stage": None,
+        "enrichment.resolved_urls": len(results_with_titles),
+        "enrichment.error": None,
+    })
+
+
+async def _renew_claim(job: dict):
+    await _get_job_tracking_table().update_one(
+        {"_id": job["_id"], "enrichment.status": PROCESSING},
+        {"$set": {"enrichment.updated_at": datetime.utcnow()}}
+    )
+
+
+async def _process_job(job: dict):
+    attempts = job["enrichment"].get("attempts", 0)
+    try:
+        async with keep_lease(lambda: _renew_claim(job), settings.ENRICHMENT_LEASE_SECONDS):
+            await _enrich_job(job)
+        logging.info(f"Enriched job {job['_id']}")
+    except Exception as e:
+        # Back off exponentially until the attempt budget is spent, then park the job as failed
+        if attempts < settings.ENRICHMENT_MAX_ATTEMPTS:
+            status = PENDING
+            delay = settings.ENRICHMENT_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+        else:
+            status = FAILED
+            delay = 0
+        logging.error(f"Error enriching job {job['_id']} (attempt {attempts}): {e}")
+        await _set_progress(job, {
+            "enrichment.status": status,
+            "enrichment.error": str(e),
+            "enrichment.not_before": datetime.utcnow() + timedelta(seconds=delay),
+        })
+    await invalidate_job_cache(str(job["_id"]), job.get("job_id"))
+
+
+async def start_enrichment_workers(size: int = None):
+    """
+    Requeue jobs whose claim lease expired and start the enrichment pool
+
+    Only stale claims are requeued, so a restart never takes back jobs
+    another live process is still enriching.
+
+    Args:
+        size (int): Number of jobs enriched concurrently, defaults to settings.ENRICHMENT_WORKERS
+    """
+    global _enrichment_pool
+    if _enrichment_pool is not None and _enrichment_pool.running:
+        return
+    try:
+        result = await _get_job_tracking_table().update_many(
+            _stale_claims_filter(datetime.utcnow()),
+            {"$set": {"enrichment.status": PENDING, "enrichment.updated_at": datetime.utcnow()}}
+        )
+        if result.modified_count:
+            logging.info(f"Requeued {result.modified_count} interrupted enrichment jobs")
+    except Exception as e:
+        logging.error(f"Error requeueing interrupted enrichment jobs: {e}")
+
+    _enrichment_pool = WorkerPool(
+        name="enrichment",
+        size=size or settings.ENRICHMENT_WORKERS,
+        claim=_claim_next_job,
+        process=_process_job,
+    )
+    _enrichment_pool.start()
+
+
+async def stop_enrichment_workers():
+    global _enrichment_pool
+    if _enrichment_pool is not None:
+        await _enrichment_pool.stop()
+        _enrichment_pool = None
@@ -1,6 +1,7 @@
 from functools import wraps
 import logging
 from typing import Callable, Any
+from src.utils.metrics import ROUTE_ERRORS
 
 def handle_exceptions(func: Callable) -> Callable:
     @wraps(func)
@@ -8,9 +9,11 @@ def handle_exceptions(func: Callable) -> Callable:
         try:
             return await func(*args, **kwargs)
         except ValueError as ve:
+            ROUTE_ERRORS.labels(func.__name__, "validation_error").inc()
             logging.warning(f"Validation error in {func.__name__}: {ve}")
             return {"error": str(ve), "type": "validation_error"}
         except Exception as e:
+            ROUTE_ERRORS.labels(func.__name__, "server_error").inc()
             logging.error(f"Error in {func.__name__}: {e}", exc_info=True)
             return {"error": "Internal server error", "type": "server_error"}
     return wrapper
\ No newline at end of file
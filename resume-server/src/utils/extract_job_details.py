@@ -70,3 +70,20 @@ async def extract_url_find_id(job):
     job_website = await extract_website(job_url)
     return job_url, job_id, job_website
 
+
+async def extract_job_key(job):
+    """Builds the canonical (JobFind, JobID) key used to deduplicate job postings.
+
+    The JobID is the site's currentJobId when the URL carries one, otherwise the
+    id sent by the client, otherwise the cleaned job URL.
+
+    Args:
+        job: The job to parse.
+
+    Returns:
+        The job find website and the canonical job ID.
+    """
+
+    job_website = await extract_website(job.url)
+    job_id = await extract_job_id(job.url) or job.job_id or await extract_job_url(job.url)
+    return job_website, job_id
@@ -0,0 +1,124 @@
+# src/utils/extraction_cache.py
+
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Optional
+from src.config.app_config import settings
+from src.utils.lru_cache import TTLCache
+from src.utils.metrics import EXTRACTION_CACHE_LOOKUPS, EXTRACTION_CACHE_WRITES
+from src.utils.session_management import get_db_client, get_db_name, get_extraction_cache_table
+
+_memory_cache = TTLCache(
+    maxsize=settings.EXTRACTION_CACHE_MEMORY_SIZE,
+    ttl=settings.EXTRACTION_CACHE_TTL_SECONDS,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def schema_version(model) -> str:
+    """
+    Short fingerprint of a pydantic model's JSON schema, so cached results are
+    dropped as soon as the extraction schema changes.
+    """
+    schema = json.dumps(model.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(schema.encode("utf-8")).hexdigest()[:12]
+
+
+def normalize_content(content: str) -> str:
+    """Normalize unicode and whitespace so re-saved copies of a posting hash the same."""
+    content = unicodedata.normalize("NFKC", content)
+    return _WHITESPACE.sub(" ", content).strip()
+
+
+def make_cache_key(namespace: str, content: str, model: str, version: str) -> str:
+    """
+    Build the cache key for an LLM result
+
+    Args:
+        namespace (str): The kind of result, e.g. "job_details"
+        content (str): The job description sent to the model
+        model (str): The model name used for the call
+        version (str): The response schema version
+
+    Returns:
+        str: Hex digest identifying the result
+    """
+    digest = hashlib.sha256()
+    for part in (namespace, model, version, normalize_content(content)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _get_extraction_cache_table():
+    return get_db_client()[get_db_name()][get_extraction_cache_table()]
+
+
+async def get_cached_extraction(key: str) -> Optional[dict]:
+    """
+    Look up an LLM result, first in memory then in Mongo
+
+    Args:
+        key (str): Key built with make_cache_key
+
+    Returns:
+        dict: The cached result or None on a miss
+    """
+    value = _memory_cache.get(key)
+    if value is not None:
+        EXTRACTION_CACHE_LOOKUPS.labels("memory", "hit").inc()
+        return value
+    EXTRACTION_CACHE_LOOKUPS.labels("memory", "miss").inc()
+
+    try:
+        entry = await _get_extraction_cache_table().find_one(
+            {"_id": key, "expires_at": {"$gt": datetime.utcnow()}},
+            {"value": 1},
+        )
+    except Exception as e:
+        EXTRACTION_CACHE_LOOKUPS.labels("persistent", "error").inc()
+        logging.error(f"Error reading extraction cache: {e}")
+        return None
+
+    if entry is None:
+        EXTRACTION_CACHE_LOOKUPS.labels("persistent", "miss").inc()
+        return None
+
+    EXTRACTION_CACHE_LOOKUPS.labels("persistent", "hit").inc()
+    _memory_cache.set(key, entry["value"])
+    return entry["value"]
+
+
+async def set_cached_extraction(key: str, value: dict, namespace: str, model: str):
+    """
+    Store an LLM result in both cache tiers
+
+    Args:
+        key (str): Key built with make_cache_key
+        value (dict): The parsed model response
+        namespace (str): The kind of result, stored for inspection
+        model (str): The model name, stored for inspection
+    """
+    _memory_cache.set(key, value)
+    now = datetime.utcnow()
+    try:
+        await _get_extraction_cache_table().replace_one(
+            {"_id": key},
+            {
+                "namespace": namespace,
+                "model": model,
+                "value": value,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=settings.EXTRACTION_CACHE_TTL_SECONDS),
+            },
+            upsert=True,
+        )
+        EXTRACTION_CACHE_WRITES.labels("ok").inc()
+    except Exception as e:
+        EXTRACTION_CACHE_WRITES.labels("error").inc()
+        logging.error(f"Error writing extraction cache: {e}")
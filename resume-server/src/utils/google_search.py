@@ -1,10 +1,96 @@
-from googlesearch import search
+import asyncio
+import json
+import logging
+from typing import Dict, List
+from fastapi_cache import FastAPICache
+from src.config.app_config import settings
+from src.utils.lru_cache import TTLCache
+from src.utils.search_providers import get_search_provider, search_cache_key
 
-async def search_google(query: dict, lang: str = "en", num: int = 10, stop: int = 10, pause: float = 2.0):
-    # loop through the queries and search
+_memory_cache = TTLCache(
+    maxsize=settings.SEARCH_CACHE_MEMORY_SIZE,
+    ttl=settings.SEARCH_CACHE_TTL_SECONDS,
+)
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+async def _get_shared(key: str):
+    try:
+        cached = await FastAPICache.get_backend().get(key)
+    except Exception as e:
+        logging.debug(f"Search cache backend unavailable: {e}")
+        return None
+    return json.loads(cached) if cached else None
+
+
+def _cache_ttl(results: List[str]) -> int:
+    # A blocked or rate-limited scrape also comes back empty, so empty results are only kept briefly
+    return settings.SEARCH_CACHE_TTL_SECONDS if results else settings.SEARCH_EMPTY_CACHE_TTL_SECONDS
+
+
+async def _set_shared(key: str, results: List[str]):
+    try:
+        await FastAPICache.get_backend().set(key, json.dumps(results).encode("utf-8"), expire=_cache_ttl(results))
+    except Exception as e:
+        logging.debug(f"Search cache backend unavailable: {e}")
+
+
+async def _search_one(query: str, lang: str, num: int) -> List[str]:
+    """
+    Run one query through the provider, answering from the cache when possible.
+    Identical queries running at the same time share a single provider call.
+    """
+    provider = get_search_provider()
+    key = search_cache_key(provider.name, query, lang, num)
+    results = _memory_cache.get(key)
+    if results is not None:
+        return results
+    if key in _inflight:
+        return await asyncio.shield(_inflight[key])
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        results = await _get_shared(key)
+        if results is None:
+            results = await provider.search(query, lang=lang, num=num)
+            await _set_shared(key, results)
+        _memory_cache.set(key, results, ttl=_cache_ttl(results))
+        future.set_result(results)
+        return results
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception retrieved so a query nobody else waited on does not warn
+        future.exception()
+        raise
+    finally:
+        del _inflight[key]
+
+
+async def search_google(query: list, lang: str = "en", num: int = None) -> List[List[str]]:
+    """
+    Run the search queries concurrently within the provider's rate limit
+
+    Args:
+        query (list): Search queries
+        lang (str): Result language
+        num (int): Results per query, defaults to settings.SEARCH_RESULTS_PER_QUERY
+
+    Returns:
+        List[List[str]]: Result URLs per query, in query order; a failed query yields an empty list
+
+    Raises:
+        RuntimeError: If every query failed, so callers can retry instead of storing empty results
+    """
+    num = num or settings.SEARCH_RESULTS_PER_QUERY
+    lang = lang or "en"
+    results = await asyncio.gather(*(_search_one(q, lang, num) for q in query), return_exceptions=True)
     search_results = []
-    for q in query:
-        # Convert the generator to a list before appending
-        results = list(search(q, num=num, lang=lang, stop=stop, pause=pause))
-        search_results.append(results)
-    return search_results
\ No newline at end of file
+    for q, result in zip(query, results):
+        if isinstance(result, Exception):
+            logging.error(f"Error searching for {q}: {result}")
+            result = []
+        search_results.append(result)
+    if query and all(isinstance(result, Exception) for result in results):
+        raise RuntimeError(f"All {len(query)} search queries failed: {results[0]}")
+    return search_results
@@ -0,0 +1,127 @@
+# src/utils/ingest_pipeline.py
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from src.utils.metrics import INGEST_STAGE_DURATION
+
+
+class StageFailedError(Exception):
+    """
+    Raised when a required pipeline stage fails or times out.
+
+    timings and stage_errors hold what every stage recorded by the time the
+    pipeline stopped, so the failed run can be stored like a successful one.
+    """
+
+    def __init__(self, stage: str, error: str):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+        self.timings: Dict[str, float] = {}
+        self.stage_errors: Dict[str, str] = {}
+
+
+@dataclass
+class PipelineStage:
+    """
+    A single independent step of the ingest pipeline.
+
+    Args:
+        name (str): Key under which the stage result, error and timing are reported
+        run (Callable): Coroutine taking the shared pipeline context
+        timeout (float): Seconds before the stage is cancelled, None for no limit
+        required (bool): If True a failure aborts the pipeline, otherwise `default` is used
+        default (Any): Result reported for an optional stage that failed
+    """
+    name: str
+    run: Callable[[dict], Awaitable[Any]]
+    timeout: Optional[float] = None
+    required: bool = True
+    default: Any = None
+
+
+@dataclass
+class PipelineResult:
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class IngestPipeline:
+    """
+    Runs independent stages concurrently so an ingest takes max(stage) time.
+
+    Every stage receives the same read-only context. Optional stages that fail
+    or time out fall back to their default. A failing required stage cancels
+    the stages still running and raises StageFailedError. Timings are recorded
+    in milliseconds for every stage, including failed ones.
+    """
+
+    def __init__(self, stages: List[PipelineStage]):
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate pipeline stage names: {names}")
+        self.stages = stages
+
+    async def _run_stage(self, stage: PipelineStage, context: dict, result: PipelineResult):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            if stage.timeout is not None:
+                value = await asyncio.wait_for(stage.run(context), timeout=stage.timeout)
+            else:
+                value = await stage.run(context)
+            result.results[stage.name] = value
+            outcome = "ok"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            self._handle_failure(stage, f"timed out after {stage.timeout}s", result)
+        except Exception as e:
+            self._handle_failure(stage, str(e) or type(e).__name__, result)
+        finally:
+            elapsed = time.perf_counter() - started
+            result.timings[stage.name] = round(elapsed * 1000, 2)
+            INGEST_STAGE_DURATION.labels(stage.name, outcome).observe(elapsed)
+
+    def _handle_failure(self, stage: PipelineStage, error: str, result: PipelineResult):
+        result.errors[stage.name] = error
+        if stage.required:
+            raise StageFailedError(stage.name, error)
+        logging.warning(f"Optional ingest stage '{stage.name}' failed, using default: {error}")
+        result.results[stage.name] = stage.default
+
+    async def run(self, context: dict) -> PipelineResult:
+        """
+        Run all stages concurrently
+
+        Args:
+            context (dict): Inputs shared by every stage
+
+        Returns:
+            PipelineResult: Stage results, errors and timings keyed by stage name
+
+        Raises:
+            StageFailedError: If a required stage fails
+        """
+        result = PipelineResult()
+        tasks = [
+            asyncio.create_task(self._run_stage(stage, context, result), name=f"ingest-stage-{stage.name}")
+            for stage in self.stages
+        ]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            error = task.exception()
+            if error is not None:
+                if isinstance(error, StageFailedError):
+                    # Cancelled stages have recorded their timings by now
+                    error.timings = dict(result.timings)
+                    error.stage_errors = dict(result.errors)
+                raise error
+        return result
@@ -0,0 +1,551 @@
+# src/utils/ingest_queue.py
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from bson.objectid import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from src.config.app_config import settings
+from src.models.job_models import AddJobRequest
+from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table, get_ingest_queue_table, get_manual_annotation_table
+from src.utils.extract_job_details import extract_url_find_id, extract_job_key
+from src.utils.annotation_helpers import add_job_to_manual_annotation_table
+from src.utils.openai_helpers import process_job_and_extract_details, get_google_search_queries
+from src.utils.ingest_pipeline import IngestPipeline, PipelineResult, PipelineStage, StageFailedError
+from src.utils.stats_rollup import record_job_added
+from src.utils.response_cache import invalidate_job_cache
+from src.utils.enrichment import initial_enrichment, notify_enrichment_workers
+from src.utils.embeddings import embedding_fields
+from src.utils.skills import skill_fields
+from src.utils.salary import salary_fields
+from src.utils.skill_index import index_job_skills
+from src.utils.match_scoring import scoring_stamp
+from src.utils.worker_pool import WorkerPool, keep_lease
+from src.utils.metrics import INGEST_QUEUE_WAIT
+
+QUEUED = "queued"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+
+_ingest_pool: Optional[WorkerPool] = None
+
+
+def _get_ingest_queue_table():
+    return get_db_client()[get_db_name()][get_ingest_queue_table()]
+
+
+async def _find_tracked_job(job_find: str, job_id: str) -> Optional[str]:
+    db = get_db_client()
+    job_tracking_table = db[get_db_name()][get_job_tracking_table()]
+    tracked = await job_tracking_table.find_one({"JobFind": job_find, "JobID": job_id}, {"_id": 1})
+    return str(tracked["_id"]) if tracked else None
+
+
+async def _upsert_ticket(job: AddJobRequest, job_find: str, job_id: str, annotation_id) -> Tuple[dict, bool]:
+    now = datetime.utcnow()
+    ticket_id = ObjectId()
+    job_key = {"JobFind": job_find, "JobID": job_id}
+    queue_table = _get_ingest_queue_table()
+    try:
+        entry = await queue_table.find_one_and_update(
+            job_key,
+            {"$setOnInsert": {
+                "_id": ticket_id,
+                "content": job.content,
+                "url": job.url,
+                "job_find": job.job_find,
+                "job_id": job.job_id,
+                "annotation_id": str(annotation_id),
+                "status": QUEUED,
+                "attempts": 0,
+                "error": None,
+                "tracking_id": None,
+                "created_at": now,
+                "queued_at": now,
+                "next_attempt_at": now,
+                "updated_at": now,
+            }},
+            projection={"content": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        # Another tab submitted the same posting at the same moment
+        entry = await queue_table.find_one(job_key, {"content": 0})
+        return entry, False
+    if entry["_id"] == ticket_id:
+        return entry, True
+
+    if entry["status"] in (DONE, FAILED):
+        # The previous attempt failed, or its tracking entry was removed since; run it again
+        result = await queue_table.update_one(
+            {"_id": entry["_id"], "status": entry["status"]},
+            {"$set": {
+                "content": job.content,
+                "url": job.url,
+                "annotation_id": str(annotation_id),
+                "status": QUEUED,
+                "attempts": 0,
+                "error": None,
+                "tracking_id": None,
+                "queued_at": now,
+                "next_attempt_at": now,
+                "updated_at": now,
+            }}
+        )
+        entry["status"] = QUEUED
+        return entry, result.modified_count == 1
+    return entry, False
+
+
+async def submit_job(job: AddJobRequest) -> Optional[dict]:
+    """
+    Idempotently submit a raw job posting for extraction
+
+    Postings are keyed on (JobFind, JobID). A posting that is already tracked
+    short-circuits before any LLM call, and a posting that is already queued or
+    being processed returns the existing ticket, so repeated saves from several
+    tabs collapse into one extraction.
+
+    Args:
+        job (AddJobRequest): The job posting sent by the extension
+
+    Returns:
+        dict: "status" is one of tracked, in_progress or queued, with the "job_id"
+        of the tracked job or the "ticket" to poll. None if the posting could not be stored.
+    """
+    try:
+        job_find, job_id = await extract_job_key(job)
+
+        tracking_id = await _find_tracked_job(job_find, job_id)
+        if tracking_id:
+            return {"status": "tracked", "job_id": tracking_id}
+
+        annotation_id = await add_job_to_manual_annotation_table(job.content, job_find, job_id)
+        if not annotation_id:
+            return None
+
+        entry, queued = await _upsert_ticket(job, job_find, job_id, annotation_id)
+        if not queued:
+            return {"status": "in_progress", "ticket": str(entry["_id"])}
+
+        if _ingest_pool is not None:
+            _ingest_pool.notify()
+        return {"status": "queued", "ticket": str(entry["_id"])}
+    except Exception as e:
+        logging.error(f"Error adding job to ingest queue: {e}")
+        return None
+
+
+def _job_keys_filter(keys) -> dict:
+    # Group by site so the filter stays a handful of $in clauses even for large batches
+    ids_by_find = defaultdict(list)
+    for job_find, job_id in keys:
+        ids_by_find[job_find].append(job_id)
+    return {"$or": [
+        {"JobFind": job_find, "JobID": {"$in": job_ids}}
+        for job_find, job_ids in ids_by_find.items()
+    ]}
+
+
+def _duplicate_indexes(error: BulkWriteError) -> set:
+    write_errors = error.details.get("writeErrors", [])
+    if any(write_error["code"] != 11000 for write_error in write_errors):
+        raise error
+    return {write_error["index"] for write_error in write_errors}
+
+
+async def _insert_annotations(jobs: List[AddJobRequest], keys: list) -> dict:
+    manual_annotation_table = get_db_client()[get_db_name()][get_manual_annotation_table()]
+    now = datetime.utcnow()
+    documents = [
+        {
+            "_id": ObjectId(),
+            "content": job.content,
+            "status": "pending",
+            "created_at": now,
+            "JobFind": job_find,
+            "JobID": job_id,
+        }
+        for job, (job_find, job_id) in zip(jobs, keys)
+    ]
+    try:
+        await manual_annotation_table.insert_many(documents, ordered=False)
+        duplicates = set()
+    except BulkWriteError as bwe:
+        duplicates = _duplicate_indexes(bwe)
+
+    annotation_ids = {
+        key: document["_id"]
+        for index, (key, document) in enumerate(zip(keys, documents))
+        if index not in duplicates
+    }
+    if duplicates:
+        # Postings saved before but never tracked keep their original annotation entry
+        cursor = manual_annotation_table.find(
+            _job_keys_filter([keys[index] for index in duplicates]),
+            {"JobFind": 1, "JobID": 1},
+        )
+        async for entry in cursor:
+            annotation_ids[(entry["JobFind"], entry["JobID"])] = entry["_id"]
+    return annotation_ids
+
+
+async def submit_jobs(jobs: List[AddJobRequest]) -> List[dict]:
+    """
+    Submit many raw job postings for extraction with bulk writes
+
+    Applies the same deduplication as submit_job, but looks up tracked jobs and
+    queued tickets with one query each and stores the new postings with
+    insert_many. Extraction runs on the ingest workers, so its parallelism stays
+    bounded by the pool size however large the batch is.
+
+    Args:
+        jobs (List[AddJobRequest]): The job postings to submit
+
+    Returns:
+        List[dict]: One result per posting, in request order, shaped like the
+        submit_job result or {"status": "error", "error": ...}
+    """
+    results: List[Optional[dict]] = [None] * len(jobs)
+    keys = await asyncio.gather(*(extract_job_key(job) for job in jobs))
+
+    # Collapse repeated postings within the batch onto their first occurrence
+    first_index = {}
+    for index, key in enumerate(keys):
+        first_index.setdefault(key, index)
+    pending = dict(first_index)
+
+    db = get_db_client()
+    job_tracking_table = db[get_db_name()][get_job_tracking_table()]
+    queue_table = _get_ingest_queue_table()
+
+    if pending:
+        async for tracked in job_tracking_table.find(_job_keys_filter(pending), {"JobFind": 1, "JobID": 1}):
+            index = pending.pop((tracked["JobFind"], tracked["JobID"]), None)
+            if index is not None:
+                results[index] = {"status": "tracked", "job_id": str(tracked["_id"])}
+
+    if pending:
+        requeue = []
+        async for entry in queue_table.find(_job_keys_filter(pending), {"JobFind": 1, "JobID": 1, "status": 1}):
+            key = (entry["JobFind"], entry["JobID"])
+            if entry["status"] in (QUEUED, PROCESSING):
+                results[pending.pop(key)] = {"status": "in_progress", "ticket": str(entry["_id"])}
+            else:
+                requeue.append(key)
+        for key in requeue:
+            index = pending.pop(key)
+            results[index] = await submit_job(jobs[index])
+
+    if pending:
+        new_keys = list(pending)
+        new_jobs = [jobs[pending[key]] for key in new_keys]
+        annotation_ids = await _insert_annotations(new_jobs, new_keys)
+        for key in new_keys:
+            if key not in annotation_ids:
+                # Its colliding annotation was deleted before it could be read back, submit it on its own
+                index = pending.pop(key)
+                results[index] = await submit_job(jobs[index])
+        new_keys = [key for key in new_keys if key in annotation_ids]
+        new_jobs = [jobs[pending[key]] for key in new_keys]
+
+    if pending:
+        now = datetime.utcnow()
+        tickets = [
+            {
+                "_id": ObjectId(),
+                "content": job.content,
+                "url": job.url,
+                "job_find": job.job_find,
+                "job_id": job.job_id,
+                "annotation_id": str(annotation_ids[key]),
+                "JobFind": key[0],
+                "JobID": key[1],
+                "status": QUEUED,
+                "attempts": 0,
+                "error": None,
+                "tracking_id": None,
+                "created_at": now,
+                "queued_at": now,
+                "next_attempt_at": now,
+                "updated_at": now,
+            }
+            for job, key in zip(new_jobs, new_keys)
+        ]
+        try:
+            await queue_table.insert_many(tickets, ordered=False)
+            duplicates = set()
+        except BulkWriteError as bwe:
+            duplicates = _duplicate_indexes(bwe)
+
+        for ticket_index, (key, ticket) in enumerate(zip(new_keys, tickets)):
+            if ticket_index not in duplicates:
+                results[pending[key]] = {"status": "queued", "ticket": str(ticket["_id"])}
+        if duplicates:
+            # Submitted concurrently by another request since the lookup above
+            cursor = queue_table.find(_job_keys_filter([new_keys[index] for index in duplicates]), {"JobFind": 1, "JobID": 1})
+            async for entry in cursor:
+                results[pending[(entry["JobFind"], entry["JobID"])]] = {"status": "in_progress", "ticket": str(entry["_id"])}
+
+        if _ingest_pool is not None:
+            _ingest_pool.notify()
+
+    for index, key in enumerate(keys):
+        if results[index] is None:
+            first_result = results[first_index[key]]
+            if index != first_index[key] and first_result and first_result["status"] != "error":
+                results[index] = {**first_result, "status": "tracked" if first_result["status"] == "tracked" else "in_progress"}
+            else:
+                results[index] = {"status": "error", "error": "Error queueing job for processing"}
+    return results
+
+
+async def get_ingest_ticket(ticket: str) -> Optional[dict]:
+    """
+    Fetch the progress of a queued job posting
+
+    Args:
+        ticket (str): The ticket returned by /addJob
+
+    Returns:
+        dict: The ticket status, or None if the ticket does not exist
+
+    Raises:
+        ValueError: If the ticket is not a valid ObjectId
+    """
+    try:
+        ticket_id = ObjectId(ticket)
+    except InvalidId:
+        raise ValueError("Invalid ticket format")
+
+    entry = await _get_ingest_queue_table().find_one(
+        {"_id": ticket_id},
+        {"content": 0},
+    )
+    if not entry:
+        return None
+    return {
+        "ticket": ticket,
+        "status": entry["status"],
+        "attempts": entry.get("attempts", 0),
+        "error": entry.get("error"),
+        "job_id": entry.get("tracking_id"),
+        "stage_errors": entry.get("stage_errors", {}),
+        "timings": entry.get("timings", {}),
+        "created_at": entry.get("created_at"),
+        "updated_at": entry.get("updated_at"),
+        "next_attempt_at": entry.get("next_attempt_at"),
+    }
+
+
+def _stale_claims_filter(now: datetime) -> dict:
+    """Tickets claimed by a worker that stopped renewing its lease, e.g. because its process died."""
+    return {"status": PROCESSING, "updated_at": {"$lt": now - timedelta(seconds=settings.INGEST_LEASE_SECONDS)}}
+
+
+async def _renew_claim(entry: dict):
+    await _get_ingest_queue_table().update_one(
+        {"_id": entry["_id"], "status": PROCESSING},
+        {"$set": {"updated_at": datetime.utcnow()}}
+    )
+
+
+async def _claim_next_ticket() -> Optional[dict]:
+    now = datetime.utcnow()
+    return await _get_ingest_queue_table().find_one_and_update(
+        # Tickets queued before next_attempt_at existed have none and are due
+        {"$or": [{"status": QUEUED, "next_attempt_at": {"$not": {"$gt": now}}}, _stale_claims_filter(now)]},
+        {"$set": {"status": PROCESSING, "updated_at": now}, "$inc": {"attempts": 1}},
+        sort=[("next_attempt_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def _extract_details_stage(context: dict):
+    job_details = await process_job_and_extract_details(
+        job_content=context["content"],
+        job_url=context["job_url"],
+        job_find=context["job_find"],
+        job_id=context["job_key_id"]
+    )
+    if not job_details:
+        raise ValueError("Error extracting job details")
+    return job_details
+
+
+async def _search_queries_stage(context: dict):
+    search_queries, lang = await get_google_search_queries(context["content"])
+    if not search_queries:
+        raise ValueError("Error generating search queries")
+    return search_queries, lang
+
+
+_ingest_pipeline = IngestPipeline([
+    PipelineStage(
+        name="extract_details",
+        run=_extract_details_stage,
+        timeout=settings.INGEST_EXTRACTION_TIMEOUT_SECONDS,
+    ),
+    PipelineStage(
+        name="search_queries",
+        run=_search_queries_stage,
+        timeout=settings.INGEST_SEARCH_QUERIES_TIMEOUT_SECONDS,
+        required=False,
+        default=(None, None),
+    ),
+])
+
+
+async def _extract_and_track(entry: dict) -> Tuple[str, PipelineResult]:
+    job = AddJobRequest(
+        content=entry["content"],
+        url=entry["url"],
+        job_find=entry["job_find"],
+        job_id=entry["job_id"],
+    )
+    job_url, _, job_find = await extract_url_find_id(job)
+    # The key id is set for every site, unlike currentJobId, so extraction and tracking share it
+    job_key_find, job_key_id = await extract_job_key(job)
+
+    pipeline_result = await _ingest_pipeline.run({
+        "content": job.content,
+        "job_url": job_url,
+        "job_find": job_find,
+        "job_key_id": job_key_id,
+    })
+    job_details = pipeline_result.results["extract_details"]
+    search_queries, lang = pipeline_result.results["search_queries"]
+    logging.info(f"Ingest stage timings for ticket {entry['_id']}: {pipeline_result.timings}")
+
+    # Add to tracking table
+    db = get_db_client()
+    job_tracking_table = db[get_db_name()][get_job_tracking_table()]
+    job_tracking_entry = job_details.dict(by_alias=True)
+    job_tracking_entry.update({
+        "JobURL": job_url,
+        "JobFind": job_key_find,
+        "JobID": job_key_id,
+        "job_id": entry["annotation_id"],
+        "ProcessedDate": datetime.utcnow(),
+        "ResumeGenerated": False,
+        "ResumePath": "",
+        "statuses": [],
+        "search_queries": search_queries, # Store search queries
+        "search_lang": lang, # Store language
+        "enrichment": initial_enrichment(search_queries), # Search and title resolution run in the background
+    })
+    # "Python", "python3" and "Python (3.x)" are stored as one skill
+    job_tracking_entry.update(skill_fields(job_tracking_entry.get("TechnicalSkills")))
+    job_tracking_entry.update(salary_fields(job_tracking_entry.get("Salary")))
+    job_tracking_entry.update(scoring_stamp())
+    if settings.SEMANTIC_SEARCH_ENABLED:
+        try:
+            job_tracking_entry.update(await embedding_fields(job_tracking_entry))
+        except Exception as e:
+            # Searchable by text meanwhile, the backfill embeds it on the next start
+            logging.warning(f"Error embedding job for ticket {entry['_id']}: {e}")
+
+    # Upsert on the job key so a retried ticket never creates a second entry
+    job_key = {"JobFind": job_key_find, "JobID": job_key_id}
+    tracking_result = await job_tracking_table.update_one(
+        job_key,
+        {"$setOnInsert": job_tracking_entry},
+        upsert=True,
+    )
+    if tracking_result.upserted_id:
+        await record_job_added(job_tracking_entry)
+        await index_job_skills(tracking_result.upserted_id, job_tracking_entry["TechnicalSkills"])
+        await invalidate_job_cache(str(tracking_result.upserted_id), entry["annotation_id"])
+        notify_enrichment_workers()
+        return str(tracking_result.upserted_id), pipeline_result
+
+    tracked = await job_tracking_table.find_one(job_key, {"_id": 1})
+    if not tracked:
+        raise ValueError("Error adding job to tracking table")
+    return str(tracked["_id"]), pipeline_result
+
+
+async def _process_ticket(entry: dict):
+    queue_table = _get_ingest_queue_table()
+    queued_at = entry.get("queued_at") or entry.get("created_at")
+    if entry.get("attempts") == 1 and queued_at:
+        # updated_at is the claim time; retries are excluded so the wait reflects worker capacity
+        INGEST_QUEUE_WAIT.observe(max(0.0, (entry["updated_at"] - queued_at).total_seconds()))
+    try:
+        async with keep_lease(lambda: _renew_claim(entry), settings.INGEST_LEASE_SECONDS):
+            tracking_id, pipeline_result = await _extract_and_track(entry)
+        await queue_table.update_one(
+            {"_id": entry["_id"]},
+            {"$set": {
+                "status": DONE,
+                "tracking_id": tracking_id,
+                "error": None,
+                "stage_errors": pipeline_result.errors,
+                "timings": pipeline_result.timings,
+                "updated_at": datetime.utcnow(),
+            }}
+        )
+        logging.info(f"Ingest ticket {entry['_id']} processed as job {tracking_id}")
+    except Exception as e:
+        # Back off exponentially until the attempt budget is spent, then park the ticket as failed
+        attempts = entry.get("attempts", 0)
+        if attempts < settings.INGEST_MAX_ATTEMPTS:
+            status = QUEUED
+            delay = settings.INGEST_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+        else:
+            status = FAILED
+            delay = 0
+        logging.error(f"Error processing ingest ticket {entry['_id']} (attempt {attempts}): {e}")
+        now = datetime.utcnow()
+        failure = {"status": status, "error": str(e), "next_attempt_at": now + timedelta(seconds=delay), "updated_at": now}
+        if isinstance(e, StageFailedError):
+            failure.update(stage_errors=e.stage_errors, timings=e.timings)
+        await queue_table.update_one(
+            {"_id": entry["_id"]},
+            {"$set": failure}
+        )
+
+
+async def start_ingest_workers(size: int = None):
+    """
+    Requeue tickets whose claim lease expired and start the worker pool
+
+    Only stale claims are requeued, so a restart never takes back tickets
+    another live process is still working on.
+
+    Args:
+        size (int): Number of concurrent extractions, defaults to settings.INGEST_WORKERS
+    """
+    global _ingest_pool
+    if _ingest_pool is not None and _ingest_pool.running:
+        return
+    try:
+        result = await _get_ingest_queue_table().update_many(
+            _stale_claims_filter(datetime.utcnow()),
+            {"$set": {"status": QUEUED, "updated_at": datetime.utcnow()}}
+        )
+        if result.modified_count:
+            logging.info(f"Requeued {result.modified_count} interrupted ingest tickets")
+    except Exception as e:
+        logging.error(f"Error requeueing interrupted ingest tickets: {e}")
+
+    _ingest_pool = WorkerPool(
+        name="ingest",
+        size=size or settings.INGEST_WORKERS,
+        claim=_claim_next_ticket,
+        process=_process_ticket,
+    )
+    _ingest_pool.start()
+
+
+async def stop_ingest_workers():
+    global _ingest_pool
+    if _ingest_pool is not None:
+        await _ingest_pool.stop()
+        _ingest_pool = None
@@ -1,7 +1,10 @@
-from .session_management import get_session_data, get_db_client, get_db_name, get_job_tracking_table, get_extracted_entities_table, get_manual_annotation_table
+from .session_management import get_session_data, get_db_client, get_db_name, get_job_tracking_table, get_extracted_entities_table, get_manual_annotation_table, get_ingest_queue_table, get_extraction_cache_table, get_match_scores_table, get_skill_index_table
 import logging
 from logging import getLogger
 from pymongo import IndexModel
+from src.utils.query_planner import filter_index_models
+from src.utils.job_keys import ensure_job_key_indexes
+from src.utils.match_scoring import SCORING_STAMP_FIELD, UNSTAMPED
 
 async def initialize_db():
     session = get_session_data()
@@ -10,6 +13,8 @@ async def initialize_db():
         job_tracking_table = db[get_job_tracking_table()]
         manual_annotation_table = db[get_manual_annotation_table()]
         extracted_entities_table = db[get_extracted_entities_table()]
+        ingest_queue_table = db[get_ingest_queue_table()]
+        extraction_cache_table = db[get_extraction_cache_table()]
         # check if the indexes are already created
         indexes = await job_tracking_table.index_information()
         if "job_search_index" not in indexes:
@@ -31,11 +36,47 @@ async def initialize_db():
 
         # Create compound indexes for frequently queried fields
         await job_tracking_table.create_indexes([
-            IndexModel([("IsApplied", 1), ("IsShortlisted", 1)]),
-            IndexModel([("JobFind", 1)]),
             IndexModel([("TechnicalSkills", 1)]),
             IndexModel([("Salary", 1)]),
-            IndexModel([("Country", 1)])
+            # Company salary averages on the parsed annual amount
+            IndexModel([("Company", 1), ("SalaryCurrency", 1), ("SalaryAnnual", 1)], name="company_salary"),
+            # Filtered /api/jobs listings, keyset pagination and salary ranges; the
+            # status, JobFind and Country indexes now end with the keyset sort
+            *filter_index_models(),
+            # Enrichment workers claim the pending job that is due first
+            IndexModel([("enrichment.status", 1), ("enrichment.not_before", 1)], name="enrichment_claim"),
+            # The semantic index tops itself up with the jobs embedded since its last sync
+            IndexModel([("EmbeddedAt", 1)], name="embedded_at", sparse=True),
+            # Match scoring reads the jobs saved or changed since its last pass
+            IndexModel([(SCORING_STAMP_FIELD, 1), ("_id", 1)], name="scoring_updated_at")
+        ])
+        # Jobs saved before the scoring stamp existed are scored on a resume's first pass
+        await job_tracking_table.update_many(
+            {SCORING_STAMP_FIELD: {"$exists": False}},
+            {"$set": {SCORING_STAMP_FIELD: UNSTAMPED}}
+        )
+
+        # Workers claim the queued ticket that is due first
+        await ingest_queue_table.create_indexes([
+            IndexModel([("status", 1), ("next_attempt_at", 1)], name="ingest_claim")
+        ])
+
+        # One cached match score per resume version and job
+        await db[get_match_scores_table()].create_indexes([
+            IndexModel([("resume_version", 1), ("job_id", 1)], name="resume_job_unique", unique=True)
+        ])
+
+        # Top skills are read most listed first
+        await db[get_skill_index_table()].create_indexes([
+            IndexModel([("count", -1)], name="skill_count")
+        ])
+
+        # Let Mongo drop expired LLM results
+        await extraction_cache_table.create_indexes([
+            IndexModel([("expires_at", 1)], expireAfterSeconds=0)
         ])
     except Exception as e:
-        logging.error(f"Error initializing database: {e}")
\ No newline at end of file
+        logging.error(f"Error initializing database: {e}")
+
+    # One entry per canonical job key. Not caught: without it saving a posting is not idempotent
+    await ensure_job_key_indexes()
\ No newline at end of file
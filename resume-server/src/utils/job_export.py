@@ -0,0 +1,159 @@
+# src/utils/job_export.py
+
+"""
+Stream the job_tracking collection out as NDJSON or BSON without decoding it
+
+Documents are read as RawBSONDocument, so BSON exports copy the bytes Mongo
+sent and memory stays at one cursor batch plus one output chunk, however large
+the collection is. Also usable from the command line, from resume-server/:
+
+    python -m src.utils.job_export --format bson --output jobs.bson
+    python -m src.utils.job_export --since 2025-01-01T00:00:00 --output new-jobs.ndjson
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime
+from typing import AsyncIterator, Optional
+import bson
+from bson import json_util
+from bson.codec_options import CodecOptions
+from bson.json_util import RELAXED_JSON_OPTIONS
+from bson.raw_bson import RawBSONDocument
+from src.config.app_config import settings
+from src.utils.projections import build_projection
+from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "bson": "application/bson",
+}
+
+# Oldest first, so an interrupted or incremental export can resume from the last ProcessedDate
+EXPORT_SORT = [("ProcessedDate", 1), ("_id", 1)]
+
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+
+def _raw_collection(collection):
+    try:
+        return collection.with_options(codec_options=RAW_CODEC_OPTIONS)
+    except NotImplementedError:
+        # mongomock cannot return RawBSONDocument, documents get re-encoded instead
+        logging.warning("Collection does not support RawBSONDocument, exporting decoded documents")
+        return collection
+
+
+def _raw_bytes(document) -> bytes:
+    return document.raw if isinstance(document, RawBSONDocument) else bson.encode(document)
+
+
+def _encode(document, export_format: str) -> bytes:
+    if export_format == "bson":
+        return _raw_bytes(document)
+    # Relaxed Extended JSON keeps ObjectIds and dates typed, so mongoimport restores them
+    return json_util.dumps(document, json_options=RELAXED_JSON_OPTIONS).encode("utf-8") + b"\n"
+
+
+async def export_jobs(
+    export_format: str = "ndjson",
+    fields: Optional[str] = None,
+    since: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    chunk_bytes: Optional[int] = None,
+    progress: Optional[dict] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield the tracking collection as chunks of NDJSON lines or concatenated BSON documents
+
+    The next cursor batch is only fetched once the consumer has taken the
+    previous chunks, so a slow client slows the export down instead of
+    buffering it.
+
+    Args:
+        export_format (str): "ndjson" or "bson", the latter readable by mongorestore
+        fields (str): Comma separated fields to export, whole documents when None
+        since (datetime): Only export jobs processed at or after this time
+        batch_size (int): Documents per cursor batch, defaults to settings.EXPORT_BATCH_SIZE
+        chunk_bytes (int): Bytes to collect before yielding, defaults to settings.EXPORT_CHUNK_BYTES
+        progress (dict): Filled with the exported document count and the last ProcessedDate
+
+    Yields:
+        bytes: The next chunk of the export
+
+    Raises:
+        ValueError: If the format or a field name is unknown
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    projection = build_projection("full", fields, required=["ProcessedDate"]) if fields else None
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    chunk_bytes = chunk_bytes or settings.EXPORT_CHUNK_BYTES
+    progress = progress if progress is not None else {}
+    progress.update(documents=0, last_processed_date=None)
+
+    db_client = get_db_client()
+    collection = _raw_collection(db_client[get_db_name()][get_job_tracking_table()])
+    query = {"ProcessedDate": {"$gte": since}} if since else {}
+    cursor = collection.find(query, projection).sort(EXPORT_SORT).batch_size(batch_size)
+
+    chunk = bytearray()
+    last_document = None
+    try:
+        async for document in cursor:
+            chunk += _encode(document, export_format)
+            progress["documents"] += 1
+            last_document = document
+            if len(chunk) >= chunk_bytes:
+                yield bytes(chunk)
+                chunk.clear()
+        if chunk:
+            yield bytes(chunk)
+    finally:
+        await cursor.close()
+        if last_document is not None:
+            progress["last_processed_date"] = last_document.get("ProcessedDate")
+
+
+async def _export_to_file(args):
+    from src.utils.session_management import initialize_session_data
+
+    initialize_session_data(
+        mongo_uri=args.mongo_uri,
+        db=args.db,
+        job_tracking_table=settings.JOB_TRACKING_TABLE,
+        manual_annotation_table=settings.MANUAL_ANNOTATION_TABLE,
+        extracted_entities_table=settings.EXTRACTED_ENTITIES_TABLE,
+        max_pool_size=1,
+        min_pool_size=0,
+    )
+    progress = {}
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async for chunk in export_jobs(args.format, args.fields, args.since, args.batch_size, progress=progress):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+        get_db_client().close()
+    last = progress["last_processed_date"]
+    # The watermark to pass as --since next time
+    sys.stderr.write(f"Exported {progress['documents']} jobs, last ProcessedDate {last.isoformat() if last else None}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the job tracking collection as NDJSON or BSON")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--fields", default=None, help="Comma separated fields to export")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None, help="Only jobs processed at or after this ISO time")
+    parser.add_argument("--batch-size", type=int, default=settings.EXPORT_BATCH_SIZE)
+    parser.add_argument("--mongo-uri", default=settings.MONGODB_URI)
+    parser.add_argument("--db", default=settings.DB_NAME)
+    parser.add_argument("--output", default=None, help="File to write, stdout when omitted")
+    asyncio.run(_export_to_file(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# src/utils/job_filters.py
+
+from enum import Enum
+from typing import Dict, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorCollection
+from src.config.app_config import settings
+from src.models.job_models import JobFilters
+from src.utils.query_planner import plan_query
+
+# Filter parameter -> job_tracking field, counted per value in the facets
+FACET_FILTERS = {
+    "work_location": "WorkLocation",
+    "work_arrangement": "WorkArrangement",
+    "country": "Country",
+    "job_find": "JobFind",
+}
+
+# Filter parameter -> tracking flag, counted together in the Status facet
+STATUS_FILTERS = {
+    "applied": "IsApplied",
+    "shortlisted": "IsShortlisted",
+    "interviewed": "IsInterviewed",
+    "offered": "IsOffered",
+    "accepted": "IsAccepted",
+    "rejected": "IsRejected",
+}
+
+# Filter parameter prefix -> date field, "processed" reads processed_from and processed_to
+DATE_FILTERS = {
+    "processed": "ProcessedDate",
+    "applied": "AppliedDate",
+}
+
+STATUS_FACET = "Status"
+
+
+def _value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def filter_conditions(filters: JobFilters) -> Dict[str, dict]:
+    """
+    Mongo conditions for the filters, grouped by the facet they narrow
+
+    Args:
+        filters (JobFilters): The requested filters
+
+    Returns:
+        dict: Facet name (a FACET_FILTERS field or "Status") -> field conditions;
+            date ranges are grouped under None as they narrow every facet
+
+    Raises:
+        ValueError: If a date range ends before it starts
+    """
+    conditions: Dict[Optional[str], dict] = {}
+    for parameter, field in FACET_FILTERS.items():
+        values = getattr(filters, parameter)
+        if values:
+            values = list(dict.fromkeys(_value(value) for value in values))
+            conditions[field] = {field: values[0] if len(values) == 1 else {"$in": values}}
+
+    status = {flag: getattr(filters, parameter) for parameter, flag in STATUS_FILTERS.items() if getattr(filters, parameter) is not None}
+    if status:
+        conditions[STATUS_FACET] = status
+
+    ranges = {}
+    for prefix, field in DATE_FILTERS.items():
+        start, end = getattr(filters, f"{prefix}_from"), getattr(filters, f"{prefix}_to")
+        if start and end and end <= start:
+            raise ValueError(f"{prefix}_to must be after {prefix}_from")
+        condition = {}
+        if start:
+            condition["$gte"] = start
+        if end:
+            condition["$lt"] = end
+        if condition:
+            ranges[field] = condition
+    if ranges:
+        conditions[None] = ranges
+    return conditions
+
+
+def merge_conditions(conditions: Dict[Optional[str], dict], base_query: dict, exclude: Tuple = ()) -> dict:
+    """
+    The query matching base_query and every facet's conditions but the excluded ones
+
+    Fields never repeat across facets, so the conditions merge into one
+    top-level document the query planner can read.
+    """
+    query = dict(base_query)
+    for facet, condition in conditions.items():
+        if facet not in exclude:
+            query.update(condition)
+    return query
+
+
+def facet_pipeline(conditions: Dict[Optional[str], dict], base_query: dict) -> list:
+    """
+    One aggregation counting every facet's values next to the total
+
+    Each facet is counted with every filter but its own, so selecting
+    "Remote" still shows how many Hybrid jobs the other filters leave.
+    """
+    facets = {}
+    for field in FACET_FILTERS.values():
+        facets[field] = [
+            {"$match": merge_conditions(conditions, {}, exclude=(None, field))},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": settings.JOB_FACET_MAX_VALUES},
+        ]
+    facets[STATUS_FACET] = [
+        {"$match": merge_conditions(conditions, {}, exclude=(None, STATUS_FACET))},
+        {
+            "$group": {
+                "_id": None,
+                **{parameter.capitalize(): {"$sum": {"$cond": [f"${flag}", 1, 0]}} for parameter, flag in STATUS_FILTERS.items()},
+            }
+        },
+    ]
+    facets["total"] = [
+        {"$match": merge_conditions(conditions, {}, exclude=(None,))},
+        {"$count": "count"},
+    ]
+    # Date ranges narrow every facet, so they join the index-bound first stage. Only
+    # the faceted fields and flags go on to $facet, not embeddings or summaries
+    projection = {"_id": 0, **{field: 1 for field in FACET_FILTERS.values()}, **{flag: 1 for flag in STATUS_FILTERS.values()}}
+    return [{"$match": {**base_query, **conditions.get(None, {})}}, {"$project": projection}, {"$facet": facets}]
+
+
+async def get_job_facets(collection: AsyncIOMotorCollection, conditions: Dict[Optional[str], dict], base_query: dict) -> Tuple[dict, int]:
+    """
+    Facet counts and the total for a filtered job listing, in one $facet pass
+
+    Args:
+        collection (AsyncIOMotorCollection): The job_tracking collection
+        conditions (dict): Output of filter_conditions
+        base_query (dict): Search, skill and salary conditions shared by every facet
+
+    Returns:
+        Tuple[dict, int]: Facet name -> value counts (Status -> flag counts), and
+            the number of jobs matching everything
+    """
+    pipeline = facet_pipeline(conditions, base_query)
+    plan = plan_query(collection, pipeline[0]["$match"], sort=False)
+    options = {"hint": plan.index} if plan.index else {}
+    result = await collection.aggregate(pipeline, **options).to_list(length=1)
+    result = result[0] if result else {}
+
+    facets = {
+        field: [{"value": row["_id"], "count": row["count"]} for row in result.get(field, [])]
+        for field in FACET_FILTERS.values()
+    }
+    status = (result.get(STATUS_FACET) or [{}])[0]
+    facets[STATUS_FACET] = {parameter.capitalize(): status.get(parameter.capitalize(), 0) for parameter in STATUS_FILTERS}
+    total = (result.get("total") or [{"count": 0}])[0]["count"]
+    return facets, total
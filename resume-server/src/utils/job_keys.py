@@ -0,0 +1,172 @@
+# src/utils/job_keys.py
+
+"""
+Unique (JobFind, JobID) job keys on job_tracking, manual_annotation and ingest_queue
+
+The job_key_unique index is what makes saving a posting idempotent, and it
+cannot be built while a collection still holds postings saved twice before the
+key existed. ensure_job_key_indexes collapses those duplicates once, then
+builds the index, and refuses to start the server without it. To collapse the
+duplicates by hand, from resume-server/:
+
+    python -m src.utils.job_keys dedupe
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Dict, List
+from pymongo import IndexModel
+from src.config.app_config import settings
+from src.utils.match_scoring import invalidate_job_scores
+from src.utils.response_cache import invalidate_job_cache
+from src.utils.session_management import (
+    get_db_client,
+    get_db_name,
+    get_ingest_queue_table,
+    get_job_tracking_table,
+    get_manual_annotation_table,
+)
+from src.utils.skill_index import reindex_job_skills
+from src.utils.stats_rollup import rebuild_stats_rollup
+
+JOB_KEY_INDEX = "job_key_unique"
+JOB_KEY_FILTER = {"JobFind": {"$exists": True}, "JobID": {"$exists": True}}
+
+# Which document of a duplicated key is kept: the first tracked job, the first
+# saved annotation and the most recently updated ticket
+KEEP_ORDER = {
+    "job_tracking": [("ProcessedDate", 1), ("_id", 1)],
+    "manual_annotation": [("created_at", 1), ("_id", 1)],
+    "ingest_queue": [("updated_at", -1), ("_id", -1)],
+}
+
+
+def job_key_index_model() -> IndexModel:
+    # Documents saved before the key existed are left out
+    return IndexModel(
+        [("JobFind", 1), ("JobID", 1)],
+        name=JOB_KEY_INDEX,
+        unique=True,
+        partialFilterExpression=JOB_KEY_FILTER,
+    )
+
+
+async def _duplicate_ids(table, keep_order: list) -> Dict[object, List]:
+    """Kept _id -> the _ids of the other documents sharing its key."""
+    pipeline = [
+        {"$match": JOB_KEY_FILTER},
+        {"$sort": dict(keep_order)},
+        {"$group": {"_id": {"JobFind": "$JobFind", "JobID": "$JobID"}, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    duplicates = {}
+    async for group in table.aggregate(pipeline, allowDiskUse=True):
+        duplicates[group["ids"][0]] = group["ids"][1:]
+    return duplicates
+
+
+async def _collapse_tracked_jobs(db, duplicates: Dict[object, List]) -> int:
+    job_tracking_table = db[get_job_tracking_table()]
+    removed = [job_id for ids in duplicates.values() for job_id in ids]
+    if not removed:
+        return 0
+    jobs = await job_tracking_table.find({"_id": {"$in": removed}}, {"TechnicalSkills": 1, "job_id": 1}).to_list(length=None)
+    await job_tracking_table.delete_many({"_id": {"$in": removed}})
+    await reindex_job_skills((job["_id"], job.get("TechnicalSkills"), None) for job in jobs)
+    await invalidate_job_scores(*removed)
+    await rebuild_stats_rollup()
+    await invalidate_job_cache(*(str(job["_id"]) for job in jobs), *(job["job_id"] for job in jobs if job.get("job_id")))
+    return len(removed)
+
+
+async def _collapse_annotations(db, duplicates: Dict[object, List]) -> int:
+    manual_annotation_table = db[get_manual_annotation_table()]
+    removed = 0
+    for kept, ids in duplicates.items():
+        # Tracked jobs and tickets point at their annotation by its string id
+        old_ids = [str(annotation_id) for annotation_id in ids]
+        await db[get_job_tracking_table()].update_many({"job_id": {"$in": old_ids}}, {"$set": {"job_id": str(kept)}})
+        await db[get_ingest_queue_table()].update_many({"annotation_id": {"$in": old_ids}}, {"$set": {"annotation_id": str(kept)}})
+        result = await manual_annotation_table.delete_many({"_id": {"$in": ids}})
+        removed += result.deleted_count
+    return removed
+
+
+async def dedupe_job_keys() -> dict:
+    """
+    Collapse documents sharing a job key down to one per key
+
+    Duplicated tracked jobs are deleted along with their skill index entries
+    and match scores, and the stats rollup is rebuilt. Duplicated annotations
+    are deleted after the jobs and tickets pointing at them are repointed to
+    the kept one, and duplicated tickets are deleted.
+
+    Returns:
+        dict: Collection name -> number of duplicates removed
+    """
+    db = get_db_client()[get_db_name()]
+    # Annotations first, so tracked jobs deleted below never hold a stale annotation id
+    annotations = await _collapse_annotations(
+        db, await _duplicate_ids(db[get_manual_annotation_table()], KEEP_ORDER["manual_annotation"])
+    )
+    tracked = await _collapse_tracked_jobs(
+        db, await _duplicate_ids(db[get_job_tracking_table()], KEEP_ORDER["job_tracking"])
+    )
+    tickets = 0
+    queue_duplicates = await _duplicate_ids(db[get_ingest_queue_table()], KEEP_ORDER["ingest_queue"])
+    removed_tickets = [ticket for ids in queue_duplicates.values() for ticket in ids]
+    if removed_tickets:
+        tickets = (await db[get_ingest_queue_table()].delete_many({"_id": {"$in": removed_tickets}})).deleted_count
+    return {"job_tracking": tracked, "manual_annotation": annotations, "ingest_queue": tickets}
+
+
+async def ensure_job_key_indexes():
+    """
+    Build job_key_unique on every keyed collection, collapsing duplicates first when it is missing
+
+    Raises:
+        RuntimeError: If an index cannot be built, as saving postings is not idempotent without it
+    """
+    db = get_db_client()[get_db_name()]
+    tables = [db[get_job_tracking_table()], db[get_manual_annotation_table()], db[get_ingest_queue_table()]]
+    missing = [table for table in tables if JOB_KEY_INDEX not in await table.index_information()]
+    if not missing:
+        return
+
+    summary = await dedupe_job_keys()
+    if any(summary.values()):
+        logging.warning(f"Collapsed duplicate job keys before building {JOB_KEY_INDEX}: {summary}")
+    for table in missing:
+        try:
+            await table.create_indexes([job_key_index_model()])
+        except Exception as e:
+            raise RuntimeError(f"Error creating job key index on {table.name}: {e}") from e
+
+
+async def _main():
+    from src.utils.session_management import initialize_session_data
+
+    parser = argparse.ArgumentParser(description="Maintain the unique job keys")
+    parser.add_argument("command", choices=["dedupe"], help="dedupe: collapse documents sharing a job key")
+    parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    initialize_session_data(
+        mongo_uri=settings.MONGODB_URI,
+        db=settings.DB_NAME,
+        job_tracking_table=settings.JOB_TRACKING_TABLE,
+        manual_annotation_table=settings.MANUAL_ANNOTATION_TABLE,
+        extracted_entities_table=settings.EXTRACTED_ENTITIES_TABLE,
+        ingest_queue_table=settings.INGEST_QUEUE_TABLE,
+        stats_rollup_table=settings.STATS_ROLLUP_TABLE,
+        match_scores_table=settings.MATCH_SCORES_TABLE,
+        skill_index_table=settings.SKILL_INDEX_TABLE,
+    )
+    summary = await dedupe_job_keys()
+    logging.info(f"Duplicate job keys collapsed: {summary}")
+    get_db_client().close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
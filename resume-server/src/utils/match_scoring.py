@@ -0,0 +1,472 @@
+# src/utils/match_scoring.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from src.config.app_config import settings
+from src.utils.embeddings import embed_texts
+from src.utils.lru_cache import TTLCache
+from src.utils.projections import CARD_FIELDS
+from src.utils.semantic_search import get_embedding_index
+from src.utils.skills import canonicalize_skill
+from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table, get_match_scores_table
+
+# Bump when the scoring formula changes so cached scores are not reused
+SCORING_VERSION = 2
+
+# Set whenever a job's TechnicalSkills or Experience change, so its scores are redone
+SCORING_STAMP_FIELD = "ScoringUpdatedAt"
+# Stamp of jobs saved before the field existed
+UNSTAMPED = datetime(1970, 1, 1)
+# Job fields a match score is computed from
+SCORED_FIELDS = {"TechnicalSkills", "Experience"}
+SCORING_FIELDS = {**{field: 1 for field in SCORED_FIELDS}, SCORING_STAMP_FIELD: 1}
+SCORE_COMPONENTS = ("score", "skill_overlap", "embedding_similarity", "experience_fit")
+YEARS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:-\s*\d+(?:\.\d+)?\s*)?(?:years?|yrs?)", re.IGNORECASE)
+
+_memory = TTLCache(maxsize=settings.MATCH_MEMORY_SIZE)
+_scoring_lock = asyncio.Lock()
+
+
+def scoring_stamp() -> dict:
+    """Fields to set on a job saved or changed in a way that changes its match scores."""
+    return {SCORING_STAMP_FIELD: datetime.utcnow()}
+
+
+def _seconds(stamp: Optional[datetime]) -> float:
+    return ((stamp or UNSTAMPED) - UNSTAMPED).total_seconds()
+
+
+def normalize_skill(skill: str) -> str:
+    # Through the alias table, so a resume's "k8s" matches a job's "Kubernetes"
+    return canonicalize_skill(skill).lower()
+
+
+def resume_version(profile: dict) -> str:
+    """
+    Version of a resume for score caching
+
+    Covers the resume content and everything else a score depends on (weights,
+    embedding model, scoring formula), so any change starts a fresh cache.
+    """
+    payload = {
+        "text": profile.get("text", ""),
+        "skills": sorted(normalize_skill(skill) for skill in profile.get("skills") or []),
+        "years_experience": profile.get("years_experience"),
+        "weights": [settings.MATCH_SKILL_WEIGHT, settings.MATCH_EMBEDDING_WEIGHT, settings.MATCH_EXPERIENCE_WEIGHT],
+        "model": settings.OPENAI_EMBEDDING_MODEL,
+        "scoring": SCORING_VERSION,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _years_in(texts: List[str]) -> Optional[float]:
+    """Smallest number of years mentioned, "3-5 years" reads as 3."""
+    years = [float(match.group(1)) for text in texts for match in YEARS_PATTERN.finditer(str(text))]
+    return min(years) if years else None
+
+
+class ResumeContext:
+    """What scoring needs from a resume, with skill lookups against its text memoized."""
+
+    def __init__(self, profile: dict):
+        tokens = (token.rstrip(".") for token in re.split(r"[^\w+#.]+", profile.get("text", "").lower()))
+        self.text = " " + " ".join(token for token in tokens if token) + " "
+        self.skills = {normalize_skill(skill) for skill in profile.get("skills") or []}
+        self.years = profile.get("years_experience")
+        if self.years is None:
+            years = [float(match.group(1)) for match in YEARS_PATTERN.finditer(profile.get("text", ""))]
+            self.years = max(years) if years else None
+        self.embedding: Optional[np.ndarray] = None
+        self._found: Dict[str, bool] = {}
+
+    def has_skill(self, skill: str) -> bool:
+        if self.skills:
+            return skill in self.skills
+        found = self._found.get(skill)
+        if found is None:
+            # Token boundaries, so "go" does not match "good" and "c++" still matches
+            found = self._found[skill] = f" {skill} " in self.text
+        return found
+
+
+class ResumeScores:
+    """Scores of every scored job for one resume version, as parallel arrays."""
+
+    def __init__(self, version: str):
+        self.version = version
+        self.job_ids = []
+        self.rows = {}
+        self.score = np.zeros(0, dtype=np.float32)
+        self.skill_overlap = np.zeros(0, dtype=np.float32)
+        self.embedding_similarity = np.zeros(0, dtype=np.float32)
+        self.experience_fit = np.zeros(0, dtype=np.float32)
+        # Scoring stamp of each job when it was scored, as seconds since UNSTAMPED
+        self.updated_at = np.zeros(0, dtype=np.float64)
+        # Newest scoring stamp scored so far
+        self.watermark = UNSTAMPED
+        # Jobs scored before they had an embedding, rescored once they do
+        self.partial = set()
+        self.context: Optional[ResumeContext] = None
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def is_current(self, job_id, stamp: Optional[datetime]) -> bool:
+        row = self.rows.get(job_id)
+        return row is not None and self.updated_at[row] >= _seconds(stamp)
+
+    def put(self, job_ids: list, components: dict, stamps: List[Optional[datetime]]):
+        """Overwrite the rows of jobs already scored and append the others."""
+        updated_at = np.array([_seconds(stamp) for stamp in stamps], dtype=np.float64)
+        known = np.array([job_id in self.rows for job_id in job_ids], dtype=bool)
+        if known.any():
+            rows = np.array([self.rows[job_id] for job_id, seen in zip(job_ids, known) if seen])
+            for name in SCORE_COMPONENTS:
+                getattr(self, name)[rows] = components[name][known]
+            self.updated_at[rows] = updated_at[known]
+        new_ids = [job_id for job_id, seen in zip(job_ids, known) if not seen]
+        start = len(self.job_ids)
+        for offset, job_id in enumerate(new_ids):
+            self.rows[job_id] = start + offset
+        self.job_ids.extend(new_ids)
+        for name in SCORE_COMPONENTS:
+            setattr(self, name, np.concatenate([getattr(self, name), components[name][~known].astype(np.float32)]))
+        self.updated_at = np.concatenate([self.updated_at, updated_at[~known]])
+        for job_id, similarity in zip(job_ids, components["embedding_similarity"]):
+            if np.isnan(similarity):
+                self.partial.add(job_id)
+            else:
+                self.partial.discard(job_id)
+
+    def discard(self, job_ids):
+        """Drop the rows of jobs that changed or no longer exist."""
+        rows = [self.rows[job_id] for job_id in job_ids if job_id in self.rows]
+        if not rows:
+            return
+        keep = np.ones(len(self.job_ids), dtype=bool)
+        keep[rows] = False
+        self.job_ids = [job_id for job_id, kept in zip(self.job_ids, keep) if kept]
+        self.rows = {job_id: row for row, job_id in enumerate(self.job_ids)}
+        for name in SCORE_COMPONENTS + ("updated_at",):
+            setattr(self, name, getattr(self, name)[keep])
+        self.partial.difference_update(job_ids)
+
+
+def combine_scores(skill_overlap: np.ndarray, embedding_similarity: np.ndarray, experience_fit: np.ndarray) -> np.ndarray:
+    """
+    Weighted match score in [0, 1]
+
+    Jobs without an embedding (NaN similarity) are scored on skills and
+    experience alone, with the weights rescaled to sum to one.
+    """
+    embedded = ~np.isnan(embedding_similarity)
+    similarity = np.where(embedded, np.clip(embedding_similarity, 0, 1), 0)
+    embedding_weight = np.where(embedded, settings.MATCH_EMBEDDING_WEIGHT, 0)
+    total_weight = settings.MATCH_SKILL_WEIGHT + settings.MATCH_EXPERIENCE_WEIGHT + embedding_weight
+    weighted = settings.MATCH_SKILL_WEIGHT * skill_overlap + settings.MATCH_EXPERIENCE_WEIGHT * experience_fit + embedding_weight * similarity
+    return weighted / np.where(total_weight == 0, 1, total_weight)
+
+
+def score_job_batch(jobs: List[dict], context: ResumeContext, job_vectors: Dict) -> dict:
+    """
+    Score a batch of jobs against a resume with array operations
+
+    Every skill of every job is flattened into one index array. Skill overlap
+    is then a segmented sum of the resume's skill indicator over it, and
+    embedding similarity a single matrix-vector product.
+
+    Args:
+        jobs (List[dict]): job_tracking documents with TechnicalSkills and Experience
+        context (ResumeContext): The resume
+        job_vectors (Dict): Job _id -> unit-length embedding, for the jobs that have one
+
+    Returns:
+        dict: score, skill_overlap, embedding_similarity (NaN without an embedding) and experience_fit arrays
+    """
+    vocabulary: Dict[str, int] = {}
+    skill_indexes = []
+    counts = np.zeros(len(jobs), dtype=np.int64)
+    for position, job in enumerate(jobs):
+        skills = {normalize_skill(skill) for skill in job.get("TechnicalSkills") or [] if skill}
+        counts[position] = len(skills)
+        skill_indexes.extend(vocabulary.setdefault(skill, len(vocabulary)) for skill in skills)
+
+    resume_has = np.fromiter((context.has_skill(skill) for skill in vocabulary), dtype=np.float32, count=len(vocabulary))
+    hits = resume_has[np.asarray(skill_indexes, dtype=np.int64)]
+    # Segment sums over each job's slice of hits; a leading 0 keeps empty skill lists at zero
+    cumulative = np.concatenate([[0.0], np.cumsum(hits)])
+    ends = np.cumsum(counts)
+    matched = cumulative[ends] - cumulative[ends - counts]
+    skill_overlap = np.divide(matched, counts, out=np.zeros(len(jobs)), where=counts > 0)
+
+    required = np.array([_years_in(job.get("Experience") or []) or 0.0 for job in jobs], dtype=np.float32)
+    if context.years is None:
+        experience_fit = np.ones(len(jobs), dtype=np.float32)
+    else:
+        experience_fit = np.where(required > 0, np.clip(context.years / np.where(required > 0, required, 1), 0, 1), 1)
+
+    embedding_similarity = np.full(len(jobs), np.nan, dtype=np.float32)
+    if context.embedding is not None:
+        positions = [position for position, job in enumerate(jobs) if job["_id"] in job_vectors]
+        if positions:
+            matrix = np.stack([job_vectors[jobs[position]["_id"]] for position in positions])
+            embedding_similarity[positions] = matrix @ context.embedding
+
+    return {
+        "score": combine_scores(skill_overlap, embedding_similarity, experience_fit),
+        "skill_overlap": skill_overlap,
+        "embedding_similarity": embedding_similarity,
+        "experience_fit": experience_fit,
+    }
+
+
+def _match_scores_table():
+    return get_db_client()[get_db_name()][get_match_scores_table()]
+
+
+async def _load_scores(version: str) -> ResumeScores:
+    scores = ResumeScores(version)
+    cursor = _match_scores_table().find({"resume_version": version}).batch_size(5000)
+    documents = await cursor.to_list(length=None)
+    if documents:
+        components = {
+            name: np.array([np.nan if doc.get(name) is None else doc[name] for doc in documents], dtype=np.float32)
+            for name in SCORE_COMPONENTS
+        }
+        stamps = [doc.get("job_updated_at") for doc in documents]
+        scores.put([doc["job_id"] for doc in documents], components, stamps)
+        scores.watermark = max(stamp or UNSTAMPED for stamp in stamps)
+    return scores
+
+
+def _score_fields(components: dict, position: int) -> dict:
+    similarity = components["embedding_similarity"][position]
+    return {
+        "score": float(components["score"][position]),
+        "skill_overlap": float(components["skill_overlap"][position]),
+        "embedding_similarity": None if np.isnan(similarity) else float(similarity),
+        "experience_fit": float(components["experience_fit"][position]),
+    }
+
+
+async def _save_scores(version: str, jobs: List[dict], components: dict):
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"resume_version": version, "job_id": job["_id"]},
+            {"$set": {
+                **_score_fields(components, position),
+                "job_updated_at": job.get(SCORING_STAMP_FIELD),
+                "scored_at": now,
+            }},
+            upsert=True,
+        )
+        for position, job in enumerate(jobs)
+    ]
+    try:
+        await _match_scores_table().bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        # Another worker scored some of these jobs for the same version first
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+
+
+async def _update_scores(version: str, job_ids: list, components: dict):
+    now = datetime.utcnow()
+    await _match_scores_table().bulk_write([
+        UpdateOne({"resume_version": version, "job_id": job_id}, {"$set": {**_score_fields(components, position), "scored_at": now}})
+        for position, job_id in enumerate(job_ids)
+    ], ordered=False)
+
+
+async def _score_batch(scores: ResumeScores, batch: List[dict], index):
+    job_vectors = index.vectors_for([job["_id"] for job in batch])
+    components = score_job_batch(batch, scores.context, job_vectors)
+    scores.put([job["_id"] for job in batch], components, [job.get(SCORING_STAMP_FIELD) for job in batch])
+    await _save_scores(scores.version, batch, components)
+
+
+async def _score_new_jobs(scores: ResumeScores, index) -> int:
+    """
+    Score the jobs saved or changed since the last pass, a batch at a time
+
+    Jobs are read off the scoring stamp index from a margin before the newest
+    stamp already scored, so a write that committed after a later one is still
+    seen. Jobs read again in that margin are skipped unless they changed since
+    they were scored.
+    """
+    job_tracking_table = get_db_client()[get_db_name()][get_job_tracking_table()]
+    since = scores.watermark - timedelta(seconds=settings.MATCH_SCORING_STAMP_MARGIN_SECONDS)
+    cursor = (
+        job_tracking_table.find({SCORING_STAMP_FIELD: {"$gte": since}}, SCORING_FIELDS)
+        .sort([(SCORING_STAMP_FIELD, 1), ("_id", 1)])
+        .batch_size(settings.MATCH_SCORING_BATCH_SIZE)
+    )
+    scored = 0
+    batch = []
+    newest = scores.watermark
+    async for job in cursor:
+        stamp = job.get(SCORING_STAMP_FIELD) or UNSTAMPED
+        if not scores.is_current(job["_id"], stamp):
+            batch.append(job)
+        if len(batch) >= settings.MATCH_SCORING_BATCH_SIZE:
+            await _score_batch(scores, batch, index)
+            scored += len(batch)
+            batch = []
+            # Everything up to here is scored, an interrupted pass resumes after it
+            scores.watermark = max(scores.watermark, stamp)
+        newest = max(newest, stamp)
+    if batch:
+        await _score_batch(scores, batch, index)
+        scored += len(batch)
+    scores.watermark = newest
+    return scored
+
+
+async def invalidate_job_scores(*job_ids):
+    """
+    Drop the match scores of jobs that changed or were deleted
+
+    Their rows go from match_scores for every resume version and from the
+    scores held in memory. Changed jobs carry a new scoring stamp, so the next
+    match scores them again; deleted ones stop being ranked and counted.
+
+    Args:
+        *job_ids: job_tracking _ids
+    """
+    if not job_ids:
+        return
+    for scores in _memory.values():
+        scores.discard(job_ids)
+    try:
+        await _match_scores_table().delete_many({"job_id": {"$in": list(job_ids)}})
+    except Exception as e:
+        logging.error(f"Error invalidating match scores for {len(job_ids)} jobs: {e}")
+
+
+async def _rescore_embedded(scores: ResumeScores, index) -> int:
+    """Add embedding similarity to jobs scored before they were embedded."""
+    if scores.context.embedding is None or not scores.partial:
+        return 0
+    job_vectors = index.vectors_for(list(scores.partial))
+    ready = list(job_vectors)
+    if not ready:
+        return 0
+    rows = np.array([scores.rows[job_id] for job_id in ready])
+    scores.embedding_similarity[rows] = np.stack([job_vectors[job_id] for job_id in ready]) @ scores.context.embedding
+    scores.score[rows] = combine_scores(scores.skill_overlap[rows], scores.embedding_similarity[rows], scores.experience_fit[rows])
+    scores.partial.difference_update(ready)
+    await _update_scores(
+        scores.version,
+        ready,
+        {name: getattr(scores, name)[rows] for name in SCORE_COMPONENTS},
+    )
+    return len(ready)
+
+
+async def get_resume_scores(profile: dict) -> ResumeScores:
+    """
+    Scores of every tracked job for a resume, computing only what is not cached yet
+
+    Scores live in memory per resume version and in the match_scores
+    collection per (resume_version, job). Each call scores the jobs saved or
+    changed since the last call and adds embedding similarity to jobs embedded since.
+
+    Args:
+        profile (dict): Resume text, optional skills and years_experience
+
+    Returns:
+        ResumeScores: Parallel arrays of job ids and score components
+    """
+    version = resume_version(profile)
+    async with _scoring_lock:
+        scores = _memory.get(version)
+        if scores is None:
+            scores = await _load_scores(version)
+        if scores.context is None:
+            scores.context = ResumeContext(profile)
+            if settings.SEMANTIC_SEARCH_ENABLED:
+                try:
+                    scores.context.embedding = (await embed_texts([profile.get("text", "")[:settings.EMBEDDING_MAX_CHARS]]))[0]
+                except Exception as e:
+                    logging.warning(f"Error embedding resume {version}, scoring on skills only: {e}")
+
+        index = get_embedding_index()
+        if scores.context.embedding is not None:
+            await index.refresh()
+        scored = await _score_new_jobs(scores, index)
+        rescored = await _rescore_embedded(scores, index)
+        if scored or rescored:
+            logging.info(f"Scored {scored} new and {rescored} newly embedded jobs for resume {version}")
+        _memory.set(version, scores)
+    return scores
+
+
+async def match_jobs(profile: dict, page: int = 1, limit: int = 12) -> dict:
+    """
+    Rank tracked jobs by how well they match a resume
+
+    Args:
+        profile (dict): Resume text, optional skills and years_experience
+        page (int): Page number
+        limit (int): Jobs per page
+
+    Returns:
+        dict: resume_version, the page of jobs with their match breakdown, and pagination
+    """
+    scores = await get_resume_scores(profile)
+    total = len(scores)
+    end = min(page * limit, total)
+    if end > 0:
+        order = np.argpartition(-scores.score, end - 1)[:end] if end < total else np.arange(total)
+        order = order[np.argsort(-scores.score[order], kind="stable")]
+    else:
+        order = np.zeros(0, dtype=np.int64)
+    page_rows = order[(page - 1) * limit:end]
+
+    job_ids = [scores.job_ids[row] for row in page_rows]
+    # Copied before awaiting, rows move when changed jobs are dropped meanwhile
+    page_scores = {name: getattr(scores, name)[page_rows] for name in SCORE_COMPONENTS}
+    projection = {field: 1 for field in CARD_FIELDS + ["Experience"]}
+    job_tracking_table = get_db_client()[get_db_name()][get_job_tracking_table()]
+    found = await job_tracking_table.find({"_id": {"$in": job_ids}}, projection).to_list(length=len(job_ids))
+    jobs_by_id = {job["_id"]: job for job in found}
+
+    jobs = []
+    for position, job_id in enumerate(job_ids):
+        job = jobs_by_id.get(job_id)
+        if job is None:
+            continue
+        skills = [skill for skill in job.get("TechnicalSkills") or [] if skill]
+        similarity = page_scores["embedding_similarity"][position]
+        job["match"] = {
+            "score": round(float(page_scores["score"][position]), 4),
+            "skill_overlap": round(float(page_scores["skill_overlap"][position]), 4),
+            "embedding_similarity": None if np.isnan(similarity) else round(float(similarity), 4),
+            "experience_fit": round(float(page_scores["experience_fit"][position]), 4),
+            "matched_skills": [skill for skill in skills if scores.context.has_skill(normalize_skill(skill))],
+            "missing_skills": [skill for skill in skills if not scores.context.has_skill(normalize_skill(skill))],
+        }
+        job["id"] = str(job.pop("_id"))
+        jobs.append(job)
+    # Deleted by another process since they were scored
+    await invalidate_job_scores(*(job_id for job_id in job_ids if job_id not in jobs_by_id))
+
+    return {
+        "resume_version": scores.version,
+        "jobs": jobs,
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "total_pages": (total + limit - 1) // limit,
+        },
+    }
@@ -0,0 +1,260 @@
+# src/utils/metrics.py
+
+import threading
+import time
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from pymongo import monitoring
+from starlette.routing import Match
+
+REGISTRY = CollectorRegistry()
+
+# Buckets from 5ms to 2 minutes so both Mongo reads and LLM extractions land in a useful range
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time spent serving HTTP requests, until the last body chunk is sent",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method", "route"],
+    registry=REGISTRY,
+)
+ROUTE_ERRORS = Counter(
+    "route_errors_total",
+    "Exceptions caught by handle_exceptions and turned into error payloads",
+    ["handler", "type"],
+    registry=REGISTRY,
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command round trips as reported by the driver",
+    ["command", "collection", "outcome"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "mongo_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the Motor pool",
+    buckets=(0.0005, 0.001, 0.0025,) + LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures_total",
+    "Connection checkouts that failed, e.g. waitQueueTimeoutMS expiring on a saturated pool",
+    ["reason"],
+    registry=REGISTRY,
+)
+MONGO_POOL_CONNECTIONS_IN_USE = Gauge(
+    "mongo_pool_connections_in_use",
+    "Connections currently checked out of the Motor pool",
+    registry=REGISTRY,
+)
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "LLM completion calls, excluding the wait for a concurrency slot",
+    ["model", "outcome"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+LLM_QUEUE_WAIT = Histogram(
+    "llm_queue_wait_seconds",
+    "Time LLM calls waited for a concurrency slot",
+    ["model"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported in LLM response usage",
+    ["model", "kind"],
+    registry=REGISTRY,
+)
+OUTBOUND_FETCH_DURATION = Histogram(
+    "outbound_fetch_duration_seconds",
+    "Outbound web requests made for enrichment",
+    ["kind", "outcome"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+INGEST_QUEUE_WAIT = Histogram(
+    "ingest_queue_wait_seconds",
+    "Time an ingest ticket waited in the queue before a worker claimed it",
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+INGEST_STAGE_DURATION = Histogram(
+    "ingest_stage_duration_seconds",
+    "Ingest pipeline stage durations",
+    ["stage", "outcome"],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+EXTRACTION_CACHE_LOOKUPS = Counter(
+    "extraction_cache_lookups_total",
+    "LLM result cache lookups per tier; a memory miss falls through to the persistent tier",
+    ["tier", "result"],
+    registry=REGISTRY,
+)
+EXTRACTION_CACHE_WRITES = Counter(
+    "extraction_cache_writes_total",
+    "LLM results written to the persistent cache",
+    ["outcome"],
+    registry=REGISTRY,
+)
+URL_METADATA_LOOKUPS = Counter(
+    "url_metadata_lookups_total",
+    "Page title cache lookups per tier and distinct URL; stale persistent entries are refreshed",
+    ["tier", "result"],
+    registry=REGISTRY,
+)
+URL_METADATA_REFRESHES = Counter(
+    "url_metadata_refreshes_total",
+    "Page title fetches for missing or stale entries: fetched, revalidated with a 304, or error",
+    ["outcome"],
+    registry=REGISTRY,
+)
+URL_METADATA_WRITES = Counter(
+    "url_metadata_writes_total",
+    "Bulk writes of refreshed page titles to the persistent cache",
+    ["outcome"],
+    registry=REGISTRY,
+)
+
+
+def render_metrics() -> tuple:
+    """Returns the Prometheus text exposition and its content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def record_llm_usage(model: str, usage):
+    """Count the tokens of an OpenAI response usage object, if the server reported one."""
+    if usage is None:
+        return
+    LLM_TOKENS.labels(model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    LLM_TOKENS.labels(model, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def _route_template(scope) -> str:
+    """The path template of the route a request will hit, so labels stay low-cardinality."""
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    for route in getattr(router, "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency and in-flight counts per route template.
+
+    Add it last in configure_app so it wraps the other middleware and also
+    times throttled requests.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _route_template(scope)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_DURATION.labels(method, route, str(status["code"])).observe(time.perf_counter() - started)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    pymongo command listener feeding MONGO_COMMAND_DURATION.
+
+    The driver calls it from Motor's worker threads; the collection name is
+    only present on the started event, so it is kept until the command ends.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections = {}
+
+    @staticmethod
+    def _key(event):
+        return event.request_id, event.connection_id
+
+    def started(self, event):
+        # getMore carries the cursor id under its own name and the collection separately
+        collection = event.command.get("collection" if event.command_name == "getMore" else event.command_name)
+        with self._lock:
+            self._collections[self._key(event)] = collection if isinstance(collection, str) else ""
+
+    def _finish(self, event, outcome: str):
+        with self._lock:
+            collection = self._collections.pop(self._key(event), "")
+        MONGO_COMMAND_DURATION.labels(event.command_name, collection, outcome).observe(event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._finish(event, "ok")
+
+    def failed(self, event):
+        self._finish(event, "error")
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    pymongo pool listener recording checkout waits, so maxPoolSize can be sized from data.
+    """
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CONNECTIONS_IN_USE.inc()
+        if event.duration is not None:
+            MONGO_POOL_CHECKOUT_WAIT.observe(event.duration)
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.labels(event.reason).inc()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CONNECTIONS_IN_USE.dec()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
@@ -0,0 +1,55 @@
+# src/utils/mongo_json.py
+
+import base64
+import datetime
+from typing import Any
+import orjson
+from bson.decimal128 import Decimal128
+from bson.objectid import ObjectId
+from fastapi.responses import JSONResponse
+
+MONGO_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any):
+    """Encode the BSON types orjson does not know about."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, bytes):
+        # Binary fields, such as embeddings fetched without a projection
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_mongo(content: Any) -> bytes:
+    """
+    Serialize Mongo documents straight to JSON bytes
+
+    ObjectIds become strings and datetimes ISO 8601 strings, as jsonable_encoder
+    would produce, but in a single orjson pass over the whole payload.
+
+    Args:
+        content (Any): Documents, lists of documents or any JSON-compatible value
+
+    Returns:
+        bytes: The UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=_default, option=MONGO_JSON_OPTIONS)
+
+
+class MongoJSONResponse(JSONResponse):
+    """
+    JSON response rendered with dumps_mongo
+
+    Routes returning plain dicts still go through FastAPI's jsonable_encoder
+    first; return a MongoJSONResponse directly to skip it.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_mongo(content)
@@ -1,27 +1,111 @@
-from openai import OpenAI
+import asyncio
+import time
+import httpx
+from openai import AsyncOpenAI
+from src.utils.metrics import LLM_QUEUE_WAIT, LLM_REQUEST_DURATION, record_llm_usage
 
-_cached_client = None
+_cached_async_client = None
+_llm_semaphore = None
 
-def get_openai_client(api_key: str = None, base_url: str = None):
+def get_async_openai_client(
+    api_key: str = None,
+    base_url: str = None,
+    timeout: float = 120.0,
+    max_connections: int = 20,
+    max_concurrency: int = 4,
+    http_client: httpx.AsyncClient = None,
+) -> AsyncOpenAI:
     """
-    Function returns a cached OpenAI client if exists, else creates a new client.
-    Use in Entry point so client can be reused.
+    Function returns the cached AsyncOpenAI client if exists, else creates it.
+    All LLM helpers share this client, its pooled HTTP transport and the
+    concurrency semaphore, so call it once from the entry point with the settings.
     :return:
-    OpenAI client
+    AsyncOpenAI client
     """
-    global _cached_client
-    if _cached_client is None:
+    global _cached_async_client, _llm_semaphore
+    if _cached_async_client is None:
         if api_key is None:
             raise ValueError("API key not provide; API key must be provided to create the client")
-        _cached_client = OpenAI(
+        if http_client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+                timeout=httpx.Timeout(timeout, connect=10.0),
+            )
+        _cached_async_client = AsyncOpenAI(
             api_key=api_key,
             base_url=base_url,
+            timeout=timeout,
+            http_client=http_client,
         )
-    return _cached_client
+        _llm_semaphore = asyncio.Semaphore(max_concurrency)
+    return _cached_async_client
 
-async def get_new_openai_client(api_key, base_url=None):
+async def close_async_openai_client():
     """
-    Always creates a new OpenAI client instance with the provided parameters.
-    Use when client is a one-time need.
+    Closes the cached AsyncOpenAI client and its HTTP transport.
     """
-    return OpenAI(api_key=api_key, base_url=base_url)
\ No newline at end of file
+    global _cached_async_client, _llm_semaphore
+    if _cached_async_client is not None:
+        await _cached_async_client.close()
+        _cached_async_client = None
+        _llm_semaphore = None
+
+async def parse_chat_completion(timeout: float = None, **kwargs):
+    """
+    Runs beta.chat.completions.parse on the shared async client.
+    At most max_concurrency calls are in flight at once, later calls wait for a slot.
+
+    Args:
+        timeout (float): Per-call timeout in seconds, defaults to the client timeout
+        **kwargs: Arguments forwarded to beta.chat.completions.parse
+
+    Returns:
+        The parsed chat completion
+    """
+    client = get_async_openai_client()
+    if timeout is not None:
+        client = client.with_options(timeout=timeout)
+    model = kwargs.get("model", "")
+    queued = time.perf_counter()
+    async with _llm_semaphore:
+        started = time.perf_counter()
+        LLM_QUEUE_WAIT.labels(model).observe(started - queued)
+        outcome = "error"
+        try:
+            completion = await client.beta.chat.completions.parse(**kwargs)
+            outcome = "ok"
+        finally:
+            LLM_REQUEST_DURATION.labels(model, outcome).observe(time.perf_counter() - started)
+    record_llm_usage(model, completion.usage)
+    return completion
+
+async def create_embeddings(inputs: list, model: str, timeout: float = None) -> list:
+    """
+    Runs embeddings.create on the shared async client, under the same concurrency limit as completions.
+
+    Args:
+        inputs (list): Texts to embed in one request
+        model (str): Embedding model name
+        timeout (float): Per-call timeout in seconds, defaults to the client timeout
+
+    Returns:
+        list: One embedding (list of floats) per input, in input order
+    """
+    client = get_async_openai_client()
+    if timeout is not None:
+        client = client.with_options(timeout=timeout)
+    queued = time.perf_counter()
+    async with _llm_semaphore:
+        started = time.perf_counter()
+        LLM_QUEUE_WAIT.labels(model).observe(started - queued)
+        outcome = "error"
+        try:
+            response = await client.embeddings.create(model=model, input=inputs, encoding_format="float")
+            outcome = "ok"
+        finally:
+            LLM_REQUEST_DURATION.labels(model, outcome).observe(time.perf_counter() - started)
+    record_llm_usage(model, response.usage)
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
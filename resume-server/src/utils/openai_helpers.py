@@ -1,6 +1,8 @@
 import json
 import logging
-from src.utils.openai_client import get_openai_client
+from src.config.app_config import settings
+from src.utils.openai_client import parse_chat_completion
+from src.utils.extraction_cache import make_cache_key, schema_version, get_cached_extraction, set_cached_extraction
 from src.models.job_models import JobDataEntities
 from pydantic import BaseModel, Field
 from typing import List, Optional
@@ -27,6 +29,11 @@ class SearchRequestSchema(BaseModel):
     lang: str = Field(description="Language code to make the google search")
 
 
+# Cached LLM results are invalidated whenever a response schema changes
+JOB_DETAILS_SCHEMA_VERSION = schema_version(JobDataEntities)
+SEARCH_REQUEST_SCHEMA_VERSION = schema_version(SearchRequestSchema)
+
+
 async def process_job_and_extract_details(job_content: str, job_url: str, job_find: str, job_id: str) -> JobDataEntities:
     """
     Process the job content and extract relevant details using OpenAI API
@@ -46,10 +53,15 @@ async def process_job_and_extract_details(job_content: str, job_url: str, job_fi
         "Keep the summary between 30 to 60 words to ensure it is informative yet concise."
     )
     try:
-        openai_client = get_openai_client()
+        cache_key = make_cache_key("job_details", job_content, settings.OPENAI_MODEL, JOB_DETAILS_SCHEMA_VERSION)
+        job_details = await get_cached_extraction(cache_key)
+        if job_details is not None:
+            logging.info("Job details served from extraction cache.")
+            return JobDataEntities(**job_details, JobURL=job_url, JobFind=job_find, JobID=job_id)
+
         logging.info("Extracting job details...")
-        openai_response = openai_client.beta.chat.completions.parse(
-            model="gemma-2-27b-it",
+        openai_response = await parse_chat_completion(
+            model=settings.OPENAI_MODEL,
             messages=[
                 {"role": "system", "content": system_instruction},
                 {"role": "user", "content": job_content},
@@ -70,6 +82,8 @@ async def process_job_and_extract_details(job_content: str, job_url: str, job_fi
             job_details = json.loads(job_details)
             logging.info(f"Job details loaded into JSON")
         job_entity = JobDataEntities(**job_details, JobURL=job_url, JobFind=job_find, JobID=job_id)
+        # Only cache output that validated against the schema
+        await set_cached_extraction(cache_key, job_details, "job_details", settings.OPENAI_MODEL)
         logging.info("Job details extracted successfully.")
         return job_entity
 
@@ -79,9 +93,14 @@ async def process_job_and_extract_details(job_content: str, job_url: str, job_fi
 
 async def get_google_search_queries(data: str):
     try:
-        openai_client = get_openai_client()
-        search_queries = openai_client.beta.chat.completions.parse(
-            model="gemma-2-27b-it",
+        cache_key = make_cache_key("search_queries", data, settings.OPENAI_MODEL, SEARCH_REQUEST_SCHEMA_VERSION)
+        cached_queries = await get_cached_extraction(cache_key)
+        if cached_queries is not None:
+            logging.info("Search queries served from extraction cache.")
+            return cached_queries["query"], cached_queries["lang"]
+
+        search_queries = await parse_chat_completion(
+            model=settings.OPENAI_MODEL,
             messages=[
                 {"role": "system", "content": "Generate search queries to upskill for the job."},
                 {"role": "user", "content": data},
@@ -105,6 +124,12 @@ async def get_google_search_queries(data: str):
             logging.info(f"Search queries loaded into JSON")
         search_queries = intermediate_search_queries["query"]
         lang = intermediate_search_queries["lang"]
+        await set_cached_extraction(
+            cache_key,
+            {"query": search_queries, "lang": lang},
+            "search_queries",
+            settings.OPENAI_MODEL,
+        )
 
         return search_queries, lang
     except Exception as e:
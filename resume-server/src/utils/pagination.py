@@ -0,0 +1,63 @@
+# src/utils/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from bson.objectid import ObjectId
+from bson.errors import InvalidId
+
+# Newest first; _id breaks ties between jobs processed in the same millisecond
+KEYSET_SORT = [("ProcessedDate", -1), ("_id", -1)]
+
+
+def encode_cursor(document: dict) -> str:
+    """
+    Build an opaque cursor pointing just after the given document
+
+    Args:
+        document (dict): The last raw Mongo document of the current page
+
+    Returns:
+        str: URL-safe cursor for the next page
+    """
+    processed_date = document.get("ProcessedDate")
+    payload = {
+        "d": processed_date.isoformat() if isinstance(processed_date, datetime) else None,
+        "i": str(document["_id"]),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], ObjectId]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        processed_date = datetime.fromisoformat(payload["d"]) if payload["d"] else None
+        return processed_date, ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_filter(cursor: str) -> dict:
+    """
+    Mongo filter selecting the documents that sort after the cursor under KEYSET_SORT.
+    Jobs without a ProcessedDate sort last, ordered by _id.
+    """
+    processed_date, last_id = decode_cursor(cursor)
+    if processed_date is None:
+        return {"ProcessedDate": None, "_id": {"$lt": last_id}}
+    return {
+        "$or": [
+            {"ProcessedDate": {"$lt": processed_date}},
+            {"ProcessedDate": processed_date, "_id": {"$lt": last_id}},
+            {"ProcessedDate": None},
+        ]
+    }
@@ -0,0 +1,84 @@
+# src/utils/projections.py
+
+from typing import Iterable, Optional
+from src.models.job_models import JobDataEntities
+from src.utils.salary import SALARY_FIELDS
+
+# Fields the dashboard job cards render, plus what they need for navigation and status chips
+CARD_FIELDS = [
+    "job_id",
+    "JobTitle",
+    "Company",
+    "City",
+    "State",
+    "Country",
+    "Salary",
+    "TechnicalSkills",
+    "WorkArrangement",
+    "WorkLocation",
+    "JobURL",
+    "JobFind",
+    "ProcessedDate",
+    "ResumeGenerated",
+    "ResumePath",
+    "IsApplied",
+    "IsShortlisted",
+    "IsRejected",
+]
+
+JOB_VIEWS = {
+    "card": CARD_FIELDS,
+    "full": None,
+}
+
+# Fields written to job_tracking next to the JobDataEntities ones
+TRACKING_FIELDS = {
+    "job_id",
+    "statuses",
+    "search_queries",
+    "search_lang",
+    "search_results",
+    "search_results_with_titles",
+    "enrichment",
+    "SoftSkills",
+    "Education",
+    "RawTechnicalSkills",
+    *SALARY_FIELDS,
+}
+
+# Internal fields left out when whole documents are returned
+HIDDEN_FIELDS = ["Embedding", "SkillKeys"]
+
+PROJECTABLE_FIELDS = set(JobDataEntities.model_fields) | TRACKING_FIELDS
+
+
+def build_projection(view: str = "full", fields: Optional[str] = None, required: Iterable[str] = ()) -> Optional[dict]:
+    """
+    Build a Mongo projection for job_tracking documents
+
+    Args:
+        view (str): Named view, "card" or "full"
+        fields (str): Comma separated field names, overrides the view when given
+        required (Iterable[str]): Fields the caller needs regardless of the selection
+
+    Returns:
+        dict: Inclusion projection, or an exclusion of HIDDEN_FIELDS for whole documents
+
+    Raises:
+        ValueError: If the view or a field name is unknown
+    """
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = sorted(set(selected) - PROJECTABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    else:
+        if view not in JOB_VIEWS:
+            raise ValueError(f"Unknown view: {view}")
+        selected = JOB_VIEWS[view]
+
+    if selected is None:
+        return {field: 0 for field in HIDDEN_FIELDS}
+    projection = {field: 1 for field in selected}
+    projection.update({field: 1 for field in required})
+    return projection
@@ -0,0 +1,161 @@
+# src/utils/query_planner.py
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from pymongo import IndexModel
+from motor.motor_asyncio import AsyncIOMotorCollection
+from src.config.app_config import settings
+from src.utils.pagination import KEYSET_SORT
+
+# Indexes filtered /api/jobs listings are planned against, created by
+# initialize_db. Equality fields come first and the keyset sort last, so a
+# filtered page is read in order straight off the index.
+FILTER_INDEXES: Dict[str, List[Tuple[str, int]]] = {
+    "processed_date_keyset": list(KEYSET_SORT),
+    "status_keyset": [("IsApplied", 1), ("IsShortlisted", 1), *KEYSET_SORT],
+    "job_find_keyset": [("JobFind", 1), *KEYSET_SORT],
+    "country_keyset": [("Country", 1), *KEYSET_SORT],
+    "work_location_keyset": [("WorkLocation", 1), ("WorkArrangement", 1), *KEYSET_SORT],
+    "applied_date": [("AppliedDate", -1), ("_id", -1)],
+    "salary_annual": [("SalaryCurrency", 1), ("SalaryAnnual", 1)],
+    # Multikey, one entry per skill a job lists
+    "skill_keyset": [("SkillKeys", 1), *KEYSET_SORT],
+}
+
+# Fields whose value counts the planner keeps to estimate selectivity
+STATISTICS_FIELDS = sorted({
+    field for keys in FILTER_INDEXES.values() for field, _ in keys
+    if field not in ("_id", "ProcessedDate", "AppliedDate", "SalaryAnnual", "SkillKeys")
+})
+
+# Share of the collection assumed to match a range, or a value before statistics exist
+RANGE_SELECTIVITY = 0.3
+DEFAULT_SELECTIVITY = 0.1
+
+_statistics: Optional[dict] = None
+_statistics_at: float = 0.0
+_refresh_task: Optional[asyncio.Task] = None
+
+
+@dataclass
+class QueryPlan:
+    index: Optional[str]
+    estimated: float
+    reason: str
+
+
+def filter_index_models() -> List[IndexModel]:
+    return [IndexModel(keys, name=name) for name, keys in FILTER_INDEXES.items()]
+
+
+async def _collect_statistics(collection: AsyncIOMotorCollection) -> dict:
+    facets = {field: [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}] for field in STATISTICS_FIELDS}
+    facets["total"] = [{"$count": "count"}]
+    result = await collection.aggregate([{"$facet": facets}]).to_list(length=1)
+    result = result[0] if result else {}
+    total = result.get("total") or [{"count": 0}]
+    return {
+        "total": total[0]["count"],
+        "values": {field: {row["_id"]: row["count"] for row in result.get(field, [])} for field in STATISTICS_FIELDS},
+    }
+
+
+async def _refresh_statistics(collection: AsyncIOMotorCollection):
+    global _statistics, _statistics_at
+    try:
+        _statistics = await _collect_statistics(collection)
+        _statistics_at = time.monotonic()
+    except Exception as e:
+        logging.error(f"Error collecting query planner statistics: {e}")
+
+
+def _current_statistics(collection: AsyncIOMotorCollection) -> Optional[dict]:
+    """
+    The value counts to plan with, refreshed in the background once older than
+    settings.QUERY_PLANNER_STATS_TTL_SECONDS so planning never waits on a scan
+    """
+    global _refresh_task
+    stale = _statistics is None or time.monotonic() - _statistics_at > settings.QUERY_PLANNER_STATS_TTL_SECONDS
+    if stale and (_refresh_task is None or _refresh_task.done()):
+        _refresh_task = asyncio.create_task(_refresh_statistics(collection), name="query-planner-statistics")
+    return _statistics
+
+
+def _equality_values(condition) -> Optional[list]:
+    if isinstance(condition, dict):
+        if set(condition) == {"$in"}:
+            return list(condition["$in"])
+        return None
+    return [condition]
+
+
+def _is_range(condition) -> bool:
+    return isinstance(condition, dict) and bool(set(condition) & {"$gt", "$gte", "$lt", "$lte"})
+
+
+def _selectivity(statistics: Optional[dict], field: str, values: list) -> float:
+    if not statistics or not statistics["total"]:
+        return min(1.0, DEFAULT_SELECTIVITY * len(values))
+    counts = statistics["values"].get(field, {})
+    return min(1.0, sum(counts.get(value, 0) for value in values) / statistics["total"])
+
+
+def _estimate(keys: List[Tuple[str, int]], query: dict, statistics: Optional[dict], total: float) -> Tuple[float, int]:
+    """Documents an index scan reads for the query, and how many of its fields bound the scan."""
+    estimated = total
+    bounded = 0
+    for field, _ in keys:
+        condition = query.get(field)
+        if condition is None:
+            break
+        values = _equality_values(condition)
+        if values is not None:
+            estimated *= _selectivity(statistics, field, values)
+            bounded += 1
+            continue
+        if _is_range(condition):
+            estimated *= RANGE_SELECTIVITY
+            bounded += 1
+        break
+    return estimated, bounded
+
+
+def plan_query(collection: AsyncIOMotorCollection, query: dict, sort: bool = True) -> QueryPlan:
+    """
+    Pick the FILTER_INDEXES entry that reads the fewest documents for a job query
+
+    Each index is costed by the fields of its prefix the query constrains,
+    assuming independent fields and using the value counts of the last
+    statistics pass. An unconstrained query is read through the keyset
+    index when it is sorted, and left to a collection scan otherwise.
+
+    Args:
+        collection (AsyncIOMotorCollection): The job_tracking collection
+        query (dict): Top-level field conditions, as built by merge_conditions
+        sort (bool): Whether the results are read in KEYSET_SORT order
+
+    Returns:
+        QueryPlan: The index to hint, None to leave the choice to Mongo
+    """
+    if "$text" in query:
+        # The text index is the only one a $text query can use
+        return QueryPlan(None, 0, "text search")
+    ids = query.get("_id")
+    if isinstance(ids, dict) and "$in" in ids:
+        return QueryPlan("_id_", len(ids["$in"]), "job id list")
+
+    statistics = _current_statistics(collection)
+    total = statistics["total"] if statistics else 1.0
+    if "SkillKeys" in query:
+        # A skill filter reads only the jobs listing its first skill, already in keyset order
+        return QueryPlan("skill_keyset", total * DEFAULT_SELECTIVITY, "skill filter")
+    best = QueryPlan("processed_date_keyset" if sort else None, total, "keyset sort" if sort else "no bounded fields")
+    for name, keys in FILTER_INDEXES.items():
+        estimated, bounded = _estimate(keys, query, statistics, total)
+        if bounded and estimated < best.estimated:
+            best = QueryPlan(name, estimated, f"{bounded} bounded fields")
+    logging.debug(f"Planned job query {list(query)} on {best.index}, ~{best.estimated:.0f} documents ({best.reason})")
+    return best
@@ -0,0 +1,141 @@
+# src/utils/response_cache.py
+
+import hashlib
+import json
+import logging
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache import FastAPICache
+from src.config.app_config import settings
+from src.utils.mongo_json import dumps_mongo
+
+TAG_PREFIX = "cache-tag"
+KEY_PREFIX = "route-cache"
+
+# Tag for everything derived from the whole job_tracking collection (lists, stats, dashboards)
+JOB_TRACKING_TAG = "collection:job_tracking"
+JOB_TAG = "job:{}"
+
+_redis = None
+_local_tag_versions: Dict[str, int] = {}
+_invalidation_hooks: List[Callable[[], None]] = []
+
+
+def init_response_cache(redis=None):
+    """
+    Set the Redis client holding the tag versions
+
+    Without Redis the versions are kept in process, which is only correct for a
+    single worker with the in-memory FastAPICache backend.
+    """
+    global _redis
+    _redis = redis
+    _local_tag_versions.clear()
+
+
+def on_job_cache_invalidated(hook: Callable[[], None]):
+    """Register a callback clearing an in-process cache derived from job_tracking."""
+    _invalidation_hooks.append(hook)
+
+
+def job_tag(job_id: str) -> str:
+    return JOB_TAG.format(job_id)
+
+
+async def _get_tag_versions(tags: list) -> list:
+    if not tags:
+        return []
+    if _redis is None:
+        return [_local_tag_versions.get(tag, 0) for tag in tags]
+    versions = await _redis.mget([f"{TAG_PREFIX}:{tag}" for tag in tags])
+    return [int(version) if version else 0 for version in versions]
+
+
+async def invalidate_tags(*tags: str):
+    """
+    Invalidate every cached response carrying one of the tags
+
+    Bumping a tag's version changes the key of every entry that depends on it,
+    so stale entries are never read again and simply expire.
+    """
+    if not tags:
+        return
+    try:
+        if _redis is None:
+            for tag in tags:
+                _local_tag_versions[tag] = _local_tag_versions.get(tag, 0) + 1
+        else:
+            pipe = _redis.pipeline()
+            for tag in tags:
+                pipe.incr(f"{TAG_PREFIX}:{tag}")
+            await pipe.execute()
+    except Exception as e:
+        logging.error(f"Error invalidating cache tags {tags}: {e}")
+
+
+async def invalidate_job_cache(*job_ids: Optional[str]):
+    """
+    Invalidate the responses affected by a write to job_tracking
+
+    Args:
+        *job_ids: Tracking _id and/or annotation job_id of the written jobs
+    """
+    for hook in _invalidation_hooks:
+        hook()
+    await invalidate_tags(JOB_TRACKING_TAG, *(job_tag(job_id) for job_id in job_ids if job_id))
+
+
+def cached_route(
+    tags: Iterable[str] = (),
+    param_tags: Optional[Dict[str, str]] = None,
+    expire: Optional[int] = None,
+) -> Callable:
+    """
+    Cache a route's JSON response in the FastAPICache backend, keyed on its arguments and tags
+
+    Results are serialized once with dumps_mongo and returned as bytes, so cached
+    routes skip jsonable_encoder on misses as well as hits. Error responses
+    ({"error": ...} dicts) and Response objects are never cached.
+
+    Args:
+        tags (Iterable[str]): Static tags the response depends on
+        param_tags (Dict[str, str]): Route parameter name -> tag format, e.g. {"job_id": JOB_TAG}
+        expire (int): Seconds to keep entries, defaults to settings.RESPONSE_CACHE_TTL_SECONDS
+    """
+    static_tags = list(tags)
+    param_tags = param_tags or {}
+    expire = expire or settings.RESPONSE_CACHE_TTL_SECONDS
+
+    def decorator(func: Callable) -> Callable:
+        namespace = f"{func.__module__}.{func.__name__}"
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                backend = FastAPICache.get_backend()
+                request_tags = static_tags + [tag.format(kwargs[param]) for param, tag in param_tags.items()]
+                versions = await _get_tag_versions(request_tags)
+                arguments = json.dumps(jsonable_encoder(kwargs), sort_keys=True)
+                digest = hashlib.sha1(f"{arguments}|{versions}".encode("utf-8")).hexdigest()
+                cache_key = f"{KEY_PREFIX}:{namespace}:{digest}"
+                cached = await backend.get(cache_key)
+            except Exception as e:
+                logging.warning(f"Response cache unavailable for {namespace}: {e}")
+                return await func(*args, **kwargs)
+
+            if cached is not None:
+                return Response(content=cached, media_type="application/json")
+
+            result = await func(*args, **kwargs)
+            if isinstance(result, Response) or (isinstance(result, dict) and "error" in result):
+                return result
+            body = dumps_mongo(result)
+            try:
+                await backend.set(cache_key, body, expire=expire)
+            except Exception as e:
+                logging.warning(f"Error caching response for {namespace}: {e}")
+            return Response(content=body, media_type="application/json")
+        return wrapper
+    return decorator
@@ -0,0 +1,322 @@
+# src/utils/salary.py
+
+"""
+Parse the free-text Salary of a job into numeric fields
+
+    "$100,000 - $120,000 a year" -> SalaryMin 100000, SalaryMax 120000, SalaryCurrency "USD",
+                                    SalaryPeriod "year", SalaryAnnual 110000
+    "₹10-15 LPA"                 -> 1000000 - 1500000 INR a year
+    "$50/hr"                     -> 50 USD an hour, SalaryAnnual 104000
+
+SalaryAnnual is the midpoint of the range scaled to a year, in the posting's
+currency, so histograms, range filters and averages compare like with like.
+Jobs saved before the parser existed are backfilled, from resume-server/:
+
+    python -m src.utils.salary backfill
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+from typing import List, Optional, Tuple
+from pymongo import UpdateOne
+from src.config.app_config import settings
+from src.utils.response_cache import invalidate_job_cache
+from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table
+
+# Bump when parsing changes so the backfill parses stored salaries again
+SALARY_PARSER_VERSION = 1
+
+SALARY_FIELDS = ["SalaryMin", "SalaryMax", "SalaryCurrency", "SalaryPeriod", "SalaryAnnual", "SalaryParserVersion"]
+
+PERIOD_FACTORS = {"hour": 2080, "day": 260, "week": 52, "month": 12, "year": 1}
+
+PERIOD_PATTERNS = {
+    "hour": re.compile(r"\b(?:hours?|hourly|hrs?|ph)\b|/\s*h\b", re.IGNORECASE),
+    "day": re.compile(r"\b(?:days?|daily|diem)\b", re.IGNORECASE),
+    "week": re.compile(r"\b(?:weeks?|weekly|wk)\b", re.IGNORECASE),
+    "month": re.compile(r"\b(?:months?|monthly|mo|mth|pcm|pm)\b", re.IGNORECASE),
+    "year": re.compile(r"\b(?:years?|yearly|annual|annually|annum|yr|pa|p\.a|lpa|ctc)\b", re.IGNORECASE),
+}
+
+CURRENCY_CODE_PATTERN = re.compile(
+    r"\b(USD|EUR|GBP|INR|CAD|AUD|NZD|SGD|JPY|CNY|HKD|CHF|SEK|NOK|DKK|PLN|BRL|MXN|ZAR|AED)\b", re.IGNORECASE
+)
+# Longest first, "CA$" is not "$"
+CURRENCY_SYMBOLS = [
+    ("US$", "USD"), ("CA$", "CAD"), ("AU$", "AUD"), ("C$", "CAD"), ("A$", "AUD"), ("S$", "SGD"),
+    ("$", "USD"), ("€", "EUR"), ("£", "GBP"), ("₹", "INR"), ("¥", "JPY"),
+]
+INR_PATTERN = re.compile(r"\b(?:rs\.?|rupees?|inr|lpa|lakhs?|lacs?|crores?|cr)\b", re.IGNORECASE)
+
+AMOUNT_PATTERN = re.compile(r"(\d+(?:[.,]\d+)*)\s*(k|mn|m|lpa|lakhs?|lacs?|l|crores?|cr)?(?![a-z])", re.IGNORECASE)
+MULTIPLIERS = {"k": 1e3, "m": 1e6, "mn": 1e6, "l": 1e5, "lpa": 1e5, "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5, "cr": 1e7, "crore": 1e7, "crores": 1e7}
+# Numbers that are not pay
+NOISE_PATTERN = re.compile(r"401\s*\(?k\)?|\d+\s*%", re.IGNORECASE)
+UPPER_BOUND_PATTERN = re.compile(r"\b(?:up\s*to|upto|max(?:imum)?|under)\b", re.IGNORECASE)
+LOWER_BOUND_PATTERN = re.compile(r"\b(?:from|starting|min(?:imum)?|at\s+least)\b|\d\s*[km]?\+", re.IGNORECASE)
+
+# Histogram bucket width per currency, in annual units
+DEFAULT_BUCKET_WIDTH = 20000
+BUCKET_WIDTHS = {"INR": 500000, "JPY": 2000000}
+
+_backfill_task: Optional[asyncio.Task] = None
+
+
+def _parse_number(token: str) -> Optional[float]:
+    if "," in token and "." in token:
+        # Whichever separator comes last is the decimal point
+        decimal = "," if token.rfind(",") > token.rfind(".") else "."
+        thousands = "." if decimal == "," else ","
+        token = token.replace(thousands, "").replace(decimal, ".")
+    elif "," in token or "." in token:
+        parts = re.split(r"[.,]", token)
+        # 120,000, 45.000 and the Indian 8,00,000 group digits; 12.5 is a decimal
+        if len(parts[-1]) == 3 and all(len(part) in (2, 3) for part in parts[1:]):
+            token = "".join(parts)
+        elif len(parts) == 2:
+            token = ".".join(parts)
+        else:
+            return None
+    try:
+        return float(token)
+    except ValueError:
+        return None
+
+
+def _amounts(text: str) -> List[float]:
+    parsed: List[Tuple[float, Optional[str]]] = []
+    for match in AMOUNT_PATTERN.finditer(NOISE_PATTERN.sub(" ", text)):
+        number = _parse_number(match.group(1))
+        if number is not None:
+            parsed.append((number, (match.group(2) or "").lower() or None))
+        if len(parsed) == 2:
+            break
+    if len(parsed) == 2 and parsed[0][1] is None and parsed[1][1] is not None:
+        # "80-100k" and "10-15 LPA" put the unit on the upper bound only
+        parsed[0] = (parsed[0][0], parsed[1][1])
+    return [number * MULTIPLIERS.get(suffix, 1) if suffix else number for number, suffix in parsed]
+
+
+def _currency(text: str) -> Optional[str]:
+    code = CURRENCY_CODE_PATTERN.search(text)
+    if code:
+        return code.group(1).upper()
+    for symbol, currency in CURRENCY_SYMBOLS:
+        if symbol in text:
+            return currency
+    if INR_PATTERN.search(text):
+        return "INR"
+    return settings.SALARY_DEFAULT_CURRENCY
+
+
+def _period(text: str, amounts: List[float]) -> str:
+    found = [(match.start(), period) for period, pattern in PERIOD_PATTERNS.items() for match in [pattern.search(text)] if match]
+    if found:
+        # The first period mentioned, "$50/hr (about $104k a year)" is hourly
+        return min(found)[1]
+    # Nothing stated: small amounts are hourly rates, anything else a yearly salary
+    return "hour" if max(amounts) < 500 else "year"
+
+
+def parse_salary(salary: Optional[str]) -> Optional[dict]:
+    """
+    Parse a salary string into numbers
+
+    Args:
+        salary (str): Salary as extracted, e.g. "$100,000 - $120,000 a year"
+
+    Returns:
+        dict: SalaryMin, SalaryMax, SalaryCurrency, SalaryPeriod and SalaryAnnual,
+            None when the text has no amount. Open ranges ("up to $150k",
+            "$100k+") leave one bound None.
+    """
+    if not isinstance(salary, str) or not salary.strip() or salary.strip().lower() == "not specified":
+        return None
+    amounts = _amounts(salary)
+    if not amounts:
+        return None
+
+    if len(amounts) == 2:
+        low, high = sorted(amounts)
+    elif UPPER_BOUND_PATTERN.search(salary):
+        low, high = None, amounts[0]
+    elif LOWER_BOUND_PATTERN.search(salary):
+        low, high = amounts[0], None
+    else:
+        low = high = amounts[0]
+
+    period = _period(salary, amounts)
+    bounds = [bound for bound in (low, high) if bound is not None]
+    return {
+        "SalaryMin": low,
+        "SalaryMax": high,
+        "SalaryCurrency": _currency(salary),
+        "SalaryPeriod": period,
+        "SalaryAnnual": round(sum(bounds) / len(bounds) * PERIOD_FACTORS[period], 2),
+    }
+
+
+def salary_fields(salary: Optional[str]) -> dict:
+    """
+    The numeric salary fields to store on a job_tracking document
+
+    Args:
+        salary (str): The job's Salary text
+
+    Returns:
+        dict: Every SALARY_FIELDS entry, None where the text gives no value
+    """
+    fields = {field: None for field in SALARY_FIELDS}
+    fields.update(parse_salary(salary) or {})
+    fields["SalaryParserVersion"] = SALARY_PARSER_VERSION
+    return fields
+
+
+def bucket_width_expression(widths: dict = None, default: float = DEFAULT_BUCKET_WIDTH):
+    """$cond picking the histogram bucket width for a document's SalaryCurrency."""
+    expression = default
+    for currency, width in (widths if widths is not None else BUCKET_WIDTHS).items():
+        expression = {"$cond": [{"$eq": ["$SalaryCurrency", currency]}, width, expression]}
+    return expression
+
+
+def format_amount(amount: float) -> str:
+    if amount >= 1e6:
+        return f"{amount / 1e6:g}M"
+    if amount >= 1e3:
+        return f"{amount / 1e3:g}k"
+    return f"{amount:g}"
+
+
+def label_salary_buckets(rows: List[dict]) -> List[dict]:
+    """
+    Turn {"_id": {"currency", "bucket"}, "count"} groups into labelled histogram bars
+
+    Args:
+        rows (List[dict]): Groups keyed by currency and bucket number, see bucket_width_expression
+
+    Returns:
+        List[dict]: "_id" label such as "USD 100k-120k", currency, min, max and count,
+            by currency then amount
+    """
+    buckets = []
+    for row in sorted(rows, key=lambda row: (row["_id"]["currency"], row["_id"]["bucket"])):
+        currency = row["_id"]["currency"]
+        width = BUCKET_WIDTHS.get(currency, DEFAULT_BUCKET_WIDTH)
+        low = row["_id"]["bucket"] * width
+        buckets.append({
+            "_id": f"{currency} {format_amount(low)}-{format_amount(low + width)}",
+            "currency": currency,
+            "min": low,
+            "max": low + width,
+            "count": row["count"],
+        })
+    return buckets
+
+
+async def salary_histogram(currency: str, bucket_width: Optional[float] = None, company: Optional[str] = None) -> List[dict]:
+    """
+    Count jobs per annual salary bucket
+
+    Args:
+        currency (str): Currency to count, amounts are never converted
+        bucket_width (float): Bucket width, defaults to the currency's BUCKET_WIDTHS entry
+        company (str): Only count this company's jobs
+
+    Returns:
+        List[dict]: Bucket min, max and job count, lowest bucket first
+    """
+    currency = currency.upper()
+    width = bucket_width or BUCKET_WIDTHS.get(currency, DEFAULT_BUCKET_WIDTH)
+    match = {"SalaryCurrency": currency, "SalaryAnnual": {"$ne": None}}
+    if company:
+        match = {"Company": company, **match}
+    job_tracking_table = get_db_client()[get_db_name()][get_job_tracking_table()]
+    buckets = await job_tracking_table.aggregate([
+        {"$match": match},
+        {"$group": {"_id": {"$multiply": [{"$floor": {"$divide": ["$SalaryAnnual", width]}}, width]}, "count": {"$sum": 1}}},
+        {"$sort": {"_id": 1}},
+    ]).to_list(length=None)
+    return [{"min": bucket["_id"], "max": bucket["_id"] + width, "count": bucket["count"]} for bucket in buckets]
+
+
+async def backfill_salary_fields(batch_size: int = None) -> int:
+    """
+    Parse the Salary of tracked jobs not parsed by the current parser yet
+
+    Args:
+        batch_size (int): Updates per bulk write, defaults to settings.SALARY_BACKFILL_BATCH_SIZE
+
+    Returns:
+        int: Number of jobs parsed
+    """
+    batch_size = batch_size or settings.SALARY_BACKFILL_BATCH_SIZE
+    job_tracking_table = get_db_client()[get_db_name()][get_job_tracking_table()]
+    query = {"SalaryParserVersion": {"$ne": SALARY_PARSER_VERSION}}
+    parsed = 0
+    updates = []
+    async for job in job_tracking_table.find(query, {"Salary": 1}).batch_size(batch_size):
+        updates.append(UpdateOne({"_id": job["_id"]}, {"$set": salary_fields(job.get("Salary"))}))
+        if len(updates) >= batch_size:
+            await job_tracking_table.bulk_write(updates, ordered=False)
+            parsed += len(updates)
+            updates = []
+            logging.info(f"Parsed the salary of {parsed} tracked jobs")
+    if updates:
+        await job_tracking_table.bulk_write(updates, ordered=False)
+        parsed += len(updates)
+    if parsed:
+        await invalidate_job_cache()
+    return parsed
+
+
+async def _run_backfill():
+    try:
+        parsed = await backfill_salary_fields()
+        if parsed:
+            logging.info(f"Salary backfill finished, {parsed} jobs parsed")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logging.error(f"Error backfilling salary fields: {e}")
+
+
+def start_salary_backfill():
+    """Parse existing salaries in the background, so startup does not wait on a scan."""
+    global _backfill_task
+    if _backfill_task is None or _backfill_task.done():
+        _backfill_task = asyncio.create_task(_run_backfill(), name="salary-backfill")
+
+
+async def stop_salary_backfill():
+    global _backfill_task
+    if _backfill_task is not None:
+        _backfill_task.cancel()
+        await asyncio.gather(_backfill_task, return_exceptions=True)
+        _backfill_task = None
+
+
+async def _main():
+    from src.utils.session_management import initialize_session_data
+
+    parser = argparse.ArgumentParser(description="Maintain the numeric salary fields of job_tracking")
+    parser.add_argument("command", choices=["backfill"], help="backfill: parse salaries not parsed by the current parser")
+    parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    initialize_session_data(
+        mongo_uri=settings.MONGODB_URI,
+        db=settings.DB_NAME,
+        job_tracking_table=settings.JOB_TRACKING_TABLE,
+        manual_annotation_table=settings.MANUAL_ANNOTATION_TABLE,
+        extracted_entities_table=settings.EXTRACTED_ENTITIES_TABLE,
+    )
+    parsed = await backfill_salary_fields()
+    logging.info(f"Salary backfill finished, {parsed} jobs parsed")
+    get_db_client().close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,162 @@
+# src/utils/search_providers.py
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+from urllib.parse import quote_plus
+from src.config.app_config import settings
+from src.utils.metrics import OUTBOUND_FETCH_DURATION
+
+
+class RateLimiter:
+    """
+    Spaces out calls to a provider and caps how many run at once.
+
+    Args:
+        min_interval (float): Minimum seconds between the start of two calls
+        max_concurrency (int): Maximum number of calls in flight
+    """
+
+    def __init__(self, min_interval: float = 0.0, max_concurrency: int = 1):
+        self.min_interval = min_interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self.min_interval
+            if start > now:
+                await asyncio.sleep(start - now)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+
+
+class SearchProvider(ABC):
+    """
+    Base class for web search backends.
+
+    Subclasses implement search_sync, a blocking call that is run in a worker
+    thread behind the provider's rate limiter, so it never blocks the event loop.
+    """
+
+    name = "base"
+
+    def __init__(self, min_interval: float = 0.0, max_concurrency: int = 1):
+        self.rate_limiter = RateLimiter(min_interval, max_concurrency)
+
+    @abstractmethod
+    def search_sync(self, query: str, lang: str, num: int) -> List[str]:
+        """Run one query and return the result URLs, blocking until done."""
+
+    async def search(self, query: str, lang: str = "en", num: int = 10) -> List[str]:
+        async with self.rate_limiter:
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                results = await asyncio.to_thread(self.search_sync, query, lang, num)
+                outcome = "ok"
+                return results
+            finally:
+                OUTBOUND_FETCH_DURATION.labels(f"search_{self.name}", outcome).observe(time.perf_counter() - started)
+
+
+class GoogleSearchProvider(SearchProvider):
+    """Scrapes Google through the googlesearch package."""
+
+    name = "google"
+
+    def search_sync(self, query: str, lang: str, num: int) -> List[str]:
+        from googlesearch import search
+
+        # Spacing between requests is handled by the rate limiter, not by googlesearch's pause
+        return list(search(query, num=num, lang=lang, stop=num, pause=0.0))
+
+
+class LocalSearchProvider(SearchProvider):
+    """
+    Offline stand-in for tests and benchmarks.
+
+    Answers from a JSON file mapping queries to result URLs when one is given,
+    otherwise returns deterministic made-up URLs on base_url.
+
+    Args:
+        results_path (str): Optional JSON file of {query: [urls]}
+        base_url (str): Host the generated URLs point at
+    """
+
+    name = "local"
+
+    def __init__(self, results_path: Optional[str] = None, base_url: str = "http://search.local", **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+        self.results: Dict[str, List[str]] = {}
+        if results_path:
+            with open(results_path) as results_file:
+                self.results = json.load(results_file)
+
+    def search_sync(self, query: str, lang: str, num: int) -> List[str]:
+        if query in self.results:
+            return self.results[query][:num]
+        slug = quote_plus(query.lower())
+        return [f"{self.base_url}/{lang}/{slug}/{rank}" for rank in range(num)]
+
+
+_provider_factories: Dict[str, Callable[[], SearchProvider]] = {
+    "google": lambda: GoogleSearchProvider(
+        min_interval=settings.SEARCH_MIN_INTERVAL_SECONDS,
+        max_concurrency=settings.SEARCH_MAX_CONCURRENCY,
+    ),
+    "local": lambda: LocalSearchProvider(
+        results_path=settings.SEARCH_LOCAL_RESULTS_PATH,
+        base_url=settings.SEARCH_LOCAL_BASE_URL,
+        max_concurrency=settings.SEARCH_MAX_CONCURRENCY,
+    ),
+}
+_provider: Optional[SearchProvider] = None
+
+
+def register_search_provider(name: str, factory: Callable[[], SearchProvider]):
+    """Make a provider selectable through settings.SEARCH_PROVIDER."""
+    _provider_factories[name] = factory
+
+
+def set_search_provider(provider: Optional[SearchProvider]):
+    """Replace the active provider, None to go back to settings.SEARCH_PROVIDER."""
+    global _provider
+    _provider = provider
+
+
+def get_search_provider() -> SearchProvider:
+    """
+    Returns the provider named by settings.SEARCH_PROVIDER, creating it on first use.
+    """
+    global _provider
+    if _provider is None:
+        if settings.SEARCH_PROVIDER not in _provider_factories:
+            raise ValueError(f"Unknown search provider: {settings.SEARCH_PROVIDER}")
+        _provider = _provider_factories[settings.SEARCH_PROVIDER]()
+    return _provider
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def search_cache_key(provider: str, query: str, lang: str, num: int) -> str:
+    """Key for a search result; queries differing only in case or spacing share it."""
+    normalized = _WHITESPACE.sub(" ", query).strip().casefold()
+    digest = hashlib.sha1(f"{normalized}\x00{lang}\x00{num}".encode("utf-8")).hexdigest()
+    return f"search:{provider}:{digest}"
@@ -0,0 +1,264 @@
+# src/utils/semantic_search.py
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from bson.objectid import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from src.config.app_config import settings
+from src.utils.embeddings import EMBEDDED_AT_FIELD, EMBEDDING_FIELD, EMBEDDING_MODEL_FIELD, decode_embedding, embed_texts
+from src.utils.lru_cache import TTLCache
+from src.utils.response_cache import on_job_cache_invalidated
+from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table
+
+_query_cache = TTLCache(maxsize=settings.SEMANTIC_QUERY_CACHE_SIZE, ttl=settings.SEMANTIC_QUERY_CACHE_TTL_SECONDS)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first, without sorting the whole array."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _kmeans(vectors: np.ndarray, clusters: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on unit vectors, returns unit-length centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty clusters keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.where(norms == 0, 1, norms), centroids)
+    return centroids.astype(np.float32)
+
+
+class EmbeddingIndex:
+    """
+    In-memory matrix of job embeddings answering top-k cosine queries.
+
+    Rows are loaded from job_tracking once, then topped up with the jobs
+    embedded since the last sync whenever job writes invalidate the job cache.
+    A full reload every settings.SEMANTIC_INDEX_REFRESH_SECONDS drops deleted
+    jobs. Past settings.SEMANTIC_IVF_MIN_VECTORS rows (or always, with
+    SEMANTIC_INDEX_TYPE="ivf") an inverted file index clusters the rows and a
+    query only scans the settings.SEMANTIC_IVF_PROBES closest clusters.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: List[ObjectId] = []
+        self._rows: Dict[ObjectId, int] = {}
+        self._size = 0
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments: Optional[np.ndarray] = None
+        self._loaded_at: Optional[float] = None
+        self._synced_at = None
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return self._size
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def _collection(self) -> AsyncIOMotorCollection:
+        return get_db_client()[get_db_name()][get_job_tracking_table()]
+
+    def _use_ivf(self) -> bool:
+        if settings.SEMANTIC_INDEX_TYPE == "ivf":
+            return self._size > 1
+        return settings.SEMANTIC_INDEX_TYPE == "auto" and self._size >= settings.SEMANTIC_IVF_MIN_VECTORS
+
+    def _upsert_row(self, job_id: ObjectId, vector: np.ndarray):
+        row = self._rows.get(job_id)
+        if row is None:
+            if self._matrix is None or self._matrix.shape[1] != len(vector):
+                # A new embedding dimension starts over, clusters of the old vectors included
+                self._matrix = np.zeros((1024, len(vector)), dtype=np.float32)
+                self._ids, self._rows, self._size = [], {}, 0
+                self._centroids = self._assignments = None
+            if self._size == len(self._matrix):
+                # Grow geometrically so appends stay amortised O(1)
+                self._matrix = np.concatenate([self._matrix, np.zeros_like(self._matrix)])
+            row = self._size
+            self._size += 1
+            self._ids.append(job_id)
+            self._rows[job_id] = row
+        self._matrix[row] = vector
+        if self._centroids is not None:
+            assignment = int(np.argmax(self._centroids @ vector))
+            if row >= len(self._assignments):
+                self._assignments = np.concatenate([self._assignments, np.full(len(self._matrix) - len(self._assignments), -1)])
+            self._assignments[row] = assignment
+
+    async def _load(self, query: dict):
+        projection = {EMBEDDING_FIELD: 1, EMBEDDED_AT_FIELD: 1}
+        query = {**query, EMBEDDING_MODEL_FIELD: settings.OPENAI_EMBEDDING_MODEL}
+        async for job in self._collection().find(query, projection).batch_size(5000):
+            self._upsert_row(job["_id"], decode_embedding(job[EMBEDDING_FIELD]))
+            embedded_at = job.get(EMBEDDED_AT_FIELD)
+            if embedded_at and (self._synced_at is None or embedded_at > self._synced_at):
+                self._synced_at = embedded_at
+
+    def _build_ivf(self):
+        if not self._use_ivf():
+            self._centroids = self._assignments = None
+            return
+        vectors = self._matrix[:self._size]
+        clusters = max(1, min(int(np.sqrt(self._size)), self._size))
+        sample = vectors
+        if self._size > 50 * clusters:
+            sample = vectors[np.random.default_rng(0).choice(self._size, size=50 * clusters, replace=False)]
+        self._centroids = _kmeans(sample, clusters)
+        self._assignments = np.full(len(self._matrix), -1)
+        self._assignments[:self._size] = np.argmax(vectors @ self._centroids.T, axis=1)
+
+    async def refresh(self):
+        """Load the index on first use, reload it when stale and top it up after job writes."""
+        stale = self._loaded_at is None or time.monotonic() - self._loaded_at > settings.SEMANTIC_INDEX_REFRESH_SECONDS
+        if not stale and not self._dirty:
+            return
+        async with self._lock:
+            stale = self._loaded_at is None or time.monotonic() - self._loaded_at > settings.SEMANTIC_INDEX_REFRESH_SECONDS
+            if stale:
+                # Built aside and swapped in, searches keep using the old rows meanwhile
+                self._dirty = False
+                fresh = EmbeddingIndex()
+                await fresh._load({})
+                await asyncio.to_thread(fresh._build_ivf)
+                dirty = self._dirty
+                self.__dict__.update({key: value for key, value in fresh.__dict__.items() if key != "_lock"})
+                self._loaded_at = time.monotonic()
+                self._dirty = dirty
+                logging.info(f"Semantic index loaded with {self._size} jobs")
+            elif self._dirty:
+                self._dirty = False
+                # Jobs embedded in the same millisecond as the last sync are simply loaded again
+                await self._load({EMBEDDED_AT_FIELD: {"$gte": self._synced_at}} if self._synced_at else {})
+                if self._centroids is None and self._use_ivf():
+                    await asyncio.to_thread(self._build_ivf)
+
+    def vectors_for(self, job_ids: List[ObjectId]) -> Dict[ObjectId, np.ndarray]:
+        return {job_id: self._matrix[self._rows[job_id]] for job_id in job_ids if job_id in self._rows}
+
+    def _scan(self, query: np.ndarray, k: int, matrix, ids, centroids, assignments) -> List[Tuple[ObjectId, float]]:
+        if centroids is not None:
+            probes = _top_k(centroids @ query, settings.SEMANTIC_IVF_PROBES)
+            rows = np.flatnonzero(np.isin(assignments[:len(matrix)], probes))
+        else:
+            rows = np.arange(len(matrix))
+        scores = matrix[rows] @ query
+        best = _top_k(scores, min(k, len(scores)))
+        return [(ids[rows[position]], float(scores[position])) for position in best]
+
+    async def search(self, query: np.ndarray, k: int) -> List[Tuple[ObjectId, float]]:
+        """
+        The k jobs most similar to a unit-length query vector
+
+        Args:
+            query (np.ndarray): Query embedding
+            k (int): Number of results
+
+        Returns:
+            List[Tuple[ObjectId, float]]: Job _id and cosine similarity, best first
+        """
+        await self.refresh()
+        if not self._size or k <= 0:
+            return []
+        # Snapshot, later top-ups append rows past it
+        matrix = self._matrix[:self._size]
+        ids = list(self._ids)
+        return await asyncio.to_thread(self._scan, query, k, matrix, ids, self._centroids, self._assignments)
+
+
+_index = EmbeddingIndex()
+on_job_cache_invalidated(_index.mark_dirty)
+
+
+def get_embedding_index() -> EmbeddingIndex:
+    return _index
+
+
+async def embed_query(query: str) -> np.ndarray:
+    """Embed a search query, repeated queries are answered from memory."""
+    cache_key = (settings.OPENAI_EMBEDDING_MODEL, query.strip().lower())
+    vector = _query_cache.get(cache_key)
+    if vector is None:
+        vector = (await embed_texts([query]))[0]
+        _query_cache.set(cache_key, vector)
+    return vector
+
+
+async def _semantic_scores(query: str, limit: int) -> List[Tuple[ObjectId, float]]:
+    return await _index.search(await embed_query(query), limit)
+
+
+async def _text_scores(collection: AsyncIOMotorCollection, query: str, limit: int) -> Dict[ObjectId, float]:
+    cursor = collection.find(
+        {"$text": {"$search": query}},
+        {"score": {"$meta": "textScore"}},
+    ).sort([("score", {"$meta": "textScore"})]).limit(limit)
+    return {job["_id"]: job["score"] async for job in cursor}
+
+
+async def rank_jobs(collection: AsyncIOMotorCollection, query: str, mode: str, limit: int) -> List[Tuple[ObjectId, float]]:
+    """
+    Rank jobs for a search query by embedding similarity, alone or blended with the text score
+
+    In hybrid mode the semantic and $text candidates are merged. Text scores
+    are scaled by the best one, and each job scores
+    SEMANTIC_SEARCH_HYBRID_WEIGHT * cosine + (1 - weight) * scaled text score.
+    If either side fails, hybrid ranks with the other one alone.
+
+    Args:
+        collection (AsyncIOMotorCollection): The job_tracking collection
+        query (str): The search query
+        mode (str): "semantic" or "hybrid"
+        limit (int): Number of ranked jobs to return
+
+    Returns:
+        List[Tuple[ObjectId, float]]: Job _id and score, best first
+    """
+    if mode not in ("semantic", "hybrid"):
+        raise ValueError(f"Unknown search mode: {mode}")
+    if mode == "semantic":
+        return await _semantic_scores(query, limit)
+
+    semantic, text = await asyncio.gather(
+        _semantic_scores(query, limit),
+        _text_scores(collection, query, limit),
+        return_exceptions=True,
+    )
+    if isinstance(semantic, Exception) and isinstance(text, Exception):
+        raise semantic
+    if isinstance(semantic, Exception):
+        logging.warning(f"Semantic ranking unavailable, using text scores only: {semantic}")
+        semantic = []
+    if isinstance(text, Exception):
+        logging.warning(f"Text ranking unavailable, using semantic scores only: {text}")
+        text = {}
+
+    weight = settings.SEMANTIC_SEARCH_HYBRID_WEIGHT
+    cosines = dict(semantic)
+    if text and semantic:
+        # Text matches outside the semantic top-k still get their exact similarity
+        query_vector = await embed_query(query)
+        missing = [job_id for job_id in text if job_id not in cosines]
+        for job_id, vector in _index.vectors_for(missing).items():
+            cosines[job_id] = float(vector @ query_vector)
+    best_text = max(text.values(), default=0) or 1
+    scores = {
+        job_id: weight * cosines.get(job_id, 0.0) + (1 - weight) * text.get(job_id, 0.0) / best_text
+        for job_id in set(cosines) | set(text)
+    }
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
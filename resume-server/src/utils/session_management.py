@@ -3,27 +3,36 @@
 from pydantic import BaseModel, Field
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import ReadPreference
+from src.utils.metrics import MongoCommandMetrics, MongoPoolMetrics
 
 session_data = {}
 
 
-def initialize_session_data(mongo_uri: str, db: str, job_tracking_table: str, manual_annotation_table: str, extracted_entities_table: str):
+def initialize_session_data(mongo_uri: str, db: str, job_tracking_table: str, manual_annotation_table: str, extracted_entities_table: str, ingest_queue_table: str = "ingest_queue", extraction_cache_table: str = "extraction_cache", stats_rollup_table: str = "job_stats_rollup", url_metadata_table: str = "url_metadata", resume_table: str = "resumes", match_scores_table: str = "match_scores", skill_index_table: str = "skill_index", max_pool_size: int = 50, min_pool_size: int = 10, wait_queue_timeout_ms: int = 5000):
     # Configure connection pool with all options upfront
     client = AsyncIOMotorClient(
         mongo_uri,
-        maxPoolSize=50,
-        minPoolSize=10,
+        maxPoolSize=max_pool_size,
+        minPoolSize=min(min_pool_size, max_pool_size),
         maxIdleTimeMS=50000,
-        waitQueueTimeoutMS=5000,
+        waitQueueTimeoutMS=wait_queue_timeout_ms,
         serverSelectionTimeoutMS=5000,
         socketTimeoutMS=5000,
-        read_preference=ReadPreference.NEAREST
+        read_preference=ReadPreference.NEAREST,
+        event_listeners=[MongoCommandMetrics(), MongoPoolMetrics()]
     )
     session_data["mongo_client"] = client
     session_data["db"] = db
     session_data["job_tracking_table"] = job_tracking_table
     session_data["manual_annotation_table"] = manual_annotation_table
     session_data["extracted_entities_table"] = extracted_entities_table
+    session_data["ingest_queue_table"] = ingest_queue_table
+    session_data["extraction_cache_table"] = extraction_cache_table
+    session_data["stats_rollup_table"] = stats_rollup_table
+    session_data["url_metadata_table"] = url_metadata_table
+    session_data["resume_table"] = resume_table
+    session_data["match_scores_table"] = match_scores_table
+    session_data["skill_index_table"] = skill_index_table
 
 def get_session_data() -> dict:
     return session_data
@@ -40,6 +49,27 @@ def get_manual_annotation_table() -> str:
 def get_extracted_entities_table() -> str:
     return session_data["extracted_entities_table"]
 
+def get_ingest_queue_table() -> str:
+    return session_data["ingest_queue_table"]
+
+def get_extraction_cache_table() -> str:
+    return session_data["extraction_cache_table"]
+
+def get_stats_rollup_table() -> str:
+    return session_data["stats_rollup_table"]
+
+def get_url_metadata_table() -> str:
+    return session_data["url_metadata_table"]
+
+def get_resume_table() -> str:
+    return session_data["resume_table"]
+
+def get_match_scores_table() -> str:
+    return session_data["match_scores_table"]
+
+def get_skill_index_table() -> str:
+    return session_data["skill_index_table"]
+
 def get_db_name() -> str:
     return session_data["db"]
 
@@ -0,0 +1,308 @@
+# src/utils/skill_index.py
+
+"""
+Canonical skills of the tracked jobs and how many jobs list each
+
+Every job stores the skill_key of its skills as SkillKeys, under the multikey
+skill_keyset index, so skill filters and co-occurrence read the postings of a
+skill straight off job_tracking. Next to it, one small document per skill:
+
+    {"_id": "python", "name": "Python", "count": 2}
+
+Ingest and bulk updates apply deltas to the counts, so top skills read a few
+documents instead of unwinding job_tracking. Rebuild both after bulk imports
+or an alias table change, from resume-server/:
+
+    python -m src.utils.skill_index rebuild
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from src.config.app_config import settings
+from src.utils.response_cache import invalidate_job_cache
+from src.utils.match_scoring import scoring_stamp
+from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table, get_skill_index_table, get_stats_rollup_table
+from src.utils.skills import SKILL_TABLE_VERSION, canonicalize_skills, skill_fields, skill_key
+
+# Kept with the stats rollup, records which alias table and layout the index was built with
+SKILL_INDEX_MARKER_ID = "skill_index"
+# Bump when the stored layout changes so existing indexes are rebuilt
+SKILL_INDEX_LAYOUT = 2
+SKILL_KEYS_FIELD = "SkillKeys"
+
+_rebuild_task: Optional[asyncio.Task] = None
+
+
+def _skill_index_table():
+    return get_db_client()[get_db_name()][get_skill_index_table()]
+
+
+def _skills_by_key(skills: Optional[Iterable[str]]) -> Dict[str, str]:
+    return {skill_key(skill): skill for skill in skills or [] if skill}
+
+
+def _index_operations(before: Optional[Iterable[str]], after: Optional[Iterable[str]]) -> List[UpdateOne]:
+    old = _skills_by_key(before)
+    new = _skills_by_key(after)
+    operations = []
+    for key, name in new.items():
+        if key not in old:
+            operations.append(UpdateOne({"_id": key}, {"$inc": {"count": 1}, "$setOnInsert": {"name": name}}, upsert=True))
+    for key in old:
+        if key not in new:
+            operations.append(UpdateOne({"_id": key}, {"$inc": {"count": -1}}))
+    return operations
+
+
+async def _apply_operations(operations: List[UpdateOne]):
+    """
+    Write index deltas, logging rather than raising: a missed delta only
+    causes drift, which rebuild_skill_index reconciles.
+    """
+    if not operations:
+        return
+    try:
+        await _skill_index_table().bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        logging.error(f"Error updating skill index: {e.details.get('writeErrors', [])}")
+    except Exception as e:
+        logging.error(f"Error updating skill index: {e}")
+
+
+async def index_job_skills(job_id, skills: Iterable[str]):
+    """
+    Add a newly tracked job to the index
+
+    Args:
+        job_id (ObjectId): The job's tracking _id
+        skills (Iterable[str]): Its canonical TechnicalSkills
+    """
+    await _apply_operations(_index_operations(None, skills))
+
+
+async def reindex_job_skills(changes: Iterable[Tuple]):
+    """
+    Apply the skill changes of updated jobs
+
+    Args:
+        changes (Iterable[tuple]): (job_id, skills before, skills after) per job
+    """
+    operations = []
+    for _, before, after in changes:
+        operations.extend(_index_operations(before, after))
+    await _apply_operations(operations)
+
+
+async def rebuild_skill_index() -> dict:
+    """
+    Canonicalize every tracked job's skills and rebuild the index from them
+
+    Jobs keep their extracted list as RawTechnicalSkills, so an alias table
+    change re-canonicalizes from what was extracted rather than from the
+    previous canonical names. Jobs ingested after the scan passed them are
+    counted again at the end.
+
+    Returns:
+        dict: Number of jobs scanned, jobs whose skills changed and skills indexed
+    """
+    job_tracking_table = get_db_client()[get_db_name()][get_job_tracking_table()]
+    skill_index_table = _skill_index_table()
+    started_at = datetime.utcnow()
+
+    names: Dict[str, str] = {}
+    counts: Dict[str, int] = {}
+    recent_ids = set()
+    updates = []
+    changed_ids = []
+    scanned = 0
+    projection = {"TechnicalSkills": 1, "RawTechnicalSkills": 1, SKILL_KEYS_FIELD: 1, "ProcessedDate": 1}
+    cursor = job_tracking_table.find({}, projection, batch_size=1000)
+    async for job in cursor:
+        scanned += 1
+        raw_skills = job.get("RawTechnicalSkills")
+        fields = skill_fields(raw_skills if raw_skills is not None else job.get("TechnicalSkills"))
+        if fields["TechnicalSkills"] != job.get("TechnicalSkills") or raw_skills is None:
+            # Canonical skills change the job's match scores
+            updates.append(UpdateOne({"_id": job["_id"]}, {"$set": {**fields, **scoring_stamp()}}))
+            changed_ids.append(str(job["_id"]))
+        elif fields[SKILL_KEYS_FIELD] != job.get(SKILL_KEYS_FIELD):
+            # Saved before jobs carried their skill keys
+            updates.append(UpdateOne({"_id": job["_id"]}, {"$set": {SKILL_KEYS_FIELD: fields[SKILL_KEYS_FIELD]}}))
+        for skill, key in zip(fields["TechnicalSkills"], fields[SKILL_KEYS_FIELD]):
+            names.setdefault(key, skill)
+            counts[key] = counts.get(key, 0) + 1
+        processed_date = job.get("ProcessedDate")
+        if isinstance(processed_date, datetime) and processed_date >= started_at:
+            recent_ids.add(job["_id"])
+        if len(updates) >= 1000:
+            await job_tracking_table.bulk_write(updates, ordered=False)
+            updates = []
+    if updates:
+        await job_tracking_table.bulk_write(updates, ordered=False)
+
+    if counts:
+        await skill_index_table.bulk_write([
+            ReplaceOne({"_id": key}, {"name": names[key], "count": count}, upsert=True)
+            for key, count in counts.items()
+        ], ordered=False)
+    await skill_index_table.delete_many({"_id": {"$nin": list(counts)}})
+
+    # Replacing the counts dropped the deltas of jobs ingested after the scan passed them
+    missed = {"ProcessedDate": {"$gte": started_at}, "_id": {"$nin": list(recent_ids)}}
+    async for job in job_tracking_table.find(missed, {"TechnicalSkills": 1}):
+        await index_job_skills(job["_id"], job.get("TechnicalSkills"))
+
+    await get_db_client()[get_db_name()][get_stats_rollup_table()].replace_one(
+        {"_id": SKILL_INDEX_MARKER_ID},
+        {"version": SKILL_TABLE_VERSION, "layout": SKILL_INDEX_LAYOUT, "rebuilt_at": datetime.utcnow()},
+        upsert=True,
+    )
+    await invalidate_job_cache(*changed_ids)
+    return {"jobs": scanned, "canonicalized": len(changed_ids), "skills": len(counts)}
+
+
+async def ensure_skill_index() -> Optional[dict]:
+    """
+    Rebuild the index if it was never built, or was built with an older alias table or layout
+
+    Returns:
+        dict: The rebuild summary, None when the index was current
+    """
+    marker = await get_db_client()[get_db_name()][get_stats_rollup_table()].find_one({"_id": SKILL_INDEX_MARKER_ID})
+    if marker and marker.get("version") == SKILL_TABLE_VERSION and marker.get("layout") == SKILL_INDEX_LAYOUT:
+        return None
+    return await rebuild_skill_index()
+
+
+async def _run_rebuild():
+    try:
+        summary = await ensure_skill_index()
+        if summary:
+            logging.info(f"Skill index rebuilt: {summary}")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logging.error(f"Error rebuilding skill index: {e}")
+
+
+def start_skill_index_rebuild():
+    """Build the index in the background when it is missing or outdated, so startup does not wait on a scan."""
+    global _rebuild_task
+    if _rebuild_task is None or _rebuild_task.done():
+        _rebuild_task = asyncio.create_task(_run_rebuild(), name="skill-index-rebuild")
+
+
+async def stop_skill_index_rebuild():
+    global _rebuild_task
+    if _rebuild_task is not None:
+        _rebuild_task.cancel()
+        await asyncio.gather(_rebuild_task, return_exceptions=True)
+        _rebuild_task = None
+
+
+async def get_top_skills(limit: int = 10) -> List[dict]:
+    """
+    The most listed skills
+
+    Args:
+        limit (int): Number of skills
+
+    Returns:
+        List[dict]: {"_id": skill name, "count": jobs listing it}, most listed first
+    """
+    cursor = _skill_index_table().find({"count": {"$gt": 0}}, {"name": 1, "count": 1}).sort([("count", -1), ("_id", 1)]).limit(limit)
+    return [{"_id": skill["name"], "count": skill["count"]} async for skill in cursor]
+
+
+def skill_filter(skills: List[str]) -> Optional[dict]:
+    """
+    job_tracking condition for jobs listing every one of the skills
+
+    Args:
+        skills (List[str]): Skill names in any spelling
+
+    Returns:
+        dict: Condition on SkillKeys, None when no skill is given
+    """
+    keys = sorted({skill_key(skill) for skill in canonicalize_skills(skills)})
+    if not keys:
+        return None
+    return {SKILL_KEYS_FIELD: {"$all": keys}}
+
+
+async def get_related_skills(skill: str, limit: int = 10) -> Optional[dict]:
+    """
+    The skills most often listed together with a skill
+
+    Args:
+        skill (str): Skill name in any spelling
+        limit (int): Number of related skills
+
+    Returns:
+        dict: The skill, its job count and related skills with the number of
+            jobs listing both and their share of the skill's jobs, None when
+            the skill is not indexed
+    """
+    canonical = canonicalize_skills([skill])
+    if not canonical:
+        return None
+    key = skill_key(canonical[0])
+    skill_index_table = _skill_index_table()
+    entry = await skill_index_table.find_one({"_id": key, "count": {"$gt": 0}}, {"name": 1, "count": 1})
+    if entry is None:
+        return None
+
+    # Only the jobs listing the skill are read, off skill_keyset, and Mongo counts the rest
+    job_tracking_table = get_db_client()[get_db_name()][get_job_tracking_table()]
+    related = await job_tracking_table.aggregate([
+        {"$match": {SKILL_KEYS_FIELD: key}},
+        {"$project": {SKILL_KEYS_FIELD: 1}},
+        {"$unwind": f"${SKILL_KEYS_FIELD}"},
+        {"$match": {SKILL_KEYS_FIELD: {"$ne": key}}},
+        {"$group": {"_id": f"${SKILL_KEYS_FIELD}", "together": {"$sum": 1}}},
+        {"$sort": {"together": -1, "_id": 1}},
+        {"$limit": limit},
+    ]).to_list(length=limit)
+    names = {
+        other["_id"]: other["name"]
+        async for other in skill_index_table.find({"_id": {"$in": [row["_id"] for row in related]}}, {"name": 1})
+    }
+    return {
+        "skill": entry["name"],
+        "count": entry["count"],
+        "related": [
+            {"skill": names.get(row["_id"], row["_id"]), "count": row["together"], "share": round(row["together"] / entry["count"], 4)}
+            for row in related
+        ],
+    }
+
+
+async def _main():
+    from src.utils.session_management import initialize_session_data
+
+    parser = argparse.ArgumentParser(description="Maintain the skill_index collection")
+    parser.add_argument("command", choices=["rebuild"], help="rebuild: canonicalize job skills and rebuild the index")
+    parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    initialize_session_data(
+        mongo_uri=settings.MONGODB_URI,
+        db=settings.DB_NAME,
+        job_tracking_table=settings.JOB_TRACKING_TABLE,
+        manual_annotation_table=settings.MANUAL_ANNOTATION_TABLE,
+        extracted_entities_table=settings.EXTRACTED_ENTITIES_TABLE,
+        stats_rollup_table=settings.STATS_ROLLUP_TABLE,
+        skill_index_table=settings.SKILL_INDEX_TABLE,
+    )
+    summary = await rebuild_skill_index()
+    logging.info(f"Skill index rebuilt: {summary}")
+    get_db_client().close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,197 @@
+# src/utils/skills.py
+
+import difflib
+import re
+from typing import Dict, Iterable, List
+from src.config.app_config import settings
+from src.utils.lru_cache import TTLCache
+
+# Bump when SKILL_ALIASES changes so stored skills are canonicalized again
+SKILL_TABLE_VERSION = 1
+
+# Canonical name -> the spellings extraction produces for it. Versions and
+# parentheticals are stripped before lookup, so "Python 3.10" and
+# "Python (3.x)" need no entry of their own.
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "Python": ["py", "cpython"],
+    "JavaScript": ["js", "java script", "ecmascript", "es6", "vanilla js"],
+    "TypeScript": ["ts"],
+    "Java": ["core java", "java se", "java ee", "j2ee"],
+    "C": ["ansi c", "c language"],
+    "C++": ["cpp", "c plus plus"],
+    "C#": ["csharp", "c sharp"],
+    ".NET": ["dotnet", "dot net", "asp.net", ".net core", "asp.net core"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rustlang"],
+    "Ruby": [],
+    "Ruby on Rails": ["rails", "ror"],
+    "PHP": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Scala": [],
+    "R": ["r language", "r programming"],
+    "SQL": ["structured query language", "sql queries"],
+    "PostgreSQL": ["postgres", "postgre", "psql", "pgsql"],
+    "MySQL": ["my sql"],
+    "MongoDB": ["mongo", "mongo db"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search", "elastic"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "React": ["reactjs", "react.js", "react js"],
+    "Angular": ["angularjs", "angular.js"],
+    "Vue.js": ["vue", "vuejs", "vue js"],
+    "Next.js": ["next", "nextjs", "next js"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": ["fast api"],
+    "Spring Boot": ["spring", "springboot", "spring framework"],
+    "HTML": ["html/css"],
+    "CSS": ["css/scss", "scss", "sass"],
+    "GraphQL": ["graph ql"],
+    "REST APIs": ["rest", "rest api", "restful", "restful apis", "restful api", "rest services"],
+    "AWS": ["amazon web services", "aws cloud"],
+    "Azure": ["microsoft azure", "ms azure"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Docker": ["docker containers"],
+    "Kubernetes": ["k8s", "kube"],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "CI/CD": ["ci cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment", "ci/cd pipelines"],
+    "Git": ["version control"],
+    "Linux": ["unix/linux", "linux/unix"],
+    "Kafka": ["apache kafka"],
+    "Spark": ["apache spark", "pyspark"],
+    "Hadoop": ["apache hadoop"],
+    "Airflow": ["apache airflow"],
+    "Machine Learning": ["ml", "machine-learning"],
+    "Deep Learning": ["dl"],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": ["cv"],
+    "Large Language Models": ["llm", "llms"],
+    "TensorFlow": ["tensor flow"],
+    "PyTorch": ["torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": [],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": ["microsoft excel", "ms excel"],
+    "Agile": ["agile methodologies", "agile methodology", "scrum", "agile/scrum"],
+    "Microservices": ["microservice", "microservices architecture"],
+}
+
+VERSION_PATTERN = re.compile(r"\s*v?\d+(?:\.(?:\d+|x))*\+?$")
+PARENTHETICAL_PATTERN = re.compile(r"\s*\([^)]*\)")
+
+_canonical_cache = TTLCache(maxsize=settings.SKILL_CANONICAL_CACHE_SIZE)
+
+
+def skill_key(skill: str) -> str:
+    """
+    Comparable form of a skill name: lowercase, whitespace collapsed, without
+    parentheticals or a trailing version ("Python 3.10", "python3" -> "python")
+    """
+    key = PARENTHETICAL_PATTERN.sub(" ", str(skill).lower())
+    key = " ".join(key.split()).strip(" .,;:-")
+    unversioned = VERSION_PATTERN.sub("", key)
+    # Short names keep their digits, "S3", "EC2" and "D3" are skills of their own
+    if len(unversioned) >= 3:
+        key = unversioned
+    return key
+
+
+def _build_lookup() -> Dict[str, str]:
+    lookup = {}
+    for canonical, aliases in SKILL_ALIASES.items():
+        for alias in aliases:
+            lookup[skill_key(alias)] = canonical
+    # Canonical names win over an alias that happens to share their key
+    for canonical in SKILL_ALIASES:
+        lookup[skill_key(canonical)] = canonical
+    return lookup
+
+
+_lookup = _build_lookup()
+_fuzzy_keys = [key for key in _lookup if len(key) >= settings.SKILL_FUZZY_MIN_LENGTH]
+
+
+def _clean_display(skill: str) -> str:
+    return " ".join(PARENTHETICAL_PATTERN.sub(" ", str(skill)).split()).strip(" .,;:-")
+
+
+def canonicalize_skill(skill: str) -> str:
+    """
+    The canonical name of an extracted skill
+
+    Exact alias matches come first, then close misspellings of a known skill
+    ("Kubernets"). Skills the table does not know are returned cleaned up but
+    otherwise as extracted. Lookups are memoized, extraction repeats the same
+    few hundred spellings.
+
+    Args:
+        skill (str): Skill as written in the job posting
+
+    Returns:
+        str: Canonical skill name, "" for a blank skill
+    """
+    cached = _canonical_cache.get(skill)
+    if cached is not None:
+        return cached
+
+    key = skill_key(skill)
+    canonical = _lookup.get(key)
+    if canonical is None and len(key) >= settings.SKILL_FUZZY_MIN_LENGTH:
+        matches = difflib.get_close_matches(key, _fuzzy_keys, n=1, cutoff=settings.SKILL_FUZZY_CUTOFF)
+        if matches:
+            canonical = _lookup[matches[0]]
+    if canonical is None:
+        canonical = _clean_display(skill)
+    _canonical_cache.set(skill, canonical)
+    return canonical
+
+
+def canonicalize_skills(skills: Iterable[str]) -> List[str]:
+    """
+    Canonicalize a job's skill list, dropping blanks and skills listed twice
+
+    Args:
+        skills (Iterable[str]): Extracted skills
+
+    Returns:
+        List[str]: Canonical names in their first-listed order
+    """
+    canonical_skills = []
+    seen = set()
+    for skill in skills or []:
+        if not skill:
+            continue
+        canonical = canonicalize_skill(skill)
+        key = skill_key(canonical)
+        if canonical and key not in seen:
+            seen.add(key)
+            canonical_skills.append(canonical)
+    return canonical_skills
+
+
+def skill_fields(skills: Iterable[str]) -> dict:
+    """
+    The skill fields to store on a job_tracking document
+
+    The extracted list is kept as RawTechnicalSkills, so a later alias table
+    can canonicalize it again. SkillKeys holds the skill_key of each canonical
+    skill, for skill filters to read off its multikey index.
+
+    Args:
+        skills (Iterable[str]): Extracted skills
+
+    Returns:
+        dict: TechnicalSkills, RawTechnicalSkills and SkillKeys
+    """
+    raw_skills = [skill for skill in skills or [] if skill]
+    canonical_skills = canonicalize_skills(raw_skills)
+    return {
+        "TechnicalSkills": canonical_skills,
+        "RawTechnicalSkills": raw_skills,
+        "SkillKeys": [skill_key(skill) for skill in canonical_skills],
+    }
@@ -0,0 +1,126 @@
+# src/utils/stats_engine.py
+
+import asyncio
+import logging
+import time
+from typing import Optional
+from src.config.app_config import settings
+from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table
+from src.utils.response_cache import on_job_cache_invalidated
+from src.utils.skill_index import get_top_skills
+from src.utils.salary import bucket_width_expression, label_salary_buckets
+
+STAGE_FLAGS = {
+    "Applied": "$IsApplied",
+    "Shortlisted": "$IsShortlisted",
+    "Interviewed": "$IsInterviewed",
+    "Offered": "$IsOffered",
+    "Accepted": "$IsAccepted",
+    "Rejected": "$IsRejected",
+}
+
+# Every distribution the dashboard needs, computed in a single collection scan;
+# top skills are read from the skill index instead
+STATS_FACETS = {
+    "applicationStageDistribution": [
+        {
+            "$group": {
+                "_id": None,
+                **{stage: {"$sum": {"$cond": [flag, 1, 0]}} for stage, flag in STAGE_FLAGS.items()},
+            }
+        }
+    ],
+    # Bucketed on the parsed annual salary, one histogram per currency
+    "salaryDistribution": [
+        {"$match": {"SalaryAnnual": {"$ne": None}, "SalaryCurrency": {"$ne": None}}},
+        {
+            "$group": {
+                "_id": {
+                    "currency": "$SalaryCurrency",
+                    "bucket": {"$floor": {"$divide": ["$SalaryAnnual", bucket_width_expression()]}},
+                },
+                "count": {"$sum": 1},
+            }
+        },
+    ],
+    "locationDistribution": [
+        {"$group": {"_id": "$Country", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}},
+    ],
+    "jobSourceEffectiveness": [
+        {
+            "$group": {
+                "_id": "$JobFind",
+                "total_applications": {"$sum": 1},
+                "shortlisted": {"$sum": {"$cond": ["$IsShortlisted", 1, 0]}},
+                "interviewed": {"$sum": {"$cond": ["$IsInterviewed", 1, 0]}},
+                "offered": {"$sum": {"$cond": ["$IsOffered", 1, 0]}},
+                "accepted": {"$sum": {"$cond": ["$IsAccepted", 1, 0]}},
+                "rejected": {"$sum": {"$cond": ["$IsRejected", 1, 0]}},
+            }
+        },
+        {"$sort": {"total_applications": -1}},
+    ],
+}
+
+_snapshot: Optional[dict] = None
+_snapshot_at: float = 0.0
+_inflight: Optional[asyncio.Task] = None
+
+
+async def _compute_job_stats() -> dict:
+    db = get_db_client()
+    job_tracking_table = db[get_db_name()][get_job_tracking_table()]
+
+    facet_result, top_skills = await asyncio.gather(
+        job_tracking_table.aggregate([{"$facet": STATS_FACETS}]).to_list(length=1),
+        get_top_skills(10),
+    )
+    facets = facet_result[0] if facet_result else {}
+    application_stage = facets.get("applicationStageDistribution") or [{}]
+    return {
+        "applicationStageDistribution": application_stage[0],
+        "salaryDistribution": label_salary_buckets(facets.get("salaryDistribution", [])),
+        "locationDistribution": facets.get("locationDistribution", []),
+        "topSkills": top_skills,
+        "jobSourceEffectiveness": facets.get("jobSourceEffectiveness", []),
+    }
+
+
+async def get_job_stats_snapshot(max_age: float = None) -> dict:
+    """
+    Return the dashboard statistics, computing them at most once per max_age seconds
+
+    Concurrent callers share a single in-flight computation, so the dashboard's
+    parallel requests to /stats and /jobSourceEffectiveness cost one scan between them.
+
+    Args:
+        max_age (float): Seconds a snapshot may be reused, defaults to settings.STATS_SNAPSHOT_TTL_SECONDS
+
+    Returns:
+        dict: Stage counts, salary, location, skill and source distributions
+    """
+    global _snapshot, _snapshot_at, _inflight
+    max_age = settings.STATS_SNAPSHOT_TTL_SECONDS if max_age is None else max_age
+    if _snapshot is not None and time.monotonic() - _snapshot_at < max_age:
+        return _snapshot
+
+    if _inflight is None or _inflight.done():
+        _inflight = asyncio.create_task(_compute_job_stats())
+    task = _inflight
+    try:
+        snapshot = await asyncio.shield(task)
+    except Exception as e:
+        logging.error(f"Error computing job statistics: {e}")
+        raise
+    if task is _inflight:
+        _snapshot, _snapshot_at = snapshot, time.monotonic()
+    return snapshot
+
+
+def invalidate_job_stats_snapshot():
+    global _snapshot
+    _snapshot = None
+
+
+on_job_cache_invalidated(invalidate_job_stats_snapshot)
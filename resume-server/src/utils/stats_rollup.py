@@ -0,0 +1,174 @@
+# src/utils/stats_rollup.py
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from src.config.app_config import settings
+from src.utils.session_management import get_db_client, get_db_name, get_job_tracking_table, get_stats_rollup_table
+
+ROLLUP_ID = "global"
+
+# Counter name -> tracking flag it counts
+STAGE_COUNTERS = {
+    "Applied": "IsApplied",
+    "Shortlisted": "IsShortlisted",
+    "Interviewed": "IsInterviewed",
+    "Offered": "IsOffered",
+    "Accepted": "IsAccepted",
+    "Declined": "IsDeclined",
+    "Joined": "IsJoined",
+    "Rejected": "IsRejected",
+}
+
+# Tracking fields a write has to touch for the rollup to change
+ROLLUP_FIELDS = list(STAGE_COUNTERS.values()) + ["AppliedDate", "ShortlistedDate"]
+
+
+def _get_stats_rollup_table():
+    return get_db_client()[get_db_name()][get_stats_rollup_table()]
+
+
+def job_contribution(job: dict) -> Dict[str, int]:
+    """
+    The rollup counters a single tracking document accounts for
+
+    Args:
+        job (dict): A job_tracking document, at least the ROLLUP_FIELDS
+
+    Returns:
+        dict: Counter name -> value
+    """
+    contribution = {"total": 1}
+    for counter, flag in STAGE_COUNTERS.items():
+        contribution[counter] = 1 if job.get(flag) else 0
+
+    applied_date = job.get("AppliedDate")
+    shortlisted_date = job.get("ShortlistedDate")
+    if job.get("IsShortlisted") is True and isinstance(applied_date, datetime) and isinstance(shortlisted_date, datetime):
+        contribution["time_to_shortlist_count"] = 1
+        contribution["time_to_shortlist_ms_sum"] = int((shortlisted_date - applied_date).total_seconds() * 1000)
+    else:
+        contribution["time_to_shortlist_count"] = 0
+        contribution["time_to_shortlist_ms_sum"] = 0
+    return contribution
+
+
+def rollup_delta(before: Optional[dict], after: Optional[dict]) -> Dict[str, int]:
+    """
+    The $inc needed when a tracking document changes from before to after.
+    Pass None as before for an insert and as after for a delete.
+    """
+    old = job_contribution(before) if before is not None else {}
+    new = job_contribution(after) if after is not None else {}
+    delta = {}
+    for counter in set(old) | set(new):
+        change = new.get(counter, 0) - old.get(counter, 0)
+        if change:
+            delta[counter] = change
+    return delta
+
+
+async def apply_rollup_delta(delta: Dict[str, int]):
+    """
+    Atomically add a delta to the rollup document
+
+    Errors are logged rather than raised: a missed delta only causes drift,
+    which rebuild_stats_rollup reconciles.
+    """
+    if not delta:
+        return
+    try:
+        await _get_stats_rollup_table().update_one(
+            {"_id": ROLLUP_ID},
+            {"$inc": delta, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+    except Exception as e:
+        logging.error(f"Error updating stats rollup: {e}")
+
+
+async def record_job_added(job: dict):
+    await apply_rollup_delta(rollup_delta(None, job))
+
+
+async def record_jobs_updated(changes: Iterable[tuple]):
+    """
+    Apply the combined delta of several (before, after) document pairs
+    """
+    combined: Dict[str, int] = {}
+    for before, after in changes:
+        for counter, change in rollup_delta(before, after).items():
+            combined[counter] = combined.get(counter, 0) + change
+    await apply_rollup_delta({counter: change for counter, change in combined.items() if change})
+
+
+async def rebuild_stats_rollup() -> dict:
+    """
+    Recompute the rollup from job_tracking and replace the stored document
+
+    Run it after bulk imports or manual edits to reconcile drift.
+
+    Returns:
+        dict: The rebuilt counters
+    """
+    db = get_db_client()
+    job_tracking_table = db[get_db_name()][get_job_tracking_table()]
+
+    # Sum the same per-document contribution the write path applies as deltas,
+    # streaming only the fields it reads
+    counters = {counter: 0 for counter in job_contribution({})}
+    cursor = job_tracking_table.find({}, ROLLUP_FIELDS, batch_size=1000)
+    async for job in cursor:
+        for counter, value in job_contribution(job).items():
+            counters[counter] += value
+
+    rollup_table = _get_stats_rollup_table()
+    previous = await rollup_table.find_one({"_id": ROLLUP_ID})
+    if previous:
+        drift = {key: counters[key] - previous.get(key, 0) for key in counters if counters[key] != previous.get(key, 0)}
+        if drift:
+            logging.warning(f"Stats rollup drift reconciled: {drift}")
+
+    await rollup_table.replace_one(
+        {"_id": ROLLUP_ID},
+        {**counters, "updated_at": datetime.utcnow(), "rebuilt_at": datetime.utcnow()},
+        upsert=True,
+    )
+    return counters
+
+
+async def get_stats_rollup() -> dict:
+    """
+    Read the rollup counters, building them on first use
+    """
+    rollup = await _get_stats_rollup_table().find_one({"_id": ROLLUP_ID})
+    if rollup is None:
+        return await rebuild_stats_rollup()
+    return rollup
+
+
+async def _main():
+    from src.utils.session_management import initialize_session_data
+
+    parser = argparse.ArgumentParser(description="Maintain the job_stats_rollup collection")
+    parser.add_argument("command", choices=["rebuild"], help="rebuild: recompute the rollup from job_tracking")
+    parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    initialize_session_data(
+        mongo_uri=settings.MONGODB_URI,
+        db=settings.DB_NAME,
+        job_tracking_table=settings.JOB_TRACKING_TABLE,
+        manual_annotation_table=settings.MANUAL_ANNOTATION_TABLE,
+        extracted_entities_table=settings.EXTRACTED_ENTITIES_TABLE,
+        stats_rollup_table=settings.STATS_ROLLUP_TABLE,
+    )
+    counters = await rebuild_stats_rollup()
+    logging.info(f"Stats rollup rebuilt: {counters}")
+    get_db_client().close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,44 +1,218 @@
-import requests
-from bs4 import BeautifulSoup
-import logging
-from typing import Dict, List
-import concurrent.futures
 import asyncio
+import codecs
+import logging
+import time
+from contextlib import asynccontextmanager
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+import httpx
+from src.utils.metrics import OUTBOUND_FETCH_DURATION
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+NO_TITLE = "No title found"
+FETCH_ERROR = "Error fetching title"
+
+_http_client: Optional[httpx.AsyncClient] = None
+_fetch_semaphore: Optional[asyncio.Semaphore] = None
+# Only hosts with a fetch in flight or queued have an entry, so the map stays small
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+_host_users: Dict[str, int] = {}
+_fetch_config = {
+    "timeout": 5.0,
+    "max_connections": 100,
+    "max_per_host": 4,
+    "max_bytes": 16 * 1024,
+}
+
+
+class TitleParser(HTMLParser):
+    """
+    Incremental parser that only looks for the document <title>.
+    done is set once the title closes or the <body> starts, so the caller can stop reading.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._in_title = False
+        self._parts: List[str] = []
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title" and not self.done:
+            self._in_title = True
+        elif tag == "body":
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._parts.append(data)
+
+    @property
+    def title(self) -> Optional[str]:
+        title = " ".join("".join(self._parts).split())
+        return title or None
+
+
+def init_http_client(
+    timeout: float = 5.0,
+    max_connections: int = 100,
+    max_per_host: int = 4,
+    max_bytes: int = 16 * 1024,
+    http_client: httpx.AsyncClient = None,
+):
+    """
+    Configure the shared fetcher; call it once from the entry point with the settings.
+
+    Args:
+        timeout (float): Per-request timeout in seconds
+        max_connections (int): Pool size and cap on fetches in flight overall
+        max_per_host (int): Cap on fetches in flight against a single host
+        max_bytes (int): Bytes read from each response while looking for the title
+        http_client (httpx.AsyncClient): Client to use instead of creating one, e.g. with a stand-in transport
+    """
+    global _http_client, _fetch_semaphore
+    if http_client is not None:
+        _http_client = http_client
+        _fetch_semaphore = asyncio.Semaphore(max_connections)
+    _fetch_config.update(
+        timeout=timeout,
+        max_connections=max_connections,
+        max_per_host=max_per_host,
+        max_bytes=max_bytes,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared AsyncClient used for outbound page fetches, creating it on first use.
+    """
+    global _http_client, _fetch_semaphore
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=_fetch_config["max_connections"],
+                max_keepalive_connections=_fetch_config["max_connections"],
+            ),
+            timeout=httpx.Timeout(_fetch_config["timeout"]),
+            follow_redirects=True,
+        )
+        _fetch_semaphore = asyncio.Semaphore(_fetch_config["max_connections"])
+    return _http_client
+
+
+async def close_http_client():
+    """
+    Closes the shared AsyncClient and its connection pool.
+    """
+    global _http_client, _fetch_semaphore
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        _fetch_semaphore = None
+        _host_semaphores.clear()
+        _host_users.clear()
+
+
+@asynccontextmanager
+async def _host_slot(url: str):
+    """Hold one of the host's max_per_host slots, dropping the host's semaphore once nobody uses it."""
+    host = urlsplit(url).netloc.lower()
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = _host_semaphores[host] = asyncio.Semaphore(_fetch_config["max_per_host"])
+    _host_users[host] = _host_users.get(host, 0) + 1
+    try:
+        async with semaphore:
+            yield
+    finally:
+        _host_users[host] -= 1
+        if not _host_users[host]:
+            del _host_users[host]
+            del _host_semaphores[host]
+
+
+async def _read_title(response: httpx.Response) -> Optional[str]:
+    """Feed the start of the body to a TitleParser, stopping as soon as the title is known."""
+    encoding = response.charset_encoding or "utf-8"
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    parser = TitleParser()
+    remaining = _fetch_config["max_bytes"]
+    async for chunk in response.aiter_bytes():
+        chunk = chunk[:remaining]
+        remaining -= len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done or remaining <= 0:
+            break
+    parser.close()
+    return parser.title
+
+
+async def fetch_page_metadata(url: str, headers: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Fetch the title of a webpage, reading only the first max_bytes of the body.
+
+    Args:
+        url (str): Page to fetch
+        headers (dict): Extra request headers
+
+    Returns:
+        dict: url, title (None when the page has none or the response failed),
+        HTTP status and the response headers
+
+    Raises:
+        httpx.HTTPError: On network errors and timeouts
+    """
+    client = get_http_client()
+    # Host slot first, so URLs queued on a busy host never hold global slots other hosts could use
+    async with _host_slot(url), _fetch_semaphore:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            async with client.stream("GET", url, headers=headers) as response:
+                title = None
+                if response.is_success:
+                    title = await _read_title(response)
+                outcome = str(response.status_code)
+                return {
+                    "url": url,
+                    "title": title,
+                    "status": response.status_code,
+                    "headers": response.headers,
+                }
+        finally:
+            OUTBOUND_FETCH_DURATION.labels("title", outcome).observe(time.perf_counter() - started)
+
 
 async def get_page_title(url: str) -> Dict[str, str]:
     """Fetch the title of a webpage."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=5)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        title = soup.title.string if soup.title else "No title found"
-        
+        page = await fetch_page_metadata(url)
+        if page["status"] >= 400:
+            logging.error(f"Error fetching title for {url}: HTTP {page['status']}")
+            return {"url": url, "title": FETCH_ERROR}
         return {
             "url": url,
-            "title": title.strip() if title else "No title found"
+            "title": page["title"] or NO_TITLE
         }
     except Exception as e:
         logging.error(f"Error fetching title for {url}: {str(e)}")
         return {
             "url": url,
-            "title": "Error fetching title"
+            "title": FETCH_ERROR
         }
 
-def _get_page_title_sync(url: str) -> Dict[str, str]:
-    """Synchronous version of get_page_title for use with run_in_executor."""
-    return asyncio.run(get_page_title(url))
 
 async def get_titles_for_urls(urls: List[str]) -> List[Dict[str, str]]:
-    """Process multiple URLs concurrently."""
-    loop = asyncio.get_event_loop()
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        tasks = [
-            loop.run_in_executor(executor, _get_page_title_sync, url)
-            for url in urls
-        ]
-        results = await asyncio.gather(*tasks)
-    return results 
\ No newline at end of file
+    """Process multiple URLs concurrently over the shared connection pool."""
+    return await asyncio.gather(*(get_page_title(url) for url in urls))
@@ -0,0 +1,184 @@
+# src/utils/url_metadata.py
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from pymongo import UpdateOne
+from src.config.app_config import settings
+from src.utils.lru_cache import TTLCache
+from src.utils.metrics import URL_METADATA_LOOKUPS, URL_METADATA_REFRESHES, URL_METADATA_WRITES
+from src.utils.session_management import get_db_client, get_db_name, get_url_metadata_table
+from src.utils.url_helpers import FETCH_ERROR, NO_TITLE, fetch_page_metadata
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "ref", "ref_src"}
+
+_memory_cache = TTLCache(maxsize=settings.URL_METADATA_MEMORY_SIZE)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL used as the url_metadata key
+
+    Lowercases the scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the query so equivalent links share one entry.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not (scheme == "http" and parts.port == 80) and not (scheme == "https" and parts.port == 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _get_url_metadata_table():
+    return get_db_client()[get_db_name()][get_url_metadata_table()]
+
+
+def _is_fresh(entry: dict, now: datetime) -> bool:
+    return entry.get("refresh_at") is not None and entry["refresh_at"] > now
+
+
+def _remember(entry: dict, now: datetime):
+    """Keep an entry in memory until it is due for a refresh."""
+    ttl = (entry["refresh_at"] - now).total_seconds()
+    if ttl > 0:
+        _memory_cache.set(entry["_id"], entry, ttl=ttl)
+
+
+def _title_of(entry: Optional[dict]) -> str:
+    if entry is None or entry.get("status") is None or entry["status"] >= 400:
+        return FETCH_ERROR
+    return entry.get("title") or NO_TITLE
+
+
+async def _refresh(key: str, url: str, previous: Optional[dict], now: datetime) -> dict:
+    """
+    Fetch a URL, revalidating with the stored validators when there are any
+
+    A 304 keeps the stored title and only pushes refresh_at forward. Network
+    errors keep a previous successful entry, otherwise they are recorded with
+    the shorter error TTL so dead links are not retried on every request.
+    """
+    headers = {}
+    if previous and previous.get("status") == 200:
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+    try:
+        page = await fetch_page_metadata(url, headers=headers or None)
+    except Exception as e:
+        URL_METADATA_REFRESHES.labels("error").inc()
+        logging.error(f"Error fetching title for {url}: {str(e)}")
+        page = None
+
+    if page is not None and page["status"] == 304 and previous:
+        URL_METADATA_REFRESHES.labels("revalidated").inc()
+        entry = {**previous, "fetched_at": now}
+        ttl = settings.URL_METADATA_TTL_SECONDS
+    elif page is not None:
+        URL_METADATA_REFRESHES.labels("fetched").inc()
+        entry = {
+            "_id": key,
+            "url": url,
+            "title": page["title"],
+            "status": page["status"],
+            "etag": page["headers"].get("etag"),
+            "last_modified": page["headers"].get("last-modified"),
+            "fetched_at": now,
+        }
+        ttl = settings.URL_METADATA_TTL_SECONDS if page["status"] < 400 else settings.URL_METADATA_ERROR_TTL_SECONDS
+    elif previous and previous.get("status") == 200:
+        entry = dict(previous)
+        ttl = settings.URL_METADATA_ERROR_TTL_SECONDS
+    else:
+        entry = {
+            "_id": key,
+            "url": url,
+            "title": None,
+            "status": None,
+            "etag": None,
+            "last_modified": None,
+            "fetched_at": now,
+        }
+        ttl = settings.URL_METADATA_ERROR_TTL_SECONDS
+    entry["refresh_at"] = now + timedelta(seconds=ttl)
+    return entry
+
+
+async def resolve_url_titles(urls: List[str]) -> List[Dict[str, str]]:
+    """
+    Resolve page titles through the url_metadata cache
+
+    Fresh entries come from the in-process LRU or from Mongo in a single query;
+    only missing or stale URLs are fetched, once per normalized URL, and stale
+    ones are revalidated with conditional GETs.
+
+    Args:
+        urls (List[str]): URLs in the order the results should be returned
+
+    Returns:
+        List[Dict[str, str]]: {"url", "title"} per input URL
+    """
+    now = datetime.utcnow()
+    keys = [normalize_url(url) for url in urls]
+    entries: Dict[str, dict] = {}
+    for key in set(keys):
+        entry = _memory_cache.get(key)
+        if entry is not None:
+            URL_METADATA_LOOKUPS.labels("memory", "hit").inc()
+            entries[key] = entry
+        else:
+            URL_METADATA_LOOKUPS.labels("memory", "miss").inc()
+
+    stored: Dict[str, dict] = {}
+    missing = [key for key in set(keys) if key not in entries]
+    if missing:
+        try:
+            async for entry in _get_url_metadata_table().find({"_id": {"$in": missing}}):
+                stored[entry["_id"]] = entry
+        except Exception as e:
+            URL_METADATA_LOOKUPS.labels("persistent", "error").inc()
+            logging.error(f"Error reading url metadata: {e}")
+
+    to_fetch = {}
+    for url, key in zip(urls, keys):
+        if key in entries or key in to_fetch:
+            continue
+        entry = stored.get(key)
+        if entry is not None and _is_fresh(entry, now):
+            URL_METADATA_LOOKUPS.labels("persistent", "hit").inc()
+            entries[key] = entry
+            _remember(entry, now)
+        else:
+            URL_METADATA_LOOKUPS.labels("persistent", "miss" if entry is None else "stale").inc()
+            to_fetch[key] = url
+
+    if to_fetch:
+        refreshed = await asyncio.gather(
+            *(_refresh(key, url, stored.get(key), now) for key, url in to_fetch.items())
+        )
+        for entry in refreshed:
+            entries[entry["_id"]] = entry
+            _remember(entry, now)
+        try:
+            await _get_url_metadata_table().bulk_write(
+                [UpdateOne({"_id": entry["_id"]}, {"$set": entry}, upsert=True) for entry in refreshed],
+                ordered=False,
+            )
+            URL_METADATA_WRITES.labels("ok").inc()
+        except Exception as e:
+            URL_METADATA_WRITES.labels("error").inc()
+            logging.error(f"Error writing url metadata: {e}")
+
+    return [{"url": url, "title": _title_of(entries.get(key))} for url, key in zip(urls, keys)]
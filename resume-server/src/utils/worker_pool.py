@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class WorkerPool:
+    """
+    A bounded pool of asyncio workers that drain a persistent queue.
+
+    The pool does not own the queue itself. Each worker repeatedly calls `claim`
+    to atomically take the next item (typically a Mongo find_one_and_update) and
+    hands it to `process`. When the queue is empty the workers sleep until
+    `notify` is called or `poll_interval` elapses, so items written by another
+    process or left behind by a restart are still picked up.
+
+    Args:
+        name (str): Name used in log messages and task names
+        size (int): Maximum number of items processed concurrently
+        claim (Callable): Coroutine returning the next item or None when the queue is empty
+        process (Callable): Coroutine handling a single claimed item
+        poll_interval (float): Seconds to wait between polls of an empty queue
+    """
+
+    def __init__(
+        self,
+        name: str,
+        size: int,
+        claim: Callable[[], Awaitable[Optional[Any]]],
+        process: Callable[[Any], Awaitable[None]],
+        poll_interval: float = 5.0,
+    ):
+        self.name = name
+        self.size = max(1, size)
+        self.claim = claim
+        self.process = process
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Spawn the worker tasks on the running event loop."""
+        if self._running:
+            return
+        self._running = True
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(index), name=f"{self.name}-worker-{index}")
+            for index in range(self.size)
+        ]
+        logging.info(f"Started {self.size} {self.name} workers")
+
+    async def stop(self):
+        """Cancel the worker tasks and wait for them to exit."""
+        if not self._running:
+            return
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logging.info(f"Stopped {self.name} workers")
+
+    def notify(self):
+        """Wake idle workers because new items were queued."""
+        self._wakeup.set()
+
+    async def _wait_for_work(self):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _worker(self, index: int):
+        while self._running:
+            try:
+                item = await self.claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Error claiming {self.name} item in worker {index}: {e}")
+                item = None
+
+            if item is None:
+                await self._wait_for_work()
+                continue
+
+            try:
+                await self.process(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Unhandled error in {self.name} worker {index}: {e}", exc_info=True)
+
+
+@asynccontextmanager
+async def keep_lease(renew: Callable[[], Awaitable[None]], lease_seconds: float):
+    """
+    Renew a claimed item's lease while the block runs
+
+    Claims record their time and are only taken back once older than the
+    lease, so another process can reclaim an item whose worker died without
+    stealing one that is still being processed.
+
+    Args:
+        renew (Callable): Coroutine refreshing the claim time
+        lease_seconds (float): How long a claim stays valid without renewal
+    """
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            try:
+                await renew()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Error renewing lease: {e}")
+
+    task = asyncio.create_task(heartbeat())
+    try:
+        yield
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)